@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Meow Package Manager - Async API Client
+Same surface as MeowAPIClient, for callers that need many lookups at once.
+
+All requests share one connection pool and at most `concurrency` of them
+are in flight. With aiohttp installed the client is fully asynchronous;
+without it, the synchronous client runs on worker threads behind the same
+async API, so callers do not have to care which one they got.
+
+    async with AsyncMeowAPIClient() as client:
+        found = await client.find_packages(manifest_names)
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+from urllib.parse import quote
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+def _load_sync_client():
+    """The MeowAPIclient module next to this file (also when meow loaded it by path)"""
+    module = sys.modules.get("MeowAPIclient")
+    if module is None:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "client.py")
+        spec = importlib.util.spec_from_file_location("MeowAPIclient", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules["MeowAPIclient"] = module
+    return module
+
+
+_sync = _load_sync_client()
+IDEMPOTENT_METHODS = _sync.IDEMPOTENT_METHODS
+RETRY_STATUSES = _sync.RETRY_STATUSES
+RequestMetric = _sync.RequestMetric
+LOOKUP_BATCH = _sync.LOOKUP_BATCH
+NO_BULK_LOOKUP = _sync.NO_BULK_LOOKUP
+
+# What a failed request raises: aiohttp's errors, or requests' on worker threads
+REQUEST_ERRORS = (_sync.requests.RequestException,) + (
+    (aiohttp.ClientError, asyncio.TimeoutError) if aiohttp is not None else ()
+)
+
+
+def _params(params: Dict[str, Any]) -> Dict[str, Any]:
+    """aiohttp wants strings, requests accepts booleans"""
+    return {k: str(v).lower() if isinstance(v, bool) else v for k, v in params.items()}
+
+
+class AsyncMeowAPIClient:
+    """Async client for the Meow Package Manager API"""
+
+    def __init__(self, base_url: str = "http://localhost:8000", api_key: Optional[str] = None,
+                 concurrency: int = 32, connect_timeout: float = None, read_timeout: float = None,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0):
+        """
+        Initialize the async API client
+
+        Args:
+            base_url: Base URL of the Meow API server
+            api_key: Admin API key for protected endpoints (optional, set via MEOW_ADMIN_API_KEY env var)
+            concurrency: Most requests in flight at once (also the connection pool size)
+            connect_timeout: Seconds to wait for a connection (MEOW_API_CONNECT_TIMEOUT, default 5)
+            read_timeout: Seconds to wait for an answer (MEOW_API_READ_TIMEOUT, default 30)
+            retries: Extra attempts for idempotent requests that fail transiently
+            backoff: Base of the exponential backoff between attempts, in seconds
+            max_backoff: Longest wait between attempts, Retry-After included
+        """
+        # The sync client holds the settings, the retry policy and the metrics;
+        # without aiohttp it also does the requests
+        self._client = _sync.MeowAPIClient(
+            base_url, api_key, connect_timeout=connect_timeout, read_timeout=read_timeout,
+            pool_size=concurrency, retries=retries, backoff=backoff, max_backoff=max_backoff
+        )
+        self.base_url = self._client.base_url
+        self.api_key = self._client.api_key
+        self.concurrency = concurrency
+        self.metrics = self._client.metrics
+        self._semaphore = None
+        self._session = None
+
+    @property
+    def native(self) -> bool:
+        """True when requests go through aiohttp rather than worker threads"""
+        return aiohttp is not None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+        self._client.session.close()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so it belongs to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        return self._semaphore
+
+    def _get_session(self):
+        if self._session is None:
+            connect, read = self._client.timeout
+            self._session = aiohttp.ClientSession(
+                headers=dict(self._client.session.headers),
+                connector=aiohttp.TCPConnector(limit=self.concurrency),
+                timeout=aiohttp.ClientTimeout(sock_connect=connect, sock_read=read),
+            )
+        return self._session
+
+    async def _send(self, method: str, endpoint: str, idempotent: Optional[bool] = None, **kwargs):
+        """(status, decoded JSON or None, headers) with the sync client's retry policy"""
+        method = method.upper()
+        url = f"{self.base_url}{endpoint}"
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self._client.retries + 1 if idempotent else 1
+        start = time.monotonic()
+        status = None
+        attempt = 0
+        try:
+            for attempt in range(attempts):
+                try:
+                    async with self._get_session().request(method, url, **kwargs) as response:
+                        status = response.status
+                        if status in RETRY_STATUSES and attempt + 1 < attempts:
+                            delay = self._client._retry_delay(attempt, response)
+                        else:
+                            body = await response.read()
+                            response.raise_for_status()
+                            data = (await response.json(content_type=None)) if body else None
+                            return status, data, response.headers
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                    status = None
+                    if attempt + 1 >= attempts:
+                        raise
+                    delay = self._client._retry_delay(attempt)
+                await asyncio.sleep(delay)
+        finally:
+            self.metrics.append(RequestMetric(method, endpoint.split("?")[0], status, attempt + 1,
+                                              time.monotonic() - start))
+
+    async def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Any]:
+        """Make an HTTP request to the API; None on errors, like MeowAPIClient"""
+        async with self._get_semaphore():
+            if not self.native:
+                return await asyncio.to_thread(self._client._make_request, method, endpoint, **kwargs)
+            if "params" in kwargs:
+                kwargs["params"] = _params(kwargs["params"])
+            try:
+                _, data, _ = await self._send(method, endpoint, **kwargs)
+                return data
+            except aiohttp.ClientResponseError as e:
+                print(f"Error: {e.status} {e.message} for {endpoint}")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                print(f"Error: Could not reach Meow API server at {self.base_url}")
+            except Exception as e:
+                print(f"Error: {e}")
+            return None
+
+    # ============================================================================
+    # CLIENT-SIDE FUNCTIONS (Search, Find, etc.)
+    # ============================================================================
+
+    async def find_package(self, name: str) -> Optional[Dict[str, Any]]:
+        """Find a specific package by exact name match"""
+        return await self._make_request('GET', f"/api/packages/{name}")
+
+    async def find_packages(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Look up many packages at once
+
+        Uses POST /api/packages/lookup (all batches concurrently) and falls
+        back to concurrent GET /api/packages/{name} requests on servers
+        without it, like MeowAPIClient.lookup_packages.
+
+        Args:
+            names: Package names (duplicates are looked up once)
+
+        Returns:
+            {name: package information, or None if not found}
+
+        Raises:
+            aiohttp.ClientError (requests.RequestException without aiohttp)
+            on network or server errors
+        """
+        names = list(dict.fromkeys(names))
+        if not self.native:
+            async with self._get_semaphore():
+                return await asyncio.to_thread(self._client.lookup_packages, names)
+
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        if self._client.bulk_lookup is not False:
+            batches = [names[i:i + LOOKUP_BATCH] for i in range(0, len(names), LOOKUP_BATCH)]
+            try:
+                answers = await asyncio.gather(*(self._lookup_batch(batch) for batch in batches))
+                self._client.bulk_lookup = True
+                for batch, packages in zip(batches, answers):
+                    found.update((name, packages.get(name)) for name in batch)
+            except aiohttp.ClientResponseError as e:
+                if e.status not in NO_BULK_LOOKUP:
+                    raise
+                self._client.bulk_lookup = False
+        missing = [name for name in names if name not in found]
+        found.update(zip(missing, await asyncio.gather(*(self._lookup_one(name) for name in missing))))
+        return {name: found[name] for name in names}
+
+    async def lookup_packages(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Same as find_packages, under the sync client's name"""
+        return await self.find_packages(names)
+
+    async def _lookup_batch(self, batch: List[str]) -> Dict[str, Any]:
+        async with self._get_semaphore():
+            _, data, _ = await self._send('POST', "/api/packages/lookup", json={'names': batch}, idempotent=True)
+        return (data or {}).get('packages') or {}
+
+    async def _lookup_one(self, name: str) -> Optional[Dict[str, Any]]:
+        """GET /api/packages/{name} without printing anything for unknown names"""
+        async with self._get_semaphore():
+            try:
+                _, data, _ = await self._send('GET', f"/api/packages/{quote(name, safe='')}")
+            except aiohttp.ClientResponseError as e:
+                if e.status == 404:
+                    return None
+                raise
+        return data
+
+    async def get_all_packages(self, skip: int = 0, limit: int = 100, active_only: bool = True,
+                               verified_only: bool = False) -> List[Dict[str, Any]]:
+        """Get one page of packages from the server"""
+        params = {'skip': skip, 'limit': limit, 'active_only': active_only, 'verified_only': verified_only}
+        result = await self._make_request('GET', "/api/packages", params=params)
+        return result if result else []
+
+    async def _fetch_page(self, skip: int, limit: int, active_only: bool, verified_only: bool) -> List[Dict[str, Any]]:
+        """One page of /api/packages; raises instead of returning [] on errors"""
+        async with self._get_semaphore():
+            if not self.native:
+                return await asyncio.to_thread(self._client._fetch_page, skip, limit, active_only, verified_only)
+            params = {'skip': skip, 'limit': limit, 'active_only': active_only, 'verified_only': verified_only}
+            _, data, _ = await self._send('GET', "/api/packages", params=_params(params))
+        return data or []
+
+    async def iter_packages(self, page_size: int = 200, prefetch: int = 4, active_only: bool = True,
+                            verified_only: bool = False) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Walk the whole registry, requesting up to `prefetch` pages ahead
+
+        Raises:
+            REQUEST_ERRORS if a page cannot be fetched, so a failed page is
+            never mistaken for the end of the registry
+        """
+        pending = []
+        next_skip = 0
+        last_page_seen = False
+        try:
+            while True:
+                while not last_page_seen and len(pending) < max(1, prefetch):
+                    pending.append(asyncio.ensure_future(
+                        self._fetch_page(next_skip, page_size, active_only, verified_only)
+                    ))
+                    next_skip += page_size
+                if not pending:
+                    return
+                page = await pending.pop(0)
+                if len(page) < page_size and not last_page_seen:
+                    last_page_seen = True
+                    for task in pending:
+                        task.cancel()
+                    pending.clear()
+                for package in page:
+                    yield package
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def search_packages(self, query: str, limit: int = 50, verified_only: bool = False) -> List[Dict[str, Any]]:
+        """Search for packages by name, description, tags, or owner (filtered client-side)"""
+        query_lower = query.lower()
+        results = []
+        try:
+            async for package in self.iter_packages(verified_only=verified_only):
+                if (query_lower in package.get('name', '').lower() or
+                    query_lower in (package.get('description') or '').lower() or
+                    query_lower in (package.get('owner') or '').lower() or
+                    query_lower in (package.get('tags') or '').lower()):
+                    results.append(package)
+                    if len(results) >= limit:
+                        break
+        except REQUEST_ERRORS as e:
+            print(f"Error: {e}")
+        return results
+
+    async def get_changed_packages(self, updated_since: Optional[str] = None, skip: int = 0, limit: int = 100,
+                                   etag: Optional[str] = None):
+        """
+        One page of packages changed after a cursor, like MeowAPIClient.get_changed_packages
+
+        Returns:
+            (packages, etag) tuple; packages is None when the server answered
+            304 Not Modified
+
+        Raises:
+            REQUEST_ERRORS on network or server errors
+        """
+        async with self._get_semaphore():
+            if not self.native:
+                return await asyncio.to_thread(self._client.get_changed_packages, updated_since, skip, limit, etag)
+            params = {'skip': skip, 'limit': limit, 'active_only': False}
+            if updated_since:
+                params['updated_since'] = updated_since
+            headers = {'If-None-Match': etag} if etag else {}
+            status, data, response_headers = await self._send('GET', "/api/packages", params=_params(params),
+                                                              headers=headers)
+        if status == 304:
+            return None, etag
+        return data or [], response_headers.get('ETag')
+
+    async def get_package_by_id(self, package_id: int) -> Optional[Dict[str, Any]]:
+        return await self._make_request('GET', f"/api/packages/id/{package_id}")
+
+    async def get_package_info(self, package_name: str) -> Optional[Dict[str, Any]]:
+        return await self.find_package(package_name)
+
+    async def list_packages(self, limit: Optional[int] = 50, verified_only: bool = False):
+        """Print available packages (all of them when limit is None), like MeowAPIClient.list_packages"""
+        count = 0
+        try:
+            async for pkg in self.iter_packages(verified_only=verified_only):
+                if count == 0:
+                    print(f"\n{'='*90}")
+                    print(f"{'Name':<30} {'Version':<15} {'Owner':<20} {'Verified':<10} {'Downloads':<10}")
+                    print(f"{'='*90}")
+                verified_status = "✓ Yes" if pkg.get('verified') else "✗ No"
+                print(f"{pkg.get('name', ''):<30} {pkg.get('version', ''):<15} "
+                      f"{pkg.get('owner', ''):<20} {verified_status:<10} {pkg.get('download_count', 0):<10}")
+                count += 1
+                if limit and count >= limit:
+                    break
+        except REQUEST_ERRORS as e:
+            print(f"Error: {e}")
+        if not count:
+            print("No packages found.")
+            return
+        print(f"{'='*90}\n")
+        print(f"Total: {count} packages")
+
+    async def increment_download_count(self, package_name: str) -> bool:
+        result = await self._make_request('POST', f"/api/packages/{package_name}/download")
+        return result is not None
+
+    async def increment_download_counts(self, names: Iterable[str]) -> Dict[str, bool]:
+        """Increment the download count of many packages concurrently"""
+        names = list(names)
+        results = await asyncio.gather(*(self.increment_download_count(name) for name in names))
+        return dict(zip(names, results))
+
+    # ============================================================================
+    # INSTALLATION FUNCTIONS (git runs on worker threads)
+    # ============================================================================
+
+    async def install_package(self, package_name: str, install_dir: str = "./packages",
+                              package: Optional[Dict[str, Any]] = None) -> bool:
+        """Clone a package into install_dir, like MeowAPIClient.install_package"""
+        if package is None:
+            package = await self.find_package(package_name)
+        if not package:
+            print(f"Package '{package_name}' not found in Meow registry.")
+            return False
+        return await asyncio.to_thread(self._client.install_package, package_name, install_dir, package)
+
+    async def install_packages(self, package_names: Iterable[str], install_dir: str = "./packages") -> Dict[str, bool]:
+        """
+        Install several packages with one bulk lookup
+
+        The clones run one after another: install_package may ask before
+        replacing an existing checkout.
+        """
+        package_names = list(package_names)
+        try:
+            packages = await self.find_packages(package_names)
+        except REQUEST_ERRORS as e:
+            print(f"Error: Could not look up packages on {self.base_url}: {e}")
+            return {name: False for name in package_names}
+        results = {}
+        for name, package in packages.items():
+            if not package:
+                print(f"Package '{name}' not found in Meow registry.")
+                results[name] = False
+                continue
+            results[name] = await self.install_package(name, install_dir, package=package)
+        return results
+
+    async def update_package(self, package_name: str, install_dir: str = "./packages") -> bool:
+        """Pull one installed package when it is behind, like MeowAPIClient.update_package"""
+        return await asyncio.to_thread(self._client.update_package, package_name, install_dir)
+
+    async def update_all_packages(self, install_dir: str = "./packages", workers: int = 8) -> Dict[str, bool]:
+        """Check every package under install_dir and pull the outdated ones"""
+        return await asyncio.to_thread(self._client.update_all_packages, install_dir, workers)
+
+    # ============================================================================
+    # ADMIN FUNCTIONS (require API key)
+    # ============================================================================
+
+    async def verify_package(self, package_name: str, verified: bool = True) -> bool:
+        if not self.api_key:
+            print("Error: Admin API key required. Set MEOW_ADMIN_API_KEY environment variable.")
+            return False
+        result = await self._make_request('POST', f"/api/packages/{package_name}/verify",
+                                          json={"verified": verified})
+        return result is not None
+
+    async def update_package_info(self, package_name: str, **kwargs) -> Optional[Dict[str, Any]]:
+        if not self.api_key:
+            print("Error: Admin API key required. Set MEOW_ADMIN_API_KEY environment variable.")
+            return None
+        return await self._make_request('PUT', f"/api/packages/{package_name}", json=kwargs)
+
+    async def delete_package(self, package_name: str, hard_delete: bool = False) -> bool:
+        if not self.api_key:
+            print("Error: Admin API key required. Set MEOW_ADMIN_API_KEY environment variable.")
+            return False
+        result = await self._make_request('DELETE', f"/api/packages/{package_name}",
+                                          params={'hard_delete': hard_delete})
+        return result is not None
+
+    async def get_admin_info(self) -> Optional[Dict[str, Any]]:
+        if not self.api_key:
+            print("Error: Admin API key required. Set MEOW_ADMIN_API_KEY environment variable.")
+            return None
+        return await self._make_request('GET', "/admin/info")
+
+    async def health_check(self) -> bool:
+        result = await self._make_request('GET', "/health")
+        if result:
+            print(f"API Server Status: {result.get('status', 'unknown')}")
+            return True
+        return False
+
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        return self._client.latency_stats()
+
+
+if __name__ == "__main__":
+    async def _main(names):
+        async with AsyncMeowAPIClient() as client:
+            start = time.monotonic()
+            found = await client.find_packages(names)
+            for name, package in found.items():
+                print(f"  {name}: {package.get('version') if package else 'not found'}")
+            print(f"{len(names)} lookups in {time.monotonic() - start:.2f}s "
+                  f"({'aiohttp' if client.native else 'threads'})")
+
+    if len(sys.argv) < 2:
+        print("usage: async_client.py <package> [package...]")
+        sys.exit(1)
+    asyncio.run(_main(sys.argv[1:]))
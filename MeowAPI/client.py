@@ -7,42 +7,180 @@ Handles all client-side interactions with the Meow package server API.
 import requests
 import json
 import os
+import random
 import subprocess
 import sys
-from typing import Optional, List, Dict, Any
-from urllib.parse import quote
+import time
+from collections import deque
+from email.utils import parsedate_to_datetime
+from typing import Optional, Iterable, Iterator, List, NamedTuple, Dict, Any
+from urllib.parse import quote, urlparse
+from requests.adapters import HTTPAdapter
+
+try:
+    # Routes commands through meow's executor (timeouts, timing records)
+    # when the client runs inside meow; standalone it uses subprocess.
+    import executor
+    _run = executor.run
+except ImportError:
+    def _run(argv, capture=True, **kwargs):
+        return subprocess.run(argv, capture_output=capture, text=True, **kwargs)
+
+try:
+    # Clones share meow's object cache in ~/.cache/meow/git, and updates
+    # ask the remote (ls-remote) before pulling
+    import gitcache
+    _clone_argv = gitcache.clone_argv
+except ImportError:
+    gitcache = None
+
+    def _clone_argv(url, dest=None):
+        return ['git', 'clone', '--filter=blob:none', url] + ([dest] if dest else [])
+
+# Methods that are safe to send twice; only these are retried
+IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'})
+# Answers that mean "try again later" rather than "you asked wrong"
+RETRY_STATUSES = frozenset({429, 502, 503, 504})
+# Most names sent in one POST /api/packages/lookup
+LOOKUP_BATCH = 500
+# Answers to the lookup POST from servers that predate it
+NO_BULK_LOOKUP = frozenset({404, 405, 501})
+
+
+class RequestMetric(NamedTuple):
+    method: str
+    path: str
+    status: Optional[int]
+    attempts: int
+    # Seconds from the first attempt to the final answer, backoff included
+    latency: float
+
 
 class MeowAPIClient:
     """Client for interacting with the Meow Package Manager API"""
     
-    def __init__(self, base_url: str = "http://localhost:8000", api_key: Optional[str] = None):
+    def __init__(self, base_url: str = "http://localhost:8000", api_key: Optional[str] = None,
+                 connect_timeout: float = None, read_timeout: float = None, pool_size: int = 16,
+                 retries: int = 3, backoff: float = 0.5, max_backoff: float = 30.0):
         """
         Initialize the API client
         
         Args:
             base_url: Base URL of the Meow API server
             api_key: Admin API key for protected endpoints (optional, set via MEOW_ADMIN_API_KEY env var)
+            connect_timeout: Seconds to wait for a connection (MEOW_API_CONNECT_TIMEOUT, default 5)
+            read_timeout: Seconds to wait for an answer (MEOW_API_READ_TIMEOUT, default 30)
+            pool_size: Connections kept open for parallel callers (e.g. page prefetch)
+            retries: Extra attempts for idempotent requests that fail transiently
+            backoff: Base of the exponential backoff between attempts, in seconds
+            max_backoff: Longest wait between attempts, Retry-After included
         """
         self.base_url = base_url.rstrip('/')
+        self.timeout = (
+            connect_timeout if connect_timeout is not None else float(os.getenv("MEOW_API_CONNECT_TIMEOUT", 5)),
+            read_timeout if read_timeout is not None else float(os.getenv("MEOW_API_READ_TIMEOUT", 30)),
+        )
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.pool_size = pool_size
+        self.metrics = deque(maxlen=1000)
+        # Whether the server has POST /api/packages/lookup (None: not asked yet)
+        self.bulk_lookup = None
+        
         self.session = requests.Session()
         self.session.headers.update({'Content-Type': 'application/json'})
+        # Retries are done by _send so they can honor Retry-After and be measured
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
         
         # Get API key from parameter or environment variable
         self.api_key = api_key or os.getenv("MEOW_ADMIN_API_KEY", None)
         if self.api_key:
             self.session.headers.update({'X-API-Key': self.api_key})
     
+    def _retry_delay(self, attempt: int, response=None) -> float:
+        """Seconds to wait before the next attempt: Retry-After if given, else jittered exponential backoff"""
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                try:
+                    delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+                except (TypeError, ValueError):
+                    delay = None
+            if delay is not None:
+                return min(max(delay, 0.0), self.max_backoff)
+        # "Full jitter": spreads out clients that failed at the same moment
+        return random.uniform(0, min(self.max_backoff, self.backoff * (2 ** attempt)))
+    
+    def _send(self, method: str, url: str, idempotent: Optional[bool] = None, **kwargs) -> requests.Response:
+        """
+        Send a request with timeouts and, for idempotent methods, retries on
+        connection errors, timeouts and 429/502/503/504 answers. Every call
+        is recorded in self.metrics. Raises the last error when retries run out.
+        idempotent=True marks a read-only POST as safe to retry.
+        """
+        method = method.upper()
+        kwargs.setdefault('timeout', self.timeout)
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        attempts = self.retries + 1 if idempotent else 1
+        start = time.monotonic()
+        response = None
+        try:
+            for attempt in range(attempts):
+                try:
+                    response = self.session.request(method, url, **kwargs)
+                except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+                    response = None
+                    if attempt + 1 >= attempts:
+                        raise
+                    time.sleep(self._retry_delay(attempt))
+                    continue
+                if response.status_code in RETRY_STATUSES and attempt + 1 < attempts:
+                    time.sleep(self._retry_delay(attempt, response))
+                    continue
+                return response
+        finally:
+            self.metrics.append(RequestMetric(
+                method, urlparse(url).path, response.status_code if response is not None else None,
+                attempt + 1, time.monotonic() - start
+            ))
+    
+    def latency_stats(self) -> Dict[str, Dict[str, float]]:
+        """Per "METHOD /path" request count, retries and p50/p95/max latency in seconds"""
+        grouped: Dict[str, List[RequestMetric]] = {}
+        for metric in list(self.metrics):
+            grouped.setdefault(f"{metric.method} {metric.path}", []).append(metric)
+        stats = {}
+        for key, metrics in grouped.items():
+            latencies = sorted(m.latency for m in metrics)
+            stats[key] = {
+                'count': len(latencies),
+                'retries': sum(m.attempts - 1 for m in metrics),
+                'p50': latencies[len(latencies) // 2],
+                'p95': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'max': latencies[-1],
+            }
+        return stats
+    
     def _make_request(self, method: str, endpoint: str, **kwargs) -> Optional[Dict[str, Any]]:
         """Make an HTTP request to the API"""
         url = f"{self.base_url}{endpoint}"
         try:
-            response = self.session.request(method, url, **kwargs)
+            response = self._send(method, url, **kwargs)
             response.raise_for_status()
             return response.json() if response.content else None
         except requests.exceptions.ConnectionError:
             print(f"Error: Could not connect to Meow API server at {self.base_url}")
             print("Make sure the server is running.")
             return None
+        except requests.exceptions.Timeout:
+            print(f"Error: Meow API server at {self.base_url} did not answer in time")
+            return None
         except requests.exceptions.HTTPError as e:
             if response.status_code == 404:
                 print(f"Error: {response.json().get('detail', 'Not found')}")
@@ -76,23 +214,22 @@ class MeowAPIClient:
         Returns:
             List of matching packages
         """
-        # Get all packages from server
-        all_packages = self.get_all_packages(limit=1000, verified_only=verified_only)
-        if not all_packages:
-            return []
-        
         query_lower = query.lower()
         results = []
         
-        for package in all_packages:
-            # Search in name, description, owner, tags
-            if (query_lower in package.get('name', '').lower() or
-                query_lower in package.get('description', '').lower() or
-                query_lower in package.get('owner', '').lower() or
-                query_lower in package.get('tags', '').lower()):
-                results.append(package)
-                if len(results) >= limit:
-                    break
+        try:
+            # Walk the whole registry; stops requesting pages once limit is hit
+            for package in self.iter_packages(verified_only=verified_only):
+                # Search in name, description, owner, tags
+                if (query_lower in package.get('name', '').lower() or
+                    query_lower in (package.get('description') or '').lower() or
+                    query_lower in (package.get('owner') or '').lower() or
+                    query_lower in (package.get('tags') or '').lower()):
+                    results.append(package)
+                    if len(results) >= limit:
+                        break
+        except requests.exceptions.RequestException as e:
+            print(f"Error: {e}")
         
         return results
     
@@ -108,6 +245,54 @@ class MeowAPIClient:
         """
         return self._make_request('GET', f"/api/packages/{name}")
     
+    def lookup_packages(self, names: Iterable[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """
+        Look up many packages by exact name in as few requests as possible
+
+        Names are sent to POST /api/packages/lookup in batches of
+        LOOKUP_BATCH. Servers without that endpoint (404/405/501) are asked one
+        GET /api/packages/{name} per name instead, `pool_size` at a time, and
+        are not offered the bulk endpoint again by this client.
+
+        Args:
+            names: Package names (duplicates are looked up once)
+
+        Returns:
+            {name: package information, or None if not found}
+
+        Raises:
+            requests.RequestException on network or server errors
+        """
+        names = list(dict.fromkeys(names))
+        found: Dict[str, Optional[Dict[str, Any]]] = {}
+        if self.bulk_lookup is not False:
+            for start in range(0, len(names), LOOKUP_BATCH):
+                batch = names[start:start + LOOKUP_BATCH]
+                response = self._send('POST', f"{self.base_url}/api/packages/lookup",
+                                      json={'names': batch}, idempotent=True)
+                if response.status_code in NO_BULK_LOOKUP:
+                    self.bulk_lookup = False
+                    break
+                response.raise_for_status()
+                self.bulk_lookup = True
+                packages = response.json().get('packages') or {}
+                for name in batch:
+                    found[name] = packages.get(name)
+        missing = [name for name in names if name not in found]
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=min(self.pool_size, len(missing))) as pool:
+                found.update(zip(missing, pool.map(self._lookup_one, missing)))
+        return {name: found[name] for name in names}
+
+    def _lookup_one(self, name: str) -> Optional[Dict[str, Any]]:
+        """GET /api/packages/{name} without printing anything for unknown names"""
+        response = self._send('GET', f"{self.base_url}/api/packages/{quote(name, safe='')}")
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()
+
     def get_all_packages(self, skip: int = 0, limit: int = 100, active_only: bool = True, verified_only: bool = False) -> List[Dict[str, Any]]:
         """
         Get all packages from the server
@@ -130,6 +315,97 @@ class MeowAPIClient:
         result = self._make_request('GET', "/api/packages", params=params)
         return result if result else []
     
+    def _fetch_page(self, skip: int, limit: int, active_only: bool, verified_only: bool) -> List[Dict[str, Any]]:
+        """One page of /api/packages; raises instead of returning [] on errors"""
+        params = {
+            'skip': skip,
+            'limit': limit,
+            'active_only': active_only,
+            'verified_only': verified_only
+        }
+        response = self._send('GET', f"{self.base_url}/api/packages", params=params)
+        response.raise_for_status()
+        return response.json() or []
+
+    def iter_packages(self, page_size: int = 200, prefetch: int = 4, active_only: bool = True,
+                      verified_only: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Walk the whole registry page by page
+
+        Up to `prefetch` upcoming pages are requested in the background while
+        the current one is consumed, so at most prefetch + 1 pages are held in
+        memory however large the registry is. Stopping early (break, close())
+        cancels the pages that were not requested yet.
+
+        Args:
+            page_size: Packages per request
+            prefetch: How many pages to request ahead
+            active_only: Only return active packages
+            verified_only: Only return verified packages
+
+        Yields:
+            Package dictionaries, in server order
+
+        Raises:
+            requests.RequestException if a page cannot be fetched
+        """
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ThreadPoolExecutor(max_workers=max(1, prefetch))
+        pending = deque()
+        next_skip = 0
+        last_page_seen = False
+        try:
+            while True:
+                while not last_page_seen and len(pending) < max(1, prefetch):
+                    pending.append(pool.submit(self._fetch_page, next_skip, page_size, active_only, verified_only))
+                    next_skip += page_size
+                if not pending:
+                    return
+                page = pending.popleft().result()
+                if len(page) < page_size and not last_page_seen:
+                    # Short page: nothing after it, drop the requests beyond
+                    last_page_seen = True
+                    for future in pending:
+                        future.cancel()
+                    pending.clear()
+                yield from page
+        finally:
+            for future in pending:
+                future.cancel()
+            pool.shutdown(wait=False)
+
+    def get_changed_packages(self, updated_since: Optional[str] = None, skip: int = 0, limit: int = 100,
+                             etag: Optional[str] = None):
+        """
+        Get one page of packages changed after a cursor (for catalog syncs)
+
+        Inactive packages are included so that removals reach the catalog.
+        Servers that do not know `updated_since` simply return everything.
+
+        Args:
+            updated_since: Only packages updated after this timestamp (all when None)
+            skip: Number of packages to skip (for pagination)
+            limit: Maximum number of packages to return
+            etag: ETag of the previous answer for this page, sent as If-None-Match
+
+        Returns:
+            (packages, etag) tuple; packages is None when the server answered
+            304 Not Modified
+
+        Raises:
+            requests.RequestException on network or server errors
+        """
+        params = {'skip': skip, 'limit': limit, 'active_only': False}
+        if updated_since:
+            params['updated_since'] = updated_since
+        headers = {'If-None-Match': etag} if etag else {}
+        response = self._send('GET', f"{self.base_url}/api/packages", params=params, headers=headers)
+        if response.status_code == 304:
+            return None, etag
+        response.raise_for_status()
+        return response.json() or [], response.headers.get('ETag')
+
     def get_package_by_id(self, package_id: int) -> Optional[Dict[str, Any]]:
         """
         Get a package by its ID
@@ -146,19 +422,22 @@ class MeowAPIClient:
     # PACKAGE INSTALLATION FUNCTIONS
     # ============================================================================
     
-    def install_package(self, package_name: str, install_dir: str = "./packages") -> bool:
+    def install_package(self, package_name: str, install_dir: str = "./packages",
+                        package: Optional[Dict[str, Any]] = None) -> bool:
         """
         Install a package by downloading it from its git URL
         
         Args:
             package_name: Name of the package to install
             install_dir: Directory where packages should be installed
+            package: Package information if already looked up (skips the request)
             
         Returns:
             True if installation was successful, False otherwise
         """
         # Get package information
-        package = self.find_package(package_name)
+        if package is None:
+            package = self.find_package(package_name)
         if not package:
             print(f"Package '{package_name}' not found in Meow registry.")
             return False
@@ -188,10 +467,8 @@ class MeowAPIClient:
         
         # Clone the repository
         try:
-            result = subprocess.run(
-                ['git', 'clone', giturl, package_install_path],
-                capture_output=True,
-                text=True,
+            result = _run(
+                _clone_argv(giturl, package_install_path),
                 check=True
             )
             print(f"✓ Successfully installed '{package_name}' to {package_install_path}")
@@ -207,6 +484,31 @@ class MeowAPIClient:
             print("Error: 'git' command not found. Please install Git.")
             return False
     
+    def install_packages(self, package_names: Iterable[str], install_dir: str = "./packages") -> Dict[str, bool]:
+        """
+        Install several packages with a single bulk lookup
+        
+        Args:
+            package_names: Names of the packages to install
+            install_dir: Directory where packages should be installed
+            
+        Returns:
+            {name: True if installation was successful}
+        """
+        try:
+            packages = self.lookup_packages(package_names)
+        except requests.exceptions.RequestException as e:
+            print(f"Error: Could not look up packages on {self.base_url}: {e}")
+            return {name: False for name in package_names}
+        results = {}
+        for name, package in packages.items():
+            if not package:
+                print(f"Package '{name}' not found in Meow registry.")
+                results[name] = False
+                continue
+            results[name] = self.install_package(name, install_dir, package=package)
+        return results
+    
     def update_package(self, package_name: str, install_dir: str = "./packages") -> bool:
         """
         Update an installed package by pulling latest changes from git
@@ -229,15 +531,19 @@ class MeowAPIClient:
             print(f"'{package_install_path}' is not a git repository. Reinstalling...")
             return self.install_package(package_name, install_dir)
         
+        if gitcache is not None:
+            check = gitcache.check_update(package_install_path)
+            if check.outdated is False:
+                print(f"✓ '{package_name}' is already up to date")
+                return True
+        
         print(f"Updating '{package_name}'...")
         
         try:
             # Pull latest changes
-            result = subprocess.run(
+            result = _run(
                 ['git', 'pull'],
                 cwd=package_install_path,
-                capture_output=True,
-                text=True,
                 check=True
             )
             print(f"✓ Successfully updated '{package_name}'")
@@ -246,6 +552,56 @@ class MeowAPIClient:
             print(f"Error updating package: {e.stderr}")
             return False
     
+    def update_all_packages(self, install_dir: str = "./packages", workers: int = 8) -> Dict[str, bool]:
+        """
+        Update every package installed under install_dir
+        
+        Each checkout's HEAD is compared with its remote branch via
+        `git ls-remote` (no fetch), `workers` checkouts at a time; only the
+        ones that are behind are pulled.
+        
+        Args:
+            install_dir: Directory where packages are installed
+            workers: Most git commands running at once
+            
+        Returns:
+            {name: True if the package is up to date now}
+        """
+        if gitcache is None:
+            # Standalone: no way to check cheaply, pull everything
+            names = sorted(os.listdir(install_dir)) if os.path.isdir(install_dir) else []
+            return {name: self.update_package(name, install_dir) for name in names
+                    if os.path.exists(os.path.join(install_dir, name, '.git'))}
+        
+        checks = gitcache.check_updates(gitcache.checkouts(install_dir), workers)
+        if not checks:
+            print(f"No packages installed in {install_dir}.")
+            return {}
+        
+        results = {}
+        for path, check in checks.items():
+            name = os.path.basename(path)
+            if check.error:
+                print(f"⚠ Could not check '{name}': {check.error}")
+                results[name] = False
+            elif not check.outdated:
+                results[name] = True
+        
+        outdated = [check for check in checks.values() if check.outdated]
+        if not outdated:
+            print(f"✓ {sum(results.values())} package(s) up to date, nothing to fetch")
+            return results
+        
+        print(f"Updating {len(outdated)} of {len(checks)} package(s)...")
+        for path, result in gitcache.update_checkouts([check.path for check in outdated], workers).items():
+            name = os.path.basename(path)
+            results[name] = result.returncode == 0
+            if results[name]:
+                print(f"✓ Successfully updated '{name}'")
+            else:
+                print(f"Error updating '{name}': {(result.stderr or '').strip()}")
+        return results
+    
     def increment_download_count(self, package_name: str) -> bool:
         """Increment download count for a package on the server"""
         result = self._make_request('POST', f"/api/packages/{package_name}/download")
@@ -296,22 +652,29 @@ class MeowAPIClient:
         print(f"Downloads:    {package.get('download_count', 0)}")
         print(f"{'='*60}\n")
     
-    def list_packages(self, limit: int = 50, verified_only: bool = False):
-        """List all available packages"""
-        packages = self.get_all_packages(limit=limit, verified_only=verified_only)
-        if not packages:
+    def list_packages(self, limit: Optional[int] = 50, verified_only: bool = False):
+        """List available packages (all of them when limit is None), streaming page by page"""
+        count = 0
+        try:
+            for pkg in self.iter_packages(verified_only=verified_only):
+                if count == 0:
+                    print(f"\n{'='*90}")
+                    print(f"{'Name':<30} {'Version':<15} {'Owner':<20} {'Verified':<10} {'Downloads':<10}")
+                    print(f"{'='*90}")
+                verified_status = "✓ Yes" if pkg.get('verified') else "✗ No"
+                print(f"{pkg.get('name', ''):<30} {pkg.get('version', ''):<15} "
+                      f"{pkg.get('owner', ''):<20} {verified_status:<10} {pkg.get('download_count', 0):<10}")
+                count += 1
+                if limit and count >= limit:
+                    break
+        except requests.exceptions.RequestException as e:
+            print(f"Error: {e}")
+        if not count:
             print("No packages found.")
             return
         
-        print(f"\n{'='*90}")
-        print(f"{'Name':<30} {'Version':<15} {'Owner':<20} {'Verified':<10} {'Downloads':<10}")
-        print(f"{'='*90}")
-        for pkg in packages:
-            verified_status = "✓ Yes" if pkg.get('verified') else "✗ No"
-            print(f"{pkg.get('name', ''):<30} {pkg.get('version', ''):<15} "
-                  f"{pkg.get('owner', ''):<20} {verified_status:<10} {pkg.get('download_count', 0):<10}")
         print(f"{'='*90}\n")
-        print(f"Total: {len(packages)} packages")
+        print(f"Total: {count} packages")
     
     # ============================================================================
     # HEALTH CHECK
@@ -421,13 +784,17 @@ def handle_install_command(package_name: str, source: str = "meow"):
     CALL THIS FROM: main.py -> if args.command == 'install'
     
     Args:
-        package_name: Name of package to install
+        package_name: Name of package to install (or a list of names)
         source: Source to install from (if 'meow', use API client)
     """
     if source == "meow":
         # Use Meow API client
         client = MeowAPIClient()
-        client.install_package(package_name)
+        if isinstance(package_name, list):
+            # One bulk lookup for all of them
+            client.install_packages(package_name)
+        else:
+            client.install_package(package_name)
     else:
         # Use other sources (pacman, flathub, aur, etc.)
         # TODO: Integrate with existing choose_source() function
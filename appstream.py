@@ -0,0 +1,266 @@
+"""
+Offline index of the Flatpak appstream catalogs.
+
+flatpak keeps every remote's catalog on disk, in
+/var/lib/flatpak/appstream/<remote>/<arch>/active/appstream.xml.gz for
+system remotes and under ~/.local/share/flatpak/appstream/ for user ones.
+Meow loads those files into a compact SQLite index so Flathub searches,
+exists checks and app ID lookups need no network round trip. A catalog is
+only re-read when its file changes.
+"""
+
+import gzip
+import os
+import platform
+import sqlite3
+import threading
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+APPSTREAM_DIRS = os.environ.get(
+    "MEOW_APPSTREAM_DIRS",
+    os.pathsep.join(["/var/lib/flatpak/appstream", str(Path("~/.local/share/flatpak/appstream").expanduser())])
+).split(os.pathsep)
+INDEX_PATH = Path("~/.cache/meow/appstream-index.sqlite3").expanduser()
+
+# Appstream tags come with an xml:lang attribute for translations
+XML_LANG = "{http://www.w3.org/XML/1998/namespace}lang"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS feeds (
+    path     TEXT PRIMARY KEY,
+    remote   TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS apps (
+    feed     TEXT NOT NULL,
+    remote   TEXT NOT NULL,
+    app_id   TEXT NOT NULL COLLATE NOCASE,
+    name     TEXT NOT NULL COLLATE NOCASE,
+    summary  TEXT NOT NULL DEFAULT '',
+    version  TEXT NOT NULL DEFAULT '',
+    keywords TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (feed, app_id)
+);
+CREATE INDEX IF NOT EXISTS apps_app_id ON apps (app_id);
+CREATE INDEX IF NOT EXISTS apps_name ON apps (name);
+"""
+
+
+def _text(element) -> str:
+    return " ".join((element.text or "").split()) if element is not None else ""
+
+
+def _untranslated(component, tag: str):
+    for child in component.findall(tag):
+        if child.get(XML_LANG) in (None, "C", "en"):
+            return child
+    return None
+
+
+def parse_component(component) -> Optional[Dict[str, str]]:
+    """One <component> as {app_id, name, summary, version, keywords}"""
+    if component.get("type") not in (None, "desktop", "desktop-application", "console-application", "web-application"):
+        return None
+    app_id = _text(component.find("id"))
+    bundle = component.find("bundle")
+    if bundle is not None and bundle.get("type") == "flatpak" and bundle.text:
+        # app/org.mozilla.firefox/x86_64/stable is the ID flatpak installs by
+        app_id = bundle.text.split("/")[1] if bundle.text.count("/") >= 2 else app_id
+    if app_id.endswith(".desktop"):
+        app_id = app_id[:-len(".desktop")]
+    if not app_id:
+        return None
+
+    release = component.find("releases/release")
+    keywords = [_text(k) for k in component.iterfind("keywords/keyword") if k.get(XML_LANG) in (None, "C", "en")]
+    categories = [_text(c) for c in component.iterfind("categories/category")]
+    return {
+        "app_id": app_id,
+        "name": _text(_untranslated(component, "name")) or app_id,
+        "summary": _text(_untranslated(component, "summary")),
+        "version": release.get("version", "") if release is not None else "",
+        "keywords": " ".join(keywords + categories),
+    }
+
+
+def read_appstream(path) -> Iterator[Dict[str, str]]:
+    """Yield one record per application in an appstream.xml(.gz)"""
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rb") as f:
+        for _, element in ET.iterparse(f):
+            if element.tag != "component":
+                continue
+            record = parse_component(element)
+            element.clear()
+            if record:
+                yield record
+
+
+def find_feeds(dirs: List[str] = APPSTREAM_DIRS) -> Dict[str, str]:
+    """{catalog path: remote} for this machine's architecture"""
+    arch = platform.machine()
+    feeds = {}
+    for base in dirs:
+        base = Path(base)
+        if not base.is_dir():
+            continue
+        for path in sorted(base.glob("*/*/active/appstream.xml.gz")):
+            if path.parent.parent.name == arch:
+                feeds[str(path)] = path.parent.parent.parent.name
+    return feeds
+
+
+class AppstreamIndex:
+    """Persistent index over the local appstream catalogs"""
+
+    def __init__(self, dirs: List[str] = APPSTREAM_DIRS, index_path=INDEX_PATH):
+        self.dirs = dirs
+        self.index_path = Path(index_path)
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def refresh(self) -> List[str]:
+        """Re-read every catalog whose file changed. Returns the rebuilt ones."""
+        feeds = find_feeds(self.dirs)
+        rebuilt = []
+
+        with self._lock:
+            known = {row["path"]: row["mtime_ns"] for row in self.conn.execute("SELECT * FROM feeds")}
+            # `active` is a symlink flatpak moves on every update
+            changed = [path for path in feeds if known.get(path) != os.stat(path).st_mtime_ns]
+            stale = [path for path in known if path not in feeds]
+            if not stale and not changed:
+                return rebuilt
+
+            with self.conn:
+                for path in stale:
+                    self._drop_feed(path)
+                for path in changed:
+                    mtime_ns = os.stat(path).st_mtime_ns
+                    try:
+                        records = list(read_appstream(path))
+                    except (ET.ParseError, OSError, EOFError) as e:
+                        print(f"[WARN] Could not read appstream catalog {path}: {e}")
+                        continue
+                    self._drop_feed(path)
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO apps (feed, remote, app_id, name, summary, version, keywords) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        [(path, feeds[path], r["app_id"], r["name"], r["summary"], r["version"], r["keywords"])
+                         for r in records]
+                    )
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO feeds (path, remote, mtime_ns) VALUES (?, ?, ?)",
+                        (path, feeds[path], mtime_ns)
+                    )
+                    rebuilt.append(path)
+        return rebuilt
+
+    def _drop_feed(self, path: str):
+        self.conn.execute("DELETE FROM apps WHERE feed = ?", (path,))
+        self.conn.execute("DELETE FROM feeds WHERE path = ?", (path,))
+
+    def _query(self, sql: str, params=()) -> List[Dict[str, str]]:
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def has_remote(self, remote: str) -> bool:
+        return bool(self._query("SELECT 1 FROM feeds WHERE remote = ? LIMIT 1", (remote,)))
+
+    def search(self, term: str, remote: str = "flathub", limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """
+        Apps matching term in their ID, name, summary or keywords, best first:
+        exact ID or name, then name prefix, then ID/name substring, then the rest.
+        """
+        term = " ".join(term.lower().split())
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = (
+            "SELECT app_id, name, summary, version, "
+            "CASE WHEN app_id = ? OR name = ? OR app_id LIKE ? ESCAPE '\\' THEN 0 "
+            "WHEN name LIKE ? ESCAPE '\\' THEN 1 "
+            "WHEN app_id LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\' THEN 2 ELSE 3 END AS rank "
+            "FROM apps WHERE remote = ? AND (app_id LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\' "
+            "OR summary LIKE ? ESCAPE '\\' OR keywords LIKE ? ESCAPE '\\') "
+            "GROUP BY app_id ORDER BY rank, length(name), name"
+        )
+        escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        params = (term, term, "%." + escaped, escaped + "%", pattern, pattern,
+                  remote, pattern, pattern, pattern, pattern)
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return self._query(sql, params)
+
+    def lookup(self, app_id: str, remote: str = "flathub") -> Optional[Dict[str, str]]:
+        rows = self._query(
+            "SELECT app_id, name, summary, version FROM apps WHERE remote = ? AND app_id = ? LIMIT 1",
+            (remote, app_id)
+        )
+        return rows[0] if rows else None
+
+    def exists(self, term: str, remote: str = "flathub") -> bool:
+        """Same rule as the old Flathub check: term appears in an app's ID or name"""
+        pattern = "%" + term.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        return bool(self._query(
+            "SELECT 1 FROM apps WHERE remote = ? AND (app_id LIKE ? ESCAPE '\\' OR name LIKE ? ESCAPE '\\') LIMIT 1",
+            (remote, pattern, pattern)
+        ))
+
+    def first_app_id(self, term: str, remote: str = "flathub") -> Optional[str]:
+        rows = self.search(term, remote, limit=1)
+        return rows[0]["app_id"] if rows else None
+
+    def signature(self) -> str:
+        """Changes whenever any indexed catalog changes"""
+        rows = self._query("SELECT path, mtime_ns FROM feeds ORDER BY path")
+        return ",".join(f"{row['path']}:{row['mtime_ns']}" for row in rows)
+
+    def all_apps(self) -> List[Dict[str, str]]:
+        return self._query(
+            "SELECT remote, app_id, name, summary, version, keywords FROM apps GROUP BY remote, app_id ORDER BY app_id"
+        )
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> Optional[AppstreamIndex]:
+    """
+    Shared, refreshed index for this process, or None when flatpak has no
+    appstream data on this machine so callers can fall back to the network.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = False
+            if not find_feeds():
+                return None
+            try:
+                _index = AppstreamIndex()
+                _index.refresh()
+            except sqlite3.Error as e:
+                print(f"[WARN] Could not open appstream index: {e}")
+                _index = False
+        return _index or None
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 2:
+        print("usage: appstream.py <query>")
+        sys.exit(1)
+    index = get_index()
+    if index is None:
+        print("No flatpak appstream data found in " + ", ".join(APPSTREAM_DIRS))
+        sys.exit(1)
+    for app in index.search(sys.argv[1], limit=20):
+        print(f"{app['name']} {app['version']}  ({app['app_id']})")
+        if app["summary"]:
+            print(f"  ↳ {app['summary']}")
@@ -0,0 +1,130 @@
+"""
+Native AUR RPC (v5) client.
+
+Existence, search and version checks talk to the AUR directly instead of
+forking yay. info() packs as many names as fit into each
+`type=info&arg[]=...` request, so checking a few hundred packages costs one
+or two HTTP requests, and every answer (including "no such package") is
+kept in the on-disk HTTP cache for the TTL.
+
+MEOW_AUR_URL points the client at another server, e.g. a local stand-in.
+"""
+
+import os
+import threading
+from typing import Any, Dict, Iterable, List
+from urllib.parse import urlencode
+
+from httpcache import get_cache, normalize_query
+
+AUR_URL = os.environ.get("MEOW_AUR_URL", "https://aur.archlinux.org").rstrip("/")
+RPC_VERSION = 5
+INFO_TTL = 60 * 60
+SEARCH_TTL = 60 * 60
+TIMEOUT = 10
+
+# aurweb rejects request lines longer than about 4400 characters
+MAX_URL_LENGTH = 4000
+
+# aurweb's error for searches that match more packages than it will return
+TOO_MANY_RESULTS = "Too many package results."
+
+
+class AURError(RuntimeError):
+    """The RPC answered with type: error"""
+
+    def __init__(self, error: str, message: str = ""):
+        super().__init__(message or f"AUR: {error}")
+        self.error = error
+
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def session():
+    """One pooled session for every AUR request this process makes"""
+    global _session
+    with _session_lock:
+        if _session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+            _session = requests.Session()
+            _session.mount(AUR_URL + "/", HTTPAdapter(pool_connections=1, pool_maxsize=8))
+        return _session
+
+
+def _rpc(params: List[tuple], timeout: float = TIMEOUT) -> List[Dict[str, Any]]:
+    response = session().get(f"{AUR_URL}/rpc/?{urlencode([('v', RPC_VERSION)] + params)}", timeout=timeout)
+    response.raise_for_status()
+    data = response.json()
+    if data.get("type") == "error":
+        raise AURError(data.get("error") or "unknown error")
+    return data.get("results", [])
+
+
+def _chunks(names: List[str]) -> Iterable[List[str]]:
+    """Split names into groups whose info URL stays under MAX_URL_LENGTH"""
+    chunk, length = [], len(AUR_URL) + 32
+    for name in names:
+        arg = len(urlencode([("arg[]", name)])) + 1
+        if chunk and length + arg > MAX_URL_LENGTH:
+            yield chunk
+            chunk, length = [], len(AUR_URL) + 32
+        chunk.append(name)
+        length += arg
+    if chunk:
+        yield chunk
+
+
+def info(names: Iterable[str], ttl: float = INFO_TTL, timeout: float = TIMEOUT) -> Dict[str, Dict[str, Any]]:
+    """
+    {name: AUR package record} for the names that exist in the AUR.
+    Cached names are not asked for again; the rest go out in batches.
+    Names match case-insensitively, like the RPC itself.
+    """
+    cache = get_cache()
+    found = {}
+    missing = []
+    for name in dict.fromkeys(names):
+        entry = cache.get_entry(f"aur:info:{name.lower()}", ttl=ttl)
+        if entry is None:
+            missing.append(name)
+        elif entry["value"]:
+            found[name] = entry["value"]
+
+    for chunk in _chunks(missing):
+        results = {
+            pkg["Name"].lower(): pkg
+            for pkg in _rpc([("type", "info")] + [("arg[]", name) for name in chunk], timeout)
+        }
+        for name in chunk:
+            # Unknown names are cached too, as {}
+            pkg = results.get(name.lower(), {})
+            cache.put_entry(f"aur:info:{name.lower()}", pkg)
+            if pkg:
+                found[name] = pkg
+    return found
+
+
+def exists(name: str, timeout: float = TIMEOUT) -> bool:
+    return name in info([name], timeout=timeout)
+
+
+def search(term: str, by: str = "name-desc", ttl: float = SEARCH_TTL,
+           timeout: float = TIMEOUT) -> List[Dict[str, Any]]:
+    """Package records matching term, most popular first"""
+    norm = normalize_query(term)
+    key = f"aur:search:{by}:{norm}"
+    entry = get_cache().get_entry(key, ttl=ttl)
+    if entry is not None:
+        results = entry["value"]
+    else:
+        try:
+            results = _rpc([("type", "search"), ("by", by), ("arg", norm)], timeout)
+        except AURError as e:
+            if e.error != TOO_MANY_RESULTS:
+                raise
+            raise AURError(e.error, f"Too many AUR packages match '{term}', try a longer or more specific term") from None
+        get_cache().put_entry(key, results)
+    return sorted(results, key=lambda pkg: -(pkg.get("Popularity") or 0))
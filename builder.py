@@ -1,11 +1,11 @@
 import json
-import subprocess
+import executor
+import gitcache
 import os
 from typing import List, Dict, Any, Optional
 
 
 import os
-import subprocess
 
 def setexecutiondir():
     """Check and optionally change the current working directory for the package build"""
@@ -56,7 +56,7 @@ def setexecutiondir():
             print("\n⚙️ Automatic Meow Build selected.")
             if os.path.exists("autobuild.py"):
                 print("✅ autobuild.py found — launching automatic build.")
-                subprocess.run(["python", "autobuild.py"])
+                executor.run(["python", "autobuild.py"], capture=False)
                 return "automatic"
             else:
                 print("❌ autobuild.py not found. Cannot start automatic build.")
@@ -121,7 +121,7 @@ class MeowBuilder:
     def installfromgit(self, repo_url: str) -> bool:
         """Install package from git repository"""
         try:
-            subprocess.run(["git", "clone", repo_url], check=True, capture_output=True)
+            gitcache.clone(repo_url, check=True)
             return True
         except Exception:
             pkg_name = repo_url.split('/')[-1].replace('.git', '')
@@ -131,7 +131,7 @@ class MeowBuilder:
     def installfrompacman(self, pkg_name: str) -> bool:
         """Install package from pacman"""
         try:
-            subprocess.run(["sudo", "pacman", "-S", "--noconfirm", pkg_name], check=True, capture_output=True)
+            executor.run(["sudo", "pacman", "-S", "--noconfirm", pkg_name], check=True)
             return True
         except Exception:
             self._print_warning(pkg_name, "pacman")
@@ -140,7 +140,7 @@ class MeowBuilder:
     def installfrompip(self, pkg_name: str) -> bool:
         """Install package from pip"""
         try:
-            subprocess.run(["pip", "install", pkg_name], check=True, capture_output=True)
+            executor.run(["pip", "install", pkg_name], check=True)
             return True
         except Exception:
             self._print_warning(pkg_name, "pip")
@@ -149,7 +149,7 @@ class MeowBuilder:
     def installfromaur(self, pkg_name: str) -> bool:
         """Install package from AUR"""
         try:
-            subprocess.run(["yay", "-S", "--noconfirm", pkg_name], check=True, capture_output=True)
+            executor.run(["yay", "-S", "--noconfirm", pkg_name], check=True)
             return True
         except Exception:
             self._print_warning(pkg_name, "aur")
@@ -0,0 +1,296 @@
+"""
+Local snapshot of the Meow package catalog.
+
+`meow refresh` pulls the catalog from the Meow API into
+~/.cache/meow/meow-catalog.sqlite3. After the first full download only
+packages updated since the last sync are transferred (the `updated_since`
+cursor), and an unchanged catalog costs one 304 answer (ETag). Search,
+info and list then run against the snapshot: every package is visible and
+nothing touches the network.
+
+MEOW_API_URL points meow at another server (default http://localhost:8000).
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+API_URL = os.environ.get("MEOW_API_URL", "http://localhost:8000").rstrip("/")
+CATALOG_PATH = Path("~/.cache/meow/meow-catalog.sqlite3").expanduser()
+PAGE_SIZE = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    name           TEXT PRIMARY KEY COLLATE NOCASE,
+    version        TEXT NOT NULL DEFAULT '',
+    owner          TEXT NOT NULL DEFAULT '',
+    giturl         TEXT NOT NULL DEFAULT '',
+    description    TEXT NOT NULL DEFAULT '',
+    tags           TEXT NOT NULL DEFAULT '',
+    verified       INTEGER NOT NULL DEFAULT 0,
+    download_count INTEGER NOT NULL DEFAULT 0,
+    updated_at     TEXT,
+    data           TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def _inactive(pkg: Dict[str, Any]) -> bool:
+    return pkg.get("is_active") is False or pkg.get("active") is False or bool(pkg.get("deleted"))
+
+
+def _tags(pkg: Dict[str, Any]) -> str:
+    tags = pkg.get("tags") or ""
+    return ", ".join(tags) if isinstance(tags, list) else str(tags)
+
+
+class Catalog:
+    """On-disk copy of the Meow catalog"""
+
+    def __init__(self, path=CATALOG_PATH, base_url: str = API_URL):
+        self.path = Path(path)
+        self.base_url = base_url
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def meta(self, key: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    def _set_meta(self, **values):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", list(values.items())
+        )
+
+    def apply(self, packages: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Upsert changed packages and drop inactive ones. Returns (changed, removed)."""
+        with self._lock, self.conn:
+            return self._apply(packages)
+
+    def _apply(self, packages: List[Dict[str, Any]]) -> Tuple[int, int]:
+        changed = removed = 0
+        for pkg in packages:
+            name = pkg.get("name")
+            if not name:
+                continue
+            if _inactive(pkg):
+                removed += self.conn.execute("DELETE FROM packages WHERE name = ?", (name,)).rowcount
+                continue
+            self.conn.execute(
+                "INSERT OR REPLACE INTO packages "
+                "(name, version, owner, giturl, description, tags, verified, download_count, updated_at, data) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (name, pkg.get("version") or "", pkg.get("owner") or "", pkg.get("giturl") or "",
+                 pkg.get("description") or "", _tags(pkg), int(bool(pkg.get("verified"))),
+                 int(pkg.get("download_count") or 0), pkg.get("updated_at"), json.dumps(pkg))
+            )
+            changed += 1
+        return changed, removed
+
+    def _replace(self, packages: List[Dict[str, Any]], reset: bool) -> Tuple[int, int]:
+        """Make packages the whole catalog; called inside the sync transaction"""
+        if reset:
+            self.conn.execute("DELETE FROM meta")
+        self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen (name TEXT PRIMARY KEY COLLATE NOCASE)")
+        self.conn.execute("DELETE FROM seen")
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO seen (name) VALUES (?)",
+            [(p["name"],) for p in packages if p.get("name") and not _inactive(p)]
+        )
+        # Whatever the full download did not mention is gone
+        removed = self.conn.execute("DELETE FROM packages WHERE name NOT IN (SELECT name FROM seen)").rowcount
+        changed, _ = self._apply(packages)
+        return changed, removed
+
+    def sync(self, client=None, full: bool = False) -> Tuple[int, int]:
+        """
+        Bring the snapshot up to date. Returns (changed, removed).
+        Raises requests.RequestException when the server cannot be reached.
+
+        A full download is staged in memory and swapped in with one
+        transaction, so a failure halfway keeps the old snapshot intact.
+        """
+        if client is None:
+            from meowinstaller import MeowAPIClient
+            client = MeowAPIClient(self.base_url)
+
+        with self._lock:
+            if self.meta("base_url") not in (None, self.base_url):
+                # Another server: its cursor means nothing here
+                full = True
+            cursor = None if full else self.meta("cursor")
+            etag = None if full else self.meta("etag")
+
+        started = time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime())
+        changed = removed = 0
+        newest = cursor
+        first_etag = None
+        not_modified = False
+        staged = []
+        skip = 0
+        while True:
+            page, page_etag = client.get_changed_packages(
+                cursor, skip=skip, limit=PAGE_SIZE, etag=etag if skip == 0 else None
+            )
+            if page is None:
+                # 304: nothing changed since the last sync
+                not_modified = True
+                break
+            if skip == 0:
+                first_etag = page_etag
+            if cursor is None:
+                staged += page
+            else:
+                # Upserts are idempotent and the cursor only moves at the
+                # end, so an incremental sync can apply page by page
+                c, r = self.apply(page)
+                changed += c
+                removed += r
+            stamps = [p["updated_at"] for p in page if p.get("updated_at")]
+            if stamps:
+                newest = max(stamps + ([newest] if newest else []))
+            if len(page) < PAGE_SIZE:
+                break
+            skip += PAGE_SIZE
+
+        with self._lock, self.conn:
+            if cursor is None and not not_modified:
+                changed, removed = self._replace(staged, reset=full)
+            self._set_meta(base_url=self.base_url, synced_at=started)
+            if changed or removed or full:
+                self._set_meta(changed_at=started)
+            if newest:
+                self._set_meta(cursor=newest)
+            if first_etag:
+                self._set_meta(etag=first_etag)
+        return changed, removed
+
+    def _query(self, sql: str, params=()) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [json.loads(row["data"]) for row in self.conn.execute(sql, params)]
+
+    def count(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM packages").fetchone()[0]
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        rows = self._query("SELECT data FROM packages WHERE name = ?", (name,))
+        return rows[0] if rows else None
+
+    def search(self, query: str, limit: Optional[int] = None, verified_only: bool = False) -> List[Dict[str, Any]]:
+        """Substring match on name, description, owner and tags; name matches first"""
+        pattern = "%" + query.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = (
+            "SELECT data FROM packages WHERE (name LIKE ?1 ESCAPE '\\' OR description LIKE ?1 ESCAPE '\\' "
+            "OR owner LIKE ?1 ESCAPE '\\' OR tags LIKE ?1 ESCAPE '\\')"
+        )
+        if verified_only:
+            sql += " AND verified = 1"
+        sql += " ORDER BY name NOT LIKE ?1 ESCAPE '\\', length(name), name"
+        params = (pattern,)
+        if limit:
+            sql += " LIMIT ?2"
+            params += (limit,)
+        return self._query(sql, params)
+
+    def all(self, limit: Optional[int] = None, verified_only: bool = False) -> List[Dict[str, Any]]:
+        sql = "SELECT data FROM packages"
+        if verified_only:
+            sql += " WHERE verified = 1"
+        sql += " ORDER BY name"
+        params = ()
+        if limit:
+            sql += " LIMIT ?"
+            params = (limit,)
+        return self._query(sql, params)
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_catalog() -> Catalog:
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = Catalog()
+        return _catalog
+
+
+# === CLI ===
+
+def refresh(full: bool = False):
+    import requests
+    catalog = get_catalog()
+    print(f"Refreshing the Meow catalog from {catalog.base_url}...")
+    start = time.monotonic()
+    try:
+        changed, removed = catalog.sync(full=full)
+    except requests.RequestException as e:
+        print(f"[WARN] Could not refresh the Meow catalog: {e}")
+        return False
+    print(f"{changed} package(s) updated, {removed} removed, {catalog.count()} in the catalog "
+          f"({time.monotonic() - start:.1f}s)")
+    return True
+
+
+def _ensure_synced(catalog: Catalog) -> bool:
+    if catalog.meta("synced_at"):
+        return True
+    print("The Meow catalog has not been downloaded yet.")
+    return refresh()
+
+
+def print_info(name: str):
+    catalog = get_catalog()
+    if not _ensure_synced(catalog):
+        return
+    package = catalog.get(name)
+    if not package:
+        print(f"Package '{name}' is not in the Meow catalog (run `meow refresh` to update it).")
+        return
+
+    verified_badge = "✓ VERIFIED" if package.get('verified') else "⚠ UNVERIFIED"
+    print(f"\n{'='*60}")
+    print(f"Package: {package.get('name')} [{verified_badge}]")
+    print(f"{'='*60}")
+    print(f"Owner:        {package.get('owner')}")
+    print(f"Version:      {package.get('version')}")
+    print(f"Git URL:      {package.get('giturl')}")
+    for label, key in (("Description", "description"), ("License", "license"),
+                       ("Dependencies", "dependencies"), ("Homepage", "homepage"),
+                       ("Repository", "repository"), ("Tags", "tags")):
+        if package.get(key):
+            print(f"{label + ':':<14}{package.get(key)}")
+    print(f"Downloads:    {package.get('download_count', 0)}")
+    print(f"{'='*60}\n")
+
+
+def print_list(limit: Optional[int] = None, verified_only: bool = False):
+    catalog = get_catalog()
+    if not _ensure_synced(catalog):
+        return
+    packages = catalog.all(limit, verified_only)
+    if not packages:
+        print("No packages found.")
+        return
+
+    print(f"\n{'='*90}")
+    print(f"{'Name':<30} {'Version':<15} {'Owner':<20} {'Verified':<10} {'Downloads':<10}")
+    print(f"{'='*90}")
+    for pkg in packages:
+        verified_status = "✓ Yes" if pkg.get('verified') else "✗ No"
+        print(f"{pkg.get('name', ''):<30} {pkg.get('version', ''):<15} "
+              f"{pkg.get('owner', ''):<20} {verified_status:<10} {pkg.get('download_count', 0):<10}")
+    print(f"{'='*90}\n")
+    print(f"Total: {len(packages)} of {catalog.count()} packages")
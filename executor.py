@@ -0,0 +1,191 @@
+"""
+One place to run external commands.
+
+Every command meow runs goes through run() or iter_lines(), which
+
+  * take a per-command timeout and kill the command when it runs out,
+  * limit how many commands run at once (MEOW_MAX_PROCS, default 8),
+  * keep only the last lines of streamed output in a bounded ring buffer,
+  * record argv, duration and exit code of every invocation.
+
+Set MEOW_TIMINGS=1 to print the timing records when meow exits, or
+MEOW_TIMINGS=/path/to/file.jsonl to append them to a file.
+"""
+
+import atexit
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Iterator, List, NamedTuple, Optional
+
+MAX_PROCS = int(os.environ.get("MEOW_MAX_PROCS", "8"))
+# Lines of output kept by stream() when nobody else needs them
+RING_LINES = 200
+MAX_TIMINGS = 1000
+
+# Default timeouts (seconds) for non-interactive commands
+QUERY_TIMEOUT = 60
+PROBE_TIMEOUT = 20
+
+
+class Timing(NamedTuple):
+    argv: List[str]
+    started: float
+    duration: float
+    returncode: Optional[int]
+    # "timeout", "not found" or None
+    error: Optional[str] = None
+
+
+class StreamResult(NamedTuple):
+    returncode: Optional[int]
+    # The last RING_LINES lines of output
+    tail: Deque[str]
+    timed_out: bool
+
+
+TIMINGS: Deque[Timing] = deque(maxlen=MAX_TIMINGS)
+_timings_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_PROCS)
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def record(argv, started: float, returncode: Optional[int], error: Optional[str] = None):
+    with _timings_lock:
+        TIMINGS.append(Timing([str(a) for a in argv], started, time.time() - started, returncode, error))
+
+
+def run(argv: List[str], timeout: Optional[float] = None, capture: bool = True, check: bool = False,
+        **kwargs) -> subprocess.CompletedProcess:
+    """
+    subprocess.run with a timing record. capture=True collects stdout and
+    stderr as text; capture=False leaves the terminal to the command (for
+    interactive installs). Raises subprocess.TimeoutExpired after timeout
+    seconds (the command is killed first) and FileNotFoundError like
+    subprocess.run does.
+    """
+    if capture:
+        kwargs.setdefault("capture_output", True)
+    kwargs.setdefault("text", True)
+    started = time.time()
+    returncode, error = None, None
+    with _slots:
+        try:
+            result = subprocess.run(argv, timeout=timeout, **kwargs)
+            returncode = result.returncode
+        except subprocess.TimeoutExpired:
+            error = "timeout"
+            raise
+        except FileNotFoundError:
+            error = "not found"
+            raise
+        finally:
+            record(argv, started, returncode, error)
+    if check and result.returncode != 0:
+        raise subprocess.CalledProcessError(result.returncode, argv, result.stdout, result.stderr)
+    return result
+
+
+def iter_lines(argv: List[str], timeout: Optional[float] = None, stderr=subprocess.DEVNULL,
+               **kwargs) -> Iterator[str]:
+    """
+    Yield the command's output line by line as it arrives; the generator's
+    return value is the exit code. Closing the generator early kills the
+    command. Raises subprocess.TimeoutExpired if the command is still
+    running after timeout seconds.
+    """
+    started = time.time()
+    error = None
+    with _slots:
+        try:
+            proc = subprocess.Popen(argv, stdout=subprocess.PIPE, stderr=stderr, text=True, **kwargs)
+        except FileNotFoundError:
+            record(argv, started, None, "not found")
+            raise
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            proc.kill()
+
+        timer = threading.Timer(timeout, kill) if timeout else None
+        if timer:
+            timer.daemon = True
+            timer.start()
+        try:
+            yield from proc.stdout
+            if timed_out.is_set():
+                error = "timeout"
+                raise subprocess.TimeoutExpired(argv, timeout)
+        finally:
+            if timer:
+                timer.cancel()
+            if proc.poll() is None:
+                proc.kill()
+            proc.wait()
+            proc.stdout.close()
+            record(argv, started, proc.returncode, error)
+    return proc.returncode
+
+
+def stream(argv: List[str], timeout: Optional[float] = None, on_line: Optional[Callable[[str], None]] = None,
+           max_lines: int = RING_LINES, **kwargs) -> StreamResult:
+    """
+    Run a command with stdout and stderr merged, hand every line to on_line
+    as it arrives and keep only the last max_lines in memory.
+    """
+    tail: Deque[str] = deque(maxlen=max_lines)
+    lines = iter_lines(argv, timeout, stderr=subprocess.STDOUT, **kwargs)
+    while True:
+        try:
+            line = next(lines)
+        except StopIteration as done:
+            return StreamResult(done.value, tail, False)
+        except subprocess.TimeoutExpired:
+            return StreamResult(None, tail, True)
+        tail.append(line)
+        if on_line:
+            on_line(line)
+
+
+def pool():
+    """Shared ThreadPoolExecutor for running probes and queries in parallel"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _pool = ThreadPoolExecutor(max_workers=MAX_PROCS, thread_name_prefix="meow-exec")
+        return _pool
+
+
+def summary() -> str:
+    with _timings_lock:
+        timings = list(TIMINGS)
+    lines = [f"{len(timings)} command(s), {sum(t.duration for t in timings):.2f}s total"]
+    for t in sorted(timings, key=lambda t: -t.duration):
+        status = t.error or f"exit {t.returncode}"
+        lines.append(f"  {t.duration:8.3f}s  {status:<9}  {' '.join(t.argv)}")
+    return "\n".join(lines)
+
+
+def _dump_timings():
+    target = os.environ.get("MEOW_TIMINGS")
+    if not target or not TIMINGS:
+        return
+    if target in ("1", "yes", "true", "-"):
+        print(summary(), file=sys.stderr)
+        return
+    try:
+        with open(target, "a") as f:
+            for t in list(TIMINGS):
+                f.write(json.dumps(t._asdict()) + "\n")
+    except OSError as e:
+        print(f"[WARN] Could not write timings to {target}: {e}", file=sys.stderr)
+
+
+atexit.register(_dump_timings)
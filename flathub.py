@@ -0,0 +1,96 @@
+"""
+Cached Flathub API lookups.
+
+Every Flathub request Meow makes goes through here, so one command never
+asks Flathub the same question twice and repeated commands are served from
+the on-disk HTTP cache until the TTL runs out. When flatpak has the Flathub
+appstream catalog on disk, find_apps(), exists() and first_app_id() answer
+from that instead and never touch the network.
+"""
+
+from typing import Any, Dict, List, Optional
+from urllib.parse import quote
+
+from httpcache import DEFAULT_TTL, get_cache, normalize_query
+
+SEARCH_V2_URL = "https://flathub.org/api/v2/search"
+SEARCH_V1_URL = "https://flathub.org/api/v1/apps/search/{query}"
+
+# Name of the Flathub remote in the local appstream catalogs
+REMOTE = "flathub"
+
+
+def search(query: str, timeout: float = 10, ttl: float = DEFAULT_TTL) -> Optional[List[Dict[str, Any]]]:
+    """Hits from the v2 search API, or None when Flathub answered with an error"""
+    norm = normalize_query(query)
+    data = get_cache().get_json(
+        f"flathub:v2:search:{norm}",
+        "POST", SEARCH_V2_URL,
+        ttl=ttl,
+        timeout=timeout,
+        json={"query": norm, "filters": []},
+        headers={"Content-Type": "application/json"}
+    )
+    if data is None:
+        return None
+    return data.get("hits", [])
+
+
+def search_v1(query: str, timeout: float = 5, ttl: float = DEFAULT_TTL) -> Optional[List[Dict[str, Any]]]:
+    """App list from the v1 search API, or None when Flathub answered with an error"""
+    norm = normalize_query(query)
+    return get_cache().get_json(
+        f"flathub:v1:search:{norm}",
+        "GET", SEARCH_V1_URL.format(query=quote(norm)),
+        ttl=ttl,
+        timeout=timeout
+    )
+
+
+def local_index():
+    """The appstream index when it has the flathub remote, else None"""
+    import appstream
+    index = appstream.get_index()
+    if index is None or not index.has_remote(REMOTE):
+        return None
+    return index
+
+
+def find_apps(query: str, limit: Optional[int] = None, timeout: float = 10) -> Optional[List[Dict[str, Any]]]:
+    """[{app_id, name, summary, version}, ...] from the local catalog, else the v2 API"""
+    index = local_index()
+    if index is not None:
+        return index.search(query, REMOTE, limit=limit)
+    hits = search(query, timeout=timeout)
+    if hits is None:
+        return None
+    return hits[:limit] if limit else hits
+
+
+def exists(query: str, timeout: float = 5) -> bool:
+    """
+    True if query appears in the ID or name of a Flathub app. Raises
+    RuntimeError when Flathub answers with an error and requests'
+    exceptions when it cannot be reached, so "not found" is never a guess.
+    """
+    index = local_index()
+    if index is not None:
+        return index.exists(query, REMOTE)
+    data = search_v1(query, timeout=timeout)
+    if data is None:
+        raise RuntimeError("Flathub answered with an error")
+    query = query.lower()
+    return any(
+        query in app.get("flatpakAppId", "").lower() or query in app.get("name", "").lower()
+        for app in data
+    )
+
+
+def first_app_id(query: str, timeout: float = 10) -> Optional[str]:
+    index = local_index()
+    if index is not None:
+        return index.first_app_id(query, REMOTE)
+    hits = search(query, timeout=timeout)
+    if not hits:
+        return None
+    return hits[0].get("app_id")
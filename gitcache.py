@@ -0,0 +1,191 @@
+"""
+Shared object cache for Meow package clones.
+
+Every git URL meow clones gets a bare mirror in ~/.cache/meow/git. clone()
+first brings the mirror up to date, which only transfers the objects it
+does not have yet, then clones the checkout with --reference-if-able to
+the mirror: the checkout borrows the mirror's objects through
+.git/objects/info/alternates instead of downloading them again. So
+reinstalling a package, or installing another version of it, fetches only
+what is new.
+
+Checkouts depend on their mirror, so mirrors never drop objects: fetches
+do not prune refs and gc never prunes. Delete a mirror only together with
+the checkouts made from it.
+
+MEOW_GIT_CACHE=0 turns the cache off; clones are then partial
+(--filter=blob:none), which fetches history without old file contents.
+MEOW_GIT_CACHE_DIR moves the cache.
+
+check_updates() tells which checkouts are behind their remote with one
+`git ls-remote` per checkout, so an update pass fetches only those.
+"""
+
+import fcntl
+import hashlib
+import os
+import re
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+import executor
+
+CACHE_DIR = Path(os.environ.get("MEOW_GIT_CACHE_DIR", "~/.cache/meow/git")).expanduser()
+ENABLED = os.environ.get("MEOW_GIT_CACHE", "1").lower() not in ("0", "no", "false", "off")
+
+
+def mirror_path(url: str) -> Path:
+    """~/.cache/meow/git/<repo name>-<hash of the url>.git"""
+    name = re.sub(r"\.git$", "", url.rstrip("/").rsplit("/", 1)[-1]) or "repo"
+    name = re.sub(r"[^A-Za-z0-9._-]", "_", name)
+    digest = hashlib.sha1(url.encode()).hexdigest()[:12]
+    return CACHE_DIR / f"{name}-{digest}.git"
+
+
+def _git(argv, timeout=None) -> subprocess.CompletedProcess:
+    return executor.run(["git", *argv], timeout=timeout)
+
+
+def _warn(url: str, result: subprocess.CompletedProcess):
+    detail = (result.stderr or "").strip().splitlines()
+    print(f"[WARN] Could not update the git cache for {url}: {detail[-1] if detail else 'git failed'}")
+
+
+def update_mirror(url: str, timeout: Optional[float] = None) -> Optional[Path]:
+    """
+    Create or refresh the mirror of url. Returns its path, or None when
+    the cache is off or git failed (callers then clone without it).
+    """
+    if not ENABLED:
+        return None
+    mirror = mirror_path(url)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # One writer per mirror, also across meow processes
+        with open(f"{mirror}.lock", "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            if mirror.exists():
+                result = _git(["-C", str(mirror), "fetch", "--quiet", "origin"], timeout)
+            else:
+                partial = Path(f"{mirror}.partial")
+                shutil.rmtree(partial, ignore_errors=True)
+                result = _git(["clone", "--quiet", "--mirror", url, str(partial)], timeout)
+                if result.returncode == 0:
+                    _git(["-C", str(partial), "config", "gc.pruneExpire", "never"])
+                    _git(["-C", str(partial), "config", "gc.reflogExpireUnreachable", "never"])
+                    partial.rename(mirror)
+                else:
+                    shutil.rmtree(partial, ignore_errors=True)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"[WARN] Could not update the git cache for {url}: {e}")
+        return None
+    if result.returncode != 0:
+        _warn(url, result)
+        return None if not mirror.exists() else mirror
+    return mirror
+
+
+def clone_argv(url: str, dest: Optional[str] = None, branch: Optional[str] = None,
+               depth: Optional[int] = None, timeout: Optional[float] = None):
+    """The git clone command for url, refreshing its mirror first"""
+    mirror = update_mirror(url, timeout)
+    argv = ["git", "clone"]
+    if mirror is not None:
+        argv += ["--reference-if-able", str(mirror)]
+    else:
+        argv += ["--filter=blob:none"]
+    if depth:
+        argv += ["--depth", str(depth)]
+    if branch:
+        argv += ["--branch", branch]
+    argv.append(url)
+    if dest:
+        argv.append(str(dest))
+    return argv
+
+
+def clone(url: str, dest: Optional[str] = None, branch: Optional[str] = None, depth: Optional[int] = None,
+          timeout: Optional[float] = None, capture: bool = True, check: bool = False,
+          **kwargs) -> subprocess.CompletedProcess:
+    """
+    `git clone url [dest]` backed by the shared cache. Takes executor.run's
+    capture/check/env/cwd arguments; the mirror is refreshed quietly first.
+    """
+    argv = clone_argv(url, dest, branch, depth, timeout)
+    return executor.run(argv, timeout=timeout, capture=capture, check=check, **kwargs)
+
+
+class UpdateCheck(NamedTuple):
+    path: str
+    # Commit checked out and commit of the remote branch it tracks
+    local: Optional[str]
+    remote: Optional[str]
+    # None when it could not be checked (see error)
+    outdated: Optional[bool]
+    error: Optional[str] = None
+
+
+def checkouts(install_dir: str) -> List[str]:
+    """Git checkouts directly under install_dir"""
+    try:
+        entries = sorted(os.scandir(install_dir), key=lambda e: e.name)
+    except OSError:
+        return []
+    return [e.path for e in entries if e.is_dir() and os.path.exists(os.path.join(e.path, ".git"))]
+
+
+def check_update(checkout: str, timeout: Optional[float] = executor.PROBE_TIMEOUT) -> UpdateCheck:
+    """Compare HEAD with the tip of its upstream branch without fetching anything"""
+    try:
+        result = _git(["-C", checkout, "for-each-ref",
+                       "--format=%(HEAD) %(objectname) %(upstream:remotename) %(upstream:remoteref)",
+                       "refs/heads"], timeout)
+        current = [line.split() for line in result.stdout.splitlines() if line.startswith("*")]
+        if result.returncode != 0 or not current:
+            return UpdateCheck(checkout, None, None, None, "not on a branch")
+        if len(current[0]) < 4:
+            return UpdateCheck(checkout, current[0][1], None, None, "no upstream branch")
+        _, local, remote_name, remote_ref = current[0][:4]
+
+        result = _git(["-C", checkout, "ls-remote", "--quiet", remote_name, remote_ref], timeout)
+        if result.returncode != 0:
+            detail = (result.stderr or "").strip().splitlines()
+            return UpdateCheck(checkout, local, None, None, detail[-1] if detail else "ls-remote failed")
+        # ls-remote matches patterns by suffix; only the exact ref counts
+        tips = {ref: sha for sha, ref in (line.split("\t", 1) for line in result.stdout.splitlines() if "\t" in line)}
+        remote = tips.get(remote_ref)
+        if remote is None:
+            return UpdateCheck(checkout, local, None, None, f"{remote_ref} is gone from {remote_name}")
+        if remote == local:
+            return UpdateCheck(checkout, local, remote, False)
+        # Local commits on top of the remote tip are not an update
+        ahead = _git(["-C", checkout, "merge-base", "--is-ancestor", remote, local], timeout).returncode == 0
+        return UpdateCheck(checkout, local, remote, not ahead)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return UpdateCheck(checkout, None, None, None, str(e))
+
+
+def check_updates(paths: Iterable[str], workers: int = executor.MAX_PROCS) -> Dict[str, UpdateCheck]:
+    """check_update() for many checkouts, at most `workers` at a time"""
+    paths = list(paths)
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="meow-git") as pool:
+        return dict(zip(paths, pool.map(check_update, paths)))
+
+
+def pull(checkout: str, timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    return _git(["-C", checkout, "pull", "--quiet"], timeout)
+
+
+def update_checkouts(paths: Iterable[str], workers: int = executor.MAX_PROCS,
+                     timeout: Optional[float] = None) -> Dict[str, subprocess.CompletedProcess]:
+    """`git pull` in every checkout, at most `workers` at a time"""
+    paths = list(paths)
+    if not paths:
+        return {}
+    with ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="meow-git") as pool:
+        return dict(zip(paths, pool.map(lambda path: pull(path, timeout), paths)))
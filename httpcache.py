@@ -0,0 +1,208 @@
+"""
+Persistent HTTP response cache.
+
+Responses are stored in ~/.cache/meow/http-cache.sqlite3 keyed by a
+caller-chosen key (usually a normalized query). Fresh entries are served
+without touching the network, stale ones are revalidated with
+If-None-Match / If-Modified-Since, and the least recently used entries are
+evicted once the cache grows past its size cap. Within one process every
+key is memoized, so a command never fetches the same thing twice.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CACHE_PATH = Path("~/.cache/meow/http-cache.sqlite3").expanduser()
+DEFAULT_TTL = 60 * 60
+MAX_BYTES = 16 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key           TEXT PRIMARY KEY,
+    body          TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL NOT NULL,
+    accessed_at   REAL NOT NULL,
+    size          INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_accessed ON entries (accessed_at);
+"""
+
+
+def _like_prefix(prefix: str) -> str:
+    return prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+
+
+def normalize_query(query: str) -> str:
+    """'  Firefox  Browser' -> 'firefox browser'"""
+    return " ".join(str(query).lower().split())
+
+
+class HTTPCache:
+    """On-disk cache with TTL, conditional revalidation and LRU eviction"""
+
+    def __init__(self, path=CACHE_PATH, max_bytes: int = MAX_BYTES):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._memo: Dict[str, Any] = {}
+        self.conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+        self._session = None
+
+    # ------------------------------------------------------------------
+    # Raw entries
+    # ------------------------------------------------------------------
+
+    def get_entry(self, key: str, ttl: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Stored entry for key (or None). With ttl, stale entries are ignored."""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if ttl is not None and row["fetched_at"] + ttl < time.time():
+                return None
+            with self.conn:
+                self.conn.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (time.time(), key))
+        entry = dict(row)
+        entry["value"] = json.loads(entry["body"])
+        return entry
+
+    def put_entry(self, key: str, value: Any, etag: Optional[str] = None, last_modified: Optional[str] = None):
+        body = json.dumps(value, separators=(",", ":"))
+        now = time.time()
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO entries (key, body, etag, last_modified, fetched_at, accessed_at, size) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, body, etag, last_modified, now, now, len(body))
+                )
+            self._evict()
+            self._memo[key] = value
+
+    def keys(self, prefix: str = "") -> List[str]:
+        with self._lock:
+            return [row["key"] for row in self.conn.execute(
+                "SELECT key FROM entries WHERE key LIKE ? ESCAPE '\\'", (_like_prefix(prefix),)
+            )]
+
+    def signature(self, prefix: str = "") -> Optional[str]:
+        """Changes whenever an entry under prefix is stored or revalidated"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT COUNT(*), MAX(fetched_at) FROM entries WHERE key LIKE ? ESCAPE '\\'", (_like_prefix(prefix),)
+            ).fetchone()
+        return f"{row[0]}:{row[1]}" if row[0] else None
+
+    def _evict(self):
+        """Drop least recently used entries until the cache fits in max_bytes"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        with self.conn:
+            for row in self.conn.execute("SELECT key, size FROM entries ORDER BY accessed_at").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self.conn.execute("DELETE FROM entries WHERE key = ?", (row["key"],))
+                self._memo.pop(row["key"], None)
+                total -= row["size"]
+
+    def _touch(self, key: str):
+        with self._lock:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE key = ?",
+                    (time.time(), time.time(), key)
+                )
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    @property
+    def session(self):
+        if self._session is None:
+            import requests
+            self._session = requests.Session()
+        return self._session
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def get_json(self, key: str, method: str, url: str, ttl: float = DEFAULT_TTL,
+                 timeout: float = 10, **kwargs) -> Optional[Any]:
+        """
+        Return the decoded JSON body for key, fetching it only when needed.
+
+        Returns None when the server answers with an error status. Network
+        errors fall back to a stale copy when one exists, otherwise they are
+        raised to the caller.
+        """
+        if key in self._memo:
+            return self._memo[key]
+
+        with self._key_lock(key):
+            if key in self._memo:
+                return self._memo[key]
+
+            cached = self.get_entry(key)
+            if cached and cached["fetched_at"] + ttl >= time.time():
+                self._memo[key] = cached["value"]
+                return cached["value"]
+
+            headers = dict(kwargs.pop("headers", None) or {})
+            if cached and cached["etag"]:
+                headers["If-None-Match"] = cached["etag"]
+            if cached and cached["last_modified"]:
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+            import requests
+            try:
+                response = self.session.request(method, url, headers=headers, timeout=timeout, **kwargs)
+            except requests.RequestException:
+                if cached:
+                    self._memo[key] = cached["value"]
+                    return cached["value"]
+                raise
+
+            if response.status_code == 304 and cached:
+                self._touch(key)
+                self._memo[key] = cached["value"]
+                return cached["value"]
+            if response.status_code != 200:
+                return None
+
+            value = response.json()
+            self.put_entry(
+                key, value,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified")
+            )
+            return value
+
+    def clear_memo(self):
+        with self._lock:
+            self._memo.clear()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> HTTPCache:
+    """Shared cache for this process"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = HTTPCache()
+        return _cache
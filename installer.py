@@ -1,45 +1,50 @@
 import re
-import requests
 from parser import create_parser
-from meowinstaller import installMeowpkg
 import subprocess
-import os
-import json
+import queue
+import threading
+import time
+import executor
+import pacmandb
+import search
+import versions
  
 
-def search_flathub(pkgname, pkgid=None):
-    try:
-        print(f"Searching for '{pkgname}' on Flathub 🔍")
-        url = "https://flathub.org/api/v2/search"
-        payload = {"query": pkgname, "filters": []}
-        headers = {"Content-Type": "application/json"}
+def collect_flathub(pkgname, limit=None, timeout=10):
+    import flathub
+    hits = flathub.find_apps(pkgname, limit=limit, timeout=timeout)
+    if hits is None:
+        raise RuntimeError("Failed to fetch data from Flathub API.")
+    return [
+        search.SearchResult(
+            "flathub", app.get("name", "Unknown"), app.get("version", ""), app.get("summary", ""),
+            source="flathub", app_id=app.get("app_id")
+        )
+        for app in hits
+    ]
 
-        response = requests.post(url, json=payload, headers=headers, timeout=10)
 
-        if response.status_code != 200:
-            print("Failed to fetch data from Flathub API. Status:", response.status_code)
-            print("Response text:", response.text)
-            return []
+def print_flathub_results(results):
+    if not results:
+        print("No results found.")
+        return
 
-        data = response.json()
-        results = data.get("hits", [])
-        if not results:
-            print("No results found.")
-            return []
+    print(f"Found {len(results)} results:\n")
 
-        print(f"\nFound {len(results)} results:\n")
+    for app in results:
+        print(f"{app.name} ({app.app_id or 'Unknown ID'})")
+        if app.description:
+            print(f"  ↳ {app.description}")
+        print()
 
-        for app in results:
-            name = app.get("name", "Unknown")
-            app_id = app.get("app_id", "Unknown ID")  
-            summary = app.get("summary", "")
-            print(f"{name} ({app_id})")
-            if summary:
-                print(f"  ↳ {summary}")
-            print()
 
-        
-        return [app.get("app_id") for app in results if app.get("app_id")]
+def search_flathub(pkgname, pkgid=None, limit=None):
+    import requests
+    try:
+        print(f"Searching for '{pkgname}' on Flathub 🔍\n")
+        results = collect_flathub(pkgname, limit)
+        print_flathub_results(results)
+        return [app.app_id for app in results if app.app_id]
 
     except requests.RequestException as e:
         print("Network error:", e)
@@ -49,26 +54,16 @@ def search_flathub(pkgname, pkgid=None):
         return []
 #that was painful...
 
-def check_pkg_version(pkgname: str, pkgmanager: str):
+def check_pkg_version(pkgname: str, pkgmanager: str, pkgid=None):
     try:
-        if pkgmanager == "aur":
-            command = subprocess.run(['yay', '-Qi', pkgname], capture_output=True, text=True)
-            if command.returncode == 0:
-                return extract_version(command.stdout)
-            return "unknown"
-        elif pkgmanager == "pac":
-            command = subprocess.run(['pacman', '-Qi', pkgname], capture_output=True, text=True)
-            if command.returncode == 0:
-                return extract_version(command.stdout)
-            return "unknown"
+        service = versions.get_service()
+        if pkgmanager in ["aur", "pac"]:
+            return service.version(pkgname, pkgmanager) or "unknown"
         elif pkgmanager == "flathub":
-            pkgid = get_first_flathub_id(pkgname)
+            pkgid = pkgid or get_first_flathub_id(pkgname)
             if not pkgid:
                 return "unknown"
-            result = subprocess.run(['flatpak', 'info', pkgid], capture_output=True, text=True)
-            if result.returncode == 0:
-                return extract_version(result.stdout)
-            return "unknown"
+            return service.version(pkgid, pkgmanager) or "unknown"
         else:
             return f"Unknown package manager: {pkgmanager}"
     except Exception as e:
@@ -84,222 +79,245 @@ def extract_version(output):
 
 def create_package_info(pkgname, version, packagemanager, ID=None, deleted: bool = False):
     """
-    FIX THIS
+    Record an installed package in the package database.
     - pkgname (str): The name of the package.
     - version (str): The version of the package.
     - packagemanager (str): The package manager used.
-    - ID (str, optional): The ID of the package. Defaults to None.
+    - ID (str, optional): The Flathub ID of the package. Defaults to None.
     - Deleted (bool): Is the package deleted?
     """
-    package_info = {
-        "pkgname": pkgname,
-        "version": version,
-        "source": packagemanager
-    }
-    if ID is not None:
-        package_info["ID"] = ID
-    if deleted is not False:
-        package_info["deleted"] = deleted
-
+    import pkgdb
     try:
-        with open("info.json", 'w') as json_file:
-            json.dump(package_info, json_file, indent=4)
+        pkgdb.get_db().record(pkgname, version, packagemanager, flathub_id=ID, deleted=deleted)
     except Exception as e:
         print(f"Error creating package info: {e}")
 
-def edit_package_info(**updates):
+def edit_package_info(pkgname, **updates):
     """
-    Update existing fields in info.json.
+    Update existing fields of a package record.
     Example:
-        edit_package_info(version="2.0", deleted=True)
+        edit_package_info("firefox", version="2.0", deleted=True)
     """
-    path = "info.json"
-    if not os.path.exists(path):
-        print("info.json not found.")
-        return
-
+    import pkgdb
+    if "ID" in updates:
+        updates["flathub_id"] = updates.pop("ID")
     try:
-        with open(path, "r") as f:
-            data = json.load(f)
-
-        data.update({k: v for k, v in updates.items() if v is not None})
-
-        with open(path, "w") as f:
-            json.dump(data, f, indent=4)
-
-        print("info updated successfully.")
-
+        if pkgdb.get_db().update(pkgname, **updates):
+            print("info updated successfully.")
+        else:
+            print(f"Package '{pkgname}' not found in the package database.")
     except Exception as e:
-        print(f" Failed to edit info.json: {e}")
+        print(f" Failed to edit package info: {e}")
 
 
 def parse_search_results(output):
-    return output.splitlines()
+    return list(search.parse_ss(output.splitlines()))
+
+
+def collect_pacman(pkgname, limit=None, timeout=None):
+    index = pacmandb.get_index()
+    if index is not None:
+        return [
+            search.SearchResult(pkg["repo"], pkg["name"], pkg["version"], pkg["desc"])
+            for pkg in index.search(pkgname, limit)
+        ]
+    return search.collect_ss(['pacman', '-Ss', pkgname], limit, timeout)
+
+
+def collect_aur(pkgname, limit=None, timeout=None):
+    import aur
+    installed = versions.get_service().pacman_versions()
+    results = []
+    for pkg in aur.search(pkgname, timeout=timeout or aur.TIMEOUT)[:limit]:
+        version = installed.get(pkg["Name"])
+        results.append(search.SearchResult(
+            "aur", pkg["Name"], pkg["Version"], pkg.get("Description") or "",
+            installed=version == pkg["Version"] or version or False,
+            out_of_date=bool(pkg.get("OutOfDate"))
+        ))
+    return results
+
+
+def collect_meow(pkgname, limit=None, timeout=None):
+    """Answered from the local catalog snapshot (see `meow refresh`)"""
+    import catalog
+    return [
+        search.SearchResult("meow", pkg["name"], pkg.get("version") or "", pkg.get("description") or "", source="meow")
+        for pkg in catalog.get_catalog().search(pkgname, limit)
+    ]
+
+
+def print_ss_results(results):
+    if not results:
+        print("No results found.")
+        return
+
+    for pkg in results:
+        flags = ""
+        if pkg.installed:
+            flags += " [installed]" if pkg.installed is True else f" [installed: {pkg.installed}]"
+        if pkg.out_of_date:
+            flags += " (out of date)"
+        print(f"{pkg.pkg} {pkg.version}{flags}")
+        if pkg.description:
+            print(f"  ↳ {pkg.description}")
+        print()
 
+    print(f"Found {len(results)} result(s)")
 
-def search_pacman(pkgname):
+
+def search_pacman(pkgname, limit=None):
     try:
         print(f"Searching for '{pkgname}' in Pacman repositories 🔍\n")
-        result = subprocess.run(
-            ['pacman', '-Ss', pkgname],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0 or not result.stdout.strip():
-            print("No results found.")
-            return
-        
-        lines = result.stdout.strip().split('\n')
-        count = 0
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if line.startswith(' '):
-                i += 1
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 2:
-                pkg_info = parts[0]
-                version = parts[1] if len(parts) > 1 else ""
-                
-                description = ""
-                if i + 1 < len(lines) and lines[i + 1].startswith(' '):
-                    description = lines[i + 1].strip()
-                    i += 1
-                
-                print(f"{pkg_info} {version}")
-                if description:
-                    print(f"  ↳ {description}")
-                print()
-                count += 1
-            i += 1
-        
-        if count == 0:
-            print("No results found.")
-        else:
-            print(f"Found {count} result(s)")
-            
+        print_ss_results(collect_pacman(pkgname, limit))
     except FileNotFoundError:
         print("Error: pacman command not found")
     except Exception as e:
         print(f"Error searching Pacman: {e}")
 
 
-def search_aur(pkgname):
+def search_aur(pkgname, limit=None):
     try:
         print(f"Searching for '{pkgname}' in AUR 🔍\n")
-        result = subprocess.run(
-            ['yay', '-Ss', pkgname],
-            capture_output=True,
-            text=True
-        )
-        
-        if result.returncode != 0 or not result.stdout.strip():
-            print("No results found.")
-            return
-        
-        lines = result.stdout.strip().split('\n')
-        count = 0
-        i = 0
-        while i < len(lines):
-            line = lines[i]
-            if line.startswith(' '):
-                i += 1
-                continue
-            
-            parts = line.split()
-            if len(parts) >= 2:
-                pkg_info = parts[0]
-                version = parts[1] if len(parts) > 1 else ""
-                
-                description = ""
-                if i + 1 < len(lines) and lines[i + 1].startswith(' '):
-                    description = lines[i + 1].strip()
-                    i += 1
-                
-                print(f"{pkg_info} {version}")
-                if description:
-                    print(f"  ↳ {description}")
-                print()
-                count += 1
-            i += 1
-        
-        if count == 0:
-            print("No results found.")
-        else:
-            print(f"Found {count} result(s)")
-            
+        print_ss_results(collect_aur(pkgname, limit))
     except FileNotFoundError:
         print("Error: yay command not found. Install yay to search AUR.")
     except Exception as e:
         print(f"Error searching AUR: {e}")
 
 
-def search_packages(pkgname):
-    print(f"\n{'='*60}")
-    print(f"Searching for '{pkgname}' across all sources")
-    print(f"{'='*60}\n")
-    
-    print(f"{'-'*60}")
-    print("FLATHUB RESULTS")
-    print(f"{'-'*60}")
-    search_flathub(pkgname)
-    
-    print(f"\n{'-'*60}")
-    print("PACMAN RESULTS")
-    print(f"{'-'*60}")
-    search_pacman(pkgname)
-    
+SEARCH_SOURCES = {
+    "flathub": ("FLATHUB RESULTS", collect_flathub, print_flathub_results),
+    "pacman": ("PACMAN RESULTS", collect_pacman, print_ss_results),
+    "aur": ("AUR RESULTS", collect_aur, print_ss_results),
+    "meow": ("MEOW RESULTS", collect_meow, print_ss_results),
+}
+
+SEARCH_ERRORS = {
+    "pacman": "Error: pacman command not found",
+}
+
+
+def _collect_source(source, collect, pkgname, limit, timeout, results):
+    try:
+        found = collect(pkgname, limit=limit, timeout=timeout)
+    except Exception as e:
+        found = e
+    results.put((source, found))
+
+
+def print_search_section(source, found, elapsed=None):
+    title, _, print_results = SEARCH_SOURCES[source]
     print(f"\n{'-'*60}")
-    print("AUR RESULTS (via yay)")
+    print(title if elapsed is None else f"{title} ({elapsed:.1f}s)")
     print(f"{'-'*60}")
-    search_aur(pkgname)
-    
+
+    if found is TimeoutError:
+        print("Timed out.")
+    elif isinstance(found, FileNotFoundError) and source in SEARCH_ERRORS:
+        print(SEARCH_ERRORS[source])
+    elif isinstance(found, Exception):
+        print(f"Error searching {source}: {found}")
+    else:
+        print_results(found)
+
+
+def print_ranked_results(results):
+    if not results:
+        print("No results found.")
+        return
+
+    for pkg in results:
+        where = ", ".join([pkg.where] + [other.where for other in pkg.also])
+        version = f" {pkg.version}" if pkg.version else ""
+        flags = " [installed]" if pkg.installed else ""
+        print(f"{pkg.name}{version}{flags}  ({where})")
+        if pkg.description:
+            print(f"  ↳ {pkg.description}")
+        print()
+
+
+def search_packages(pkgname, limit=None, timeout=30, top=20, stream=False):
+    """
+    Query Flathub, pacman, the AUR and the Meow catalog snapshot at the same time.
+
+    By default the results of every source are ranked together, the same
+    package found on several sources is shown once, and the best `top`
+    entries are printed. With stream=True each source's section is printed
+    as soon as it answers instead. Sources still running after timeout
+    seconds are reported as timed out.
+    """
+    print(f"\n{'='*60}")
+    print(f"Searching for '{pkgname}' across all sources")
+    print(f"{'='*60}")
+
+    results = queue.Queue()
+    start = time.monotonic()
+    for source, (_, collect, _) in SEARCH_SOURCES.items():
+        threading.Thread(
+            target=_collect_source,
+            args=(source, collect, pkgname, limit, timeout, results),
+            daemon=True
+        ).start()
+
+    found_all = []
+    pending = list(SEARCH_SOURCES)
+    while pending:
+        remaining = start + timeout - time.monotonic()
+        try:
+            source, found = results.get(timeout=max(remaining, 0))
+        except queue.Empty:
+            break
+        pending.remove(source)
+        if stream:
+            print_search_section(source, found, time.monotonic() - start)
+        elif isinstance(found, Exception):
+            print_search_section(source, found)
+        else:
+            found_all.extend(found)
+
+    for source in pending:
+        print_search_section(source, TimeoutError)
+
+    if not stream:
+        ranked = search.rank(found_all, pkgname, top)
+        print(f"\n{'-'*60}")
+        print(f"TOP {len(ranked)} OF {len(found_all)} RESULTS ({time.monotonic() - start:.1f}s)")
+        print(f"{'-'*60}")
+        print_ranked_results(ranked)
+
     print(f"\n{'='*60}\n")
 
 
+def search_local(pkgname, top=20):
+    """Fuzzy search over the local index: no network, no subprocesses"""
+    import searchindex
+
+    start = time.monotonic()
+    results = searchindex.get_index().query(pkgname, limit=top or 1000)
+    print(f"\n{'='*60}")
+    print(f"Local results for '{pkgname}' ({(time.monotonic() - start) * 1000:.0f} ms)")
+    print(f"{'='*60}")
+    print_ranked_results(results)
+
+
 def exists_in_pacman(pkg):
-    try:
-        output = subprocess.run(
-            ['pacman', '-Ss', pkg],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        return bool(output.stdout.strip())
-    except subprocess.CalledProcessError:
-        return False
+    index = pacmandb.get_index()
+    if index is not None:
+        return index.exists(pkg)
+    return search.ss_has_exact(['pacman', '-Ss', f"^{re.escape(pkg)}$"], pkg)
 
 def exists_in_yay(pkg):
+    import aur
     try:
-        output = subprocess.run(
-            ['yay', '-Ss', pkg],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )  # ADD UPDATE SUPPORT
-        return bool(output.stdout.strip())
-    except (subprocess.CalledProcessError, FileNotFoundError):
+        return aur.exists(pkg)
+    except Exception:
         return False
 
 def exists_in_flathub(pkg):
-    url = f"https://flathub.org/api/v1/apps/search/{pkg}"
+    import flathub
     try:
-        resp = requests.get(url, timeout=5)
-        if resp.status_code != 200:
-            return False
-
-        data = resp.json()
-        for app in data:
-            app_id = app.get('flatpakAppId', '').lower()
-            app_name = app.get('name', '').lower()
-            if pkg.lower() == app_id or pkg.lower() == app_name or pkg.lower() in app_id or pkg.lower() in app_name:
-                return True
-        return False
+        return flathub.exists(pkg)
     except Exception:
         return False
 
@@ -311,23 +329,19 @@ def choose_source(source, pkgname):
     elif source == "aur":
         install_packageaur(pkgname)
     elif source == "meow":
+        from meowinstaller import installMeowpkg
         installMeowpkg(pkgname)
     elif source==None:
-        choosesourcewithuser(pkgname)
+        import resolver
+        resolution = resolver.resolve(pkgname)
+        if resolution.source is None:
+            print(unresolved_message(pkgname, resolution.unchecked) + ".")
+            return
+        print(f"Using {SOURCE_LABELS[resolution.source]} for {pkgname} ({resolution.match} match)")
+        choose_source(resolution.source, pkgname)
     else:
         print(f"Unknown source: {source}")
 
-def choosesourcewithuser(pkg):
-    source = int(input("which source do you want to use\nflatpak:1 pacman:2 aur:3 meow:4                     "))
-    if source == 1:
-        install_packagefh(pkg)
-    elif source == 2:
-        install_packagepacman(pkg)
-    elif source == 3:
-        install_packageaur(pkg)
-    elif source == 4:
-        installMeowpkg(pkg)
-
 
 def choose_source_search(source, pkgname):
     parser = create_parser()
@@ -346,7 +360,8 @@ def install_packageaur(pkgname, env=None, cwd=None):
     if areyousureuwannainstallthisrn.lower() in ["y", "yes"]:   
         try:
             command = ["yay", "-S", "--nocleanmenu", "--nodiffmenu", pkgname]
-            result = subprocess.run(command, capture_output=False, text=True, env=env, cwd=cwd)
+            result = executor.run(command, capture=False, env=env, cwd=cwd)
+            versions.invalidate()
             if result.returncode == 0:
                 version = check_pkg_version(pkgname, pkgmanager="aur")
                 create_package_info(pkgname, version, "aur")
@@ -365,7 +380,8 @@ def install_packagepacman(pkgname, env=None, cwd=None):
     if areyousureuwannainstallthisrn.lower() in ["y", "yes"]:    
         try:
             command = ["sudo", "pacman", "-S", pkgname]
-            result = subprocess.run(command, capture_output=False, text=True, env=env, cwd=cwd)
+            result = executor.run(command, capture=False, env=env, cwd=cwd)
+            versions.invalidate()
             if result.returncode == 0:
                 version = check_pkg_version(pkgname, pkgmanager="pac")
                 create_package_info(pkgname, version, "pac")
@@ -380,17 +396,9 @@ def install_packagepacman(pkgname, env=None, cwd=None):
         print("You mispelled. \nTry again.")
 
 def get_first_flathub_id(pkgname):
+    import flathub
     try:
-        r = requests.post("https://flathub.org/api/v2/search",
-                          json={"query": pkgname, "filters": []},
-                          headers={"Content-Type": "application/json"},
-                          timeout=10)
-        if r.status_code != 200:
-            return None
-        data = r.json().get("hits", [])
-        if not data or len(data) == 0:
-            return None
-        return data[0].get("app_id")
+        return flathub.first_app_id(pkgname)
     except Exception as e:
         print(f"Error fetching Flathub ID: {e}")
         return None
@@ -404,11 +412,13 @@ def install_packagefh(pkgname, env=None, cwd=None):
     areyousureuwannainstallthisrn = input(f"Are you sure you want to install {pkgid}? y/n: ")
     if areyousureuwannainstallthisrn.lower() in ["y", "yes"]:   
         try:
-            subprocess.run(["flatpak", "remote-add", "--if-not-exists", "flathub", "https://flathub.org/repo/flathub.flatpakrepo"])
+            executor.run(["flatpak", "remote-add", "--if-not-exists", "flathub", "https://flathub.org/repo/flathub.flatpakrepo"],
+                     capture=False, timeout=executor.QUERY_TIMEOUT)
             command = ["flatpak", "install", "--user", "flathub", "--noninteractive", "--assumeyes", pkgid]
-            result = subprocess.run(command, capture_output=False, text=True, env=env, cwd=cwd)
+            result = executor.run(command, capture=False, env=env, cwd=cwd)
+            versions.invalidate()
             if result.returncode == 0:
-                version = check_pkg_version(pkgname, pkgmanager="flathub")
+                version = check_pkg_version(pkgname, pkgmanager="flathub", pkgid=pkgid)
                 create_package_info(pkgname, version, "flathub", ID=pkgid)
                 print("Command executed successfully")
             else:
@@ -422,6 +432,138 @@ def install_packagefh(pkgname, env=None, cwd=None):
 
 
 
+SOURCE_ALIASES = {
+    "pac": "pac", "pacman": "pac",
+    "aur": "aur",
+    "flathub": "flathub", "fb": "flathub", "fk": "flathub", "flatpak": "flathub",
+    "meow": "meow",
+}
+
+SOURCE_LABELS = {"pac": "Pacman", "aur": "AUR (yay)", "flathub": "Flathub", "meow": "Meow"}
+
+
+def unresolved_message(pkgname, unchecked=()):
+    """Why pkgname has no source: not found anywhere, or some source could not be checked"""
+    if unchecked:
+        labels = ", ".join(SOURCE_LABELS[s] for s in unchecked)
+        return f"Could not decide where to install '{pkgname}': {labels} could not be checked"
+    return f"Could not find '{pkgname}' on pacman, the AUR or Flathub"
+
+
+def plan_install(pkgnames, source=None):
+    """
+    Group package names by the source they will be installed from.
+    Returns ({source: [pkgname, ...]}, {unresolved name: sources that could not be checked}).
+    """
+    groups = {}
+    unresolved = {}
+    if not source:
+        import resolver
+        resolutions = resolver.resolve_many(pkgnames)
+    for pkgname in pkgnames:
+        pkgsource = SOURCE_ALIASES.get(source) if source else resolutions[pkgname].source
+        if pkgsource is None:
+            unresolved[pkgname] = resolutions[pkgname].unchecked
+            continue
+        if pkgname not in groups.setdefault(pkgsource, []):
+            groups[pkgsource].append(pkgname)
+    return groups, unresolved
+
+
+def run_install_transaction(pkgsource, pkgnames, env=None, cwd=None):
+    """
+    Install every package of one source in a single package-manager
+    transaction. Returns the list of names that were installed.
+    """
+    if pkgsource == "pac":
+        command = ["sudo", "pacman", "-S", "--noconfirm", *pkgnames]
+    elif pkgsource == "aur":
+        command = ["yay", "-S", "--noconfirm", "--nocleanmenu", "--nodiffmenu", *pkgnames]
+    elif pkgsource == "flathub":
+        ids = {}
+        for pkgname in pkgnames:
+            pkgid = get_first_flathub_id(pkgname)
+            if pkgid:
+                ids[pkgname] = pkgid
+            else:
+                print(f"Could not find Flathub ID for {pkgname}. Skipping it.")
+        if not ids:
+            return []
+        executor.run(["flatpak", "remote-add", "--if-not-exists", "flathub", "https://flathub.org/repo/flathub.flatpakrepo"],
+                     capture=False, timeout=executor.QUERY_TIMEOUT)
+        command = ["flatpak", "install", "--user", "flathub", "--noninteractive", "--assumeyes", *dict.fromkeys(ids.values())]
+        pkgnames = list(ids)
+    else:
+        print(f"Unknown source: {pkgsource}")
+        return []
+
+    try:
+        result = executor.run(command, capture=False, env=env, cwd=cwd)
+    except Exception as e:
+        print(f"An error occurred: {e}")
+        return []
+    versions.invalidate()
+    if result.returncode != 0:
+        print(f"{SOURCE_LABELS[pkgsource]} transaction failed, nothing from it was recorded.")
+        return []
+
+    for pkgname in pkgnames:
+        pkgid = ids[pkgname] if pkgsource == "flathub" else None
+        version = check_pkg_version(pkgname, pkgmanager=pkgsource, pkgid=pkgid)
+        create_package_info(pkgname, version, pkgsource, ID=pkgid)
+    return pkgnames
+
+
+def install_packages(pkgnames, source=None, assume_yes=False, env=None, cwd=None):
+    """
+    Install several packages with one confirmation and one transaction per
+    source (one pacman -S, one yay -S, one flatpak install).
+    """
+    if isinstance(pkgnames, str):
+        pkgnames = [pkgnames]
+    if source is not None and source not in SOURCE_ALIASES:
+        print(f"Unknown source: {source}")
+        return
+
+    groups, unresolved = plan_install(pkgnames, source)
+    for pkgname, unchecked in unresolved.items():
+        print(f"{unresolved_message(pkgname, unchecked)}. Skipping it.")
+    if not groups:
+        print("Nothing to install.")
+        return
+
+    print("The following packages will be installed:")
+    for pkgsource, names in groups.items():
+        print(f"  {SOURCE_LABELS[pkgsource]}: {' '.join(names)}")
+
+    if not assume_yes:
+        areyousureuwannainstallthisrn = input(f"Are you sure you want to install {sum(len(n) for n in groups.values())} package(s)? y/n: ")
+        if areyousureuwannainstallthisrn.lower() in ["no", "nah", "n"]:
+            return "userDeniedInstallation"
+        if areyousureuwannainstallthisrn.lower() not in ["y", "yes"]:
+            print("You mispelled. \nTry again.")
+            return
+
+    installed = []
+    for pkgsource, names in groups.items():
+        if pkgsource == "meow":
+            # Meow packages are git checkouts, there is no shared transaction
+            from meowinstaller import getpackageurls, installMeowpkg
+            urls = getpackageurls(names)
+            for pkgname in names:
+                if not urls[pkgname]:
+                    print(f"Could not find {pkgname} in the Meow registry. Skipping it.")
+                    continue
+                # The batch was confirmed above, do not ask again per package
+                installMeowpkg(pkgname, env=env, cwd=cwd, pkgurl=urls[pkgname], assume_yes=True)
+            continue
+        installed += run_install_transaction(pkgsource, names, env=env, cwd=cwd)
+
+    if installed:
+        print(f"Installed {len(installed)} package(s): {' '.join(installed)}")
+
+
+
 def choose_update_source(pkgname: str, source: str | None = None, limit: bool = False):
     choices = ['pac', 'pacman', 'flathub', 'fb', 'fk', 'flatpak', 'aur', 'meow']
 
@@ -450,7 +592,8 @@ def update_packagepacman(pkgname, env=None, cwd=None):
     if areyousureuwannainstallthisrn.lower() in ["y", "yes"]:   
         try:
             command = ["sudo", "pacman", "-S", pkgname]
-            result = subprocess.run(command, capture_output=False, text=True, env=env, cwd=cwd)
+            result = executor.run(command, capture=False, env=env, cwd=cwd)
+            versions.invalidate()
             if result.returncode == 0:
                 version = check_pkg_version(pkgname, pkgmanager="pac")
                 create_package_info(pkgname, version, "pac")
@@ -468,8 +611,9 @@ def update_packageaur(pkgname, env=None, cwd=None):
     areyousureuwannainstallthisrn = input(f"Are you sure you want to update {pkgname}? y/n: ")
     if areyousureuwannainstallthisrn.lower() in ["y", "yes"]:   
         try:
-            command = ["yay", "-U", "--nocleanmenu", "--nodiffmenu", pkgname]
-            result = subprocess.run(command, capture_output=False, text=True, env=env, cwd=cwd)
+            command = ["yay", "-S", "--nocleanmenu", "--nodiffmenu", pkgname]
+            result = executor.run(command, capture=False, env=env, cwd=cwd)
+            versions.invalidate()
             if result.returncode == 0:
                 version = check_pkg_version(pkgname, pkgmanager="aur")
                 create_package_info(pkgname, version, "aur")
@@ -492,14 +636,15 @@ def update_packagefh(pkgname, env=None, cwd=None):
     areyousure = input(f"Are you sure you want to update {pkgid}? y/n: ")
     if areyousure.lower() in ["y", "yes"]:
         try:
-            subprocess.run([
+            executor.run([
                 "flatpak", "remote-add", "--if-not-exists",
                 "flathub", "https://flathub.org/repo/flathub.flatpakrepo"
-            ])
+            ], capture=False, timeout=executor.QUERY_TIMEOUT)
             command = ["flatpak", "update", "--user", "--noninteractive", pkgid]
-            subprocess.run(command, check=True, env=env, cwd=cwd)
+            executor.run(command, capture=False, check=True, env=env, cwd=cwd)
+            versions.invalidate()
 
-            version = check_pkg_version(pkgname, pkgmanager="flathub")
+            version = check_pkg_version(pkgname, pkgmanager="flathub", pkgid=pkgid)
             create_package_info(pkgname, version, "flathub", ID=pkgid)
             print(f"{pkgname} updated successfully!")
 
@@ -531,33 +676,19 @@ def get_source(pkgname):
         print(f"[WARN] Invalid pkgname type: {type(pkgname)}")
         return None
 
-    if not os.path.exists("info.json"):
-        print("[WARN] info.json not found")
+    import pkgdb
+    try:
+        record = pkgdb.get_db().get(pkgname)
+    except Exception as e:
+        print(f"[WARN] Could not read the package database: {e}")
         return None
 
-    try:
-        with open("info.json", "r") as f:
-            data = json.load(f)
-    except json.JSONDecodeError:
-        print("[WARN] info.json corrupted")
+    if record is None:
+        print(f"[WARN] Package '{pkgname}' not found in the package database.")
         return None
 
-    if isinstance(data, list):
-        for pkg in data:
-            if (
-                pkgname.lower() == pkg.get("pkgname", "").lower()
-                or pkgname.lower() == pkg.get("ID", "").lower()
-                or pkgname.lower() in pkg.get("ID", "").lower()
-            ):
-                print(f"[DEBUG] Matched {pkg.get('pkgname')} → source={pkg.get('source')}")
-                return pkg.get("source")
-
-    elif isinstance(data, dict):
-        if pkgname.lower() == data.get("pkgname", "").lower():
-            return data.get("source")
-
-    print(f"[WARN] Package '{pkgname}' not found in info.json.")
-    return None
+    print(f"[DEBUG] Matched {record['name']} → source={record['source']}")
+    return record["source"]
 
 
 
@@ -0,0 +1,187 @@
+"""
+Append-only action journal for Meow.
+
+Every command appends one JSON line to ~/.cache/meow/journal.jsonl. Records
+are written with a single O_APPEND write, so concurrent meow invocations
+never lose each other's entries, and the file is rotated by size instead of
+being read back and rewritten.
+
+Entries from the old ~/.cache/meow/meow.log ("[date time] action pkg", at
+most 50 lines) are still read, as the oldest part of the history.
+"""
+
+import fcntl
+import json
+import os
+import re
+from collections import deque
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+LOG_DIR = Path("~/.cache/meow").expanduser()
+JOURNAL_NAME = "journal.jsonl"
+LEGACY_NAME = "meow.log"
+MAX_BYTES = 1024 * 1024
+BACKUP_COUNT = 5
+
+
+def journal_path(log_dir: Path = LOG_DIR) -> Path:
+    return log_dir / JOURNAL_NAME
+
+
+def _rotate(path: Path, max_bytes: int, backups: int):
+    """Shift journal.jsonl -> .1 -> .2 ... when it grows past max_bytes"""
+    try:
+        if path.stat().st_size < max_bytes:
+            return
+    except FileNotFoundError:
+        return
+
+    with open(path.with_name(path.name + ".lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        # Another process may have rotated while we waited for the lock
+        try:
+            if path.stat().st_size < max_bytes:
+                return
+        except FileNotFoundError:
+            return
+        for i in range(backups - 1, 0, -1):
+            older = path.with_name(f"{path.name}.{i}")
+            if older.exists():
+                os.replace(older, path.with_name(f"{path.name}.{i + 1}"))
+        if backups > 0:
+            os.replace(path, path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink()
+
+
+def log_action(action: str, package: Optional[str] = None, source: Optional[str] = None,
+               log_dir: Path = LOG_DIR, max_bytes: int = MAX_BYTES, backups: int = BACKUP_COUNT, **fields):
+    """Append one structured record to the journal"""
+    record = {"ts": datetime.now().astimezone().isoformat(timespec="seconds"), "action": action}
+    if package is not None:
+        record["package"] = package
+    if source is not None:
+        record["source"] = source
+    record.update(fields)
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+        path = journal_path(log_dir)
+        _rotate(path, max_bytes, backups)
+        fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, line)
+        finally:
+            os.close(fd)
+    except OSError as e:
+        print(f"[WARN] Could not write to meow journal: {e}")
+
+
+def parse_time(value: str) -> datetime:
+    """Accept an ISO date/time or a relative age such as 30m, 12h, 7d"""
+    m = re.fullmatch(r"(\d+)\s*([smhdw])", value.strip())
+    if m:
+        unit = {"s": "seconds", "m": "minutes", "h": "hours", "d": "days", "w": "weeks"}[m.group(2)]
+        return datetime.now().astimezone() - timedelta(**{unit: int(m.group(1))})
+    when = datetime.fromisoformat(value.strip())
+    if when.tzinfo is None:
+        when = when.astimezone()
+    return when
+
+
+_LEGACY_LINE = re.compile(r"\[(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d)\] (\S+)(?: (.+))?")
+
+
+def read_legacy(log_dir: Path = LOG_DIR) -> Iterator[Dict[str, object]]:
+    """Records from the pre-journal meow.log, e.g. '[2024-05-01 10:00:00] check firefox'"""
+    try:
+        f = open(log_dir / LEGACY_NAME, "r", encoding="utf-8", errors="replace")
+    except FileNotFoundError:
+        return
+    with f:
+        for line in f:
+            m = _LEGACY_LINE.fullmatch(line.strip())
+            if not m:
+                continue
+            ts = datetime.strptime(m.group(1), "%Y-%m-%d %H:%M:%S").astimezone()
+            record = {"ts": ts.isoformat(timespec="seconds"), "action": m.group(2), "legacy": True}
+            if m.group(3):
+                record["package"] = m.group(3).strip()
+            yield record
+
+
+def read_journal(log_dir: Path = LOG_DIR, backups: int = BACKUP_COUNT) -> Iterator[Dict[str, object]]:
+    """Stream every record, oldest first, one line at a time"""
+    yield from read_legacy(log_dir)
+    path = journal_path(log_dir)
+    files = [path.with_name(f"{path.name}.{i}") for i in range(backups, 0, -1)] + [path]
+    for file in files:
+        try:
+            f = open(file, "r", encoding="utf-8")
+        except FileNotFoundError:
+            continue
+        with f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+
+
+def filter_journal(package: Optional[str] = None, source: Optional[str] = None,
+                   since: Optional[datetime] = None, until: Optional[datetime] = None,
+                   action: Optional[str] = None, log_dir: Path = LOG_DIR) -> Iterator[Dict[str, object]]:
+    for record in read_journal(log_dir):
+        if package and str(record.get("package", "")).lower() != package.lower():
+            continue
+        if source and str(record.get("source", "")).lower() != source.lower():
+            continue
+        if action and record.get("action") != action:
+            continue
+        if since or until:
+            try:
+                ts = datetime.fromisoformat(record["ts"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            if since and ts < since:
+                continue
+            if until and ts > until:
+                continue
+        yield record
+
+
+def format_record(record: Dict[str, object]) -> str:
+    try:
+        ts = datetime.fromisoformat(record["ts"]).strftime("%Y-%m-%d %H:%M:%S")
+    except (KeyError, TypeError, ValueError):
+        ts = "?"
+    text = f"[{ts}] {record.get('action', '?')}"
+    if record.get("package"):
+        text += f" {record['package']}"
+    if record.get("source"):
+        text += f" ({record['source']})"
+    return text
+
+
+def show_history(args):
+    try:
+        since = parse_time(args.since) if args.since else None
+        until = parse_time(args.until) if args.until else None
+    except ValueError as e:
+        print(f"Invalid time: {e}")
+        return
+
+    records = filter_journal(args.package, args.source, since, until, args.action, LOG_DIR)
+    # Only the last N matching records are ever held in memory
+    if args.limit:
+        records = deque(records, maxlen=args.limit)
+
+    count = 0
+    for record in records:
+        print(format_record(record))
+        count += 1
+    if count == 0:
+        print("No matching history entries.")
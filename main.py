@@ -1,11 +1,15 @@
 #!/usr/bin/env python3
 import subprocess
-import requests
 import platform
 import argparse
 import re
-from pathlib import Path
-from datetime import datetime
+import sys
+import queue
+import threading
+import time
+import executor
+import search
+from journal import log_action, show_history
 
 # === Color Function ===
 def color(text, c):
@@ -13,38 +17,26 @@ def color(text, c):
     return f"\033[{codes.get(c, 0)}m{text}\033[0m"
 
 # === Run Shell Command ===
-def run_cmd(cmd):
+def run_cmd(cmd, timeout=executor.QUERY_TIMEOUT):
     try:
-        result = subprocess.run(cmd, check=True, text=True, capture_output=True)
+        result = executor.run(cmd, timeout=timeout, check=True)
         return result.stdout
     except subprocess.CalledProcessError as e:
         return e.stderr
+    except subprocess.TimeoutExpired:
+        return f"{cmd[0]} timed out after {timeout}s"
 
 # === Run with live output ===
-def run_live(cmd):
+def run_live(cmd, timeout=None):
     try:
-        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
-        for line in proc.stdout:
-            print(color(line.rstrip(), "green"))
-        proc.wait()
-        return proc.returncode == 0
+        result = executor.stream(cmd, timeout, on_line=lambda line: print(color(line.rstrip(), "green")))
+        if result.timed_out:
+            print(color(f"{cmd[0]} timed out after {timeout}s", "red"))
+        return result.returncode == 0
     except FileNotFoundError:
         print(color(f"command not found: {cmd[0]}", "red"))
         return False
 
-# === Logger ===
-def log_action(action):
-    log_dir = Path("~/.cache/meow").expanduser()
-    log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "meow.log"
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    logs = []
-    if log_file.exists():
-        logs = log_file.read_text().splitlines()
-    logs.append(f"[{timestamp}] {action}")
-    logs = logs[-50:]
-    log_file.write_text("\n".join(logs))
-
 # === Parse and pretty-print Pacman info output ===
 def print_pacman_info(output):
     fields_of_interest = [
@@ -78,76 +70,150 @@ def print_pacman_info(output):
             print(color(f"{field}: ", "green") + f"{info[field]}")
 
 # === Package Existence Checks ===
-def exists_in_pacman(pkg):
+def exists_in_pacman(pkg, timeout=None):
+    import pacmandb
+    index = pacmandb.get_index()
+    if index is not None:
+        return index.exists(pkg)
+    return search.ss_has_exact(['pacman', '-Ss', f"^{re.escape(pkg)}$"], pkg, timeout=timeout)
+
+def exists_in_yay(pkg, timeout=None):
+    import requests
+    import aur
+    timeout = aur.TIMEOUT if timeout is None else timeout
     try:
-        output = subprocess.run(
-            ['pacman', '-Ss', pkg],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )
-        return bool(output.stdout.strip())
-    except subprocess.CalledProcessError:
-        return False
+        return aur.exists(pkg, timeout=timeout)
+    except requests.Timeout:
+        raise TimeoutError(f"The AUR did not answer within {timeout}s")
 
-def exists_in_yay(pkg):
+def exists_in_flathub(pkg, timeout=None):
+    import requests
+    import flathub
+    timeout = 5 if timeout is None else timeout
     try:
-        output = subprocess.run(
-            ['yay', '-Ss', pkg],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            check=True
-        )  # ADD UPDATE SUPPORT
-        return bool(output.stdout.strip())
-    except (subprocess.CalledProcessError, FileNotFoundError):
-        return False
+        return flathub.exists(pkg, timeout=timeout)
+    except requests.Timeout:
+        raise TimeoutError(f"Flathub did not answer within {timeout}s")
+
+# === Concurrent Source Probes ===
+# Default deadline (seconds) for each source probed by `meow check`.
+PROBE_DEADLINES = {
+    "Pacman": 10.0,
+    "Yay": 20.0,
+    "Flathub": 5.0,
+}
 
-def exists_in_flathub(pkg):
-    url = f"https://flathub.org/api/v1/apps/search/{pkg}"
+PROBES = {
+    "Pacman": exists_in_pacman,
+    "Yay": exists_in_yay,
+    "Flathub": exists_in_flathub,
+}
+
+TIMED_OUT = "timed out"
+
+def _run_probe(source, probe, pkg, deadline, results):
     try:
-        resp = requests.get(url, timeout=5)
-        if resp.status_code != 200:
-            return False
-
-        data = resp.json()
-        for app in data:
-            app_id = app.get('flatpakAppId', '').lower()
-            app_name = app.get('name', '').lower()
-            if pkg.lower() == app_id or pkg.lower() == app_name or pkg.lower() in app_id or pkg.lower() in app_name:
-                return True
-        return False
-    except Exception:
-        return False
+        found = probe(pkg, timeout=deadline)
+    except (subprocess.TimeoutExpired, TimeoutError):
+        found = TIMED_OUT
+    except Exception as e:
+        found = e
+    results.put((source, found))
+
+def probe_sources(pkg, deadlines=None):
+    """
+    Run every probe in PROBES concurrently and yield (source, result) pairs
+    in the order the sources answer.
+
+    result is True/False, TIMED_OUT when the source missed its deadline,
+    or the exception the probe raised. The probe threads are daemons, so a
+    hung source never keeps meow alive past its deadline.
+    """
+    deadlines = {**PROBE_DEADLINES, **(deadlines or {})}
+    results = queue.Queue()
+    start = time.monotonic()
+    pending = {}
+
+    for source, probe in PROBES.items():
+        deadline = deadlines[source]
+        threading.Thread(
+            target=_run_probe,
+            args=(source, probe, pkg, deadline, results),
+            daemon=True
+        ).start()
+        pending[source] = start + deadline
+
+    while pending:
+        wait = min(pending.values()) - time.monotonic()
+        try:
+            source, found = results.get(timeout=max(wait, 0))
+        except queue.Empty:
+            now = time.monotonic()
+            for source, expires in list(pending.items()):
+                if expires <= now:
+                    del pending[source]
+                    yield source, TIMED_OUT
+            continue
+        if source in pending:
+            del pending[source]
+            yield source, found
+
+def parse_deadlines(args):
+    deadlines = {}
+    if getattr(args, "timeout", None) is not None:
+        deadlines = {source: args.timeout for source in PROBES}
+    for item in getattr(args, "deadline", None) or []:
+        source, _, seconds = item.partition("=")
+        match = [s for s in PROBES if s.lower() == source.strip().lower()]
+        if not match or not seconds:
+            print(color(f"Ignoring invalid deadline '{item}' (expected SOURCE=SECONDS)", "yellow"))
+            continue
+        try:
+            deadlines[match[0]] = float(seconds)
+        except ValueError:
+            print(color(f"Ignoring invalid deadline '{item}' (expected SOURCE=SECONDS)", "yellow"))
+    return deadlines
 
 # === Check Package Command ===
 def check_package(args):
+    """Returns the exit code: 1 when the package was not found and some source could not be checked"""
     pkg = args.pkg
-    pacman_found = exists_in_pacman(pkg)
-    yay_found = exists_in_yay(pkg)
-    flathub_found = exists_in_flathub(pkg)
 
     sources = []
-    if yay_found:
-        sources.append("Yay")
-    if flathub_found:
-        sources.append("Flathub")
-    if pacman_found:
-        sources.append("Pacman")
+    unchecked = []
+    for source, found in probe_sources(pkg, parse_deadlines(args)):
+        if found is True:
+            sources.append(source)
+            print(color(f"  [✓] {source}: found", "green"))
+        elif found == TIMED_OUT:
+            unchecked.append(source)
+            print(color(f"  [!] {source}: timed out", "yellow"))
+        elif isinstance(found, Exception):
+            unchecked.append(source)
+            print(color(f"  [!] {source}: error ({found})", "yellow"))
+        else:
+            print(color(f"  [✗] {source}: not found", "red"))
+
+    log_action("check", package=pkg)
 
     if sources:
         print(color(f"[✓] Package '{pkg}' is available on {', '.join(sources)}.", "green"))
-    else:
-        print(color(f"[✗] Package '{pkg}' is not available on Yay, Flathub, or Pacman.", "red"))
-
-    log_action(f"check {pkg}")
+        return 0
+    if unchecked:
+        missing = [source for source in PROBES if source not in unchecked]
+        unchecked = [source for source in PROBES if source in unchecked]
+        summary = f"[!] Package '{pkg}' could not be checked on {', '.join(unchecked)}"
+        if missing:
+            summary += f" and is not available on {', '.join(missing)}"
+        print(color(summary + ".", "yellow"))
+        return 1
+    print(color(f"[✗] Package '{pkg}' is not available on Yay, Flathub, or Pacman.", "red"))
+    return 0
 
 
 
 
 from parser import create_parser
-from installer import choose_source, search_packages, choose_update_source
 
 
 def fetch_system_info():
@@ -166,26 +232,66 @@ def fetch_system_info():
         print(f"An error occurred: {e}")
 
 
-if __name__ == "__main__":
+def main():
     parser = create_parser()
     args = parser.parse_args()
 
+    # installer pulls in requests and the Meow API client, so it is only
+    # imported by the subcommands that actually need it.
     if args.command == 'install':
-        if args.src!= None:
-            choose_source(args.src, args.package)
-        else:
-            choose_source(None,args.package)
+        from installer import install_packages
+        for pkg in args.package:
+            log_action("install", package=pkg, source=args.src)
+        install_packages(args.package, args.src, assume_yes=args.yes)
     elif args.command == 'search':
-        search_packages(args.query)
+        log_action("search", query=args.query)
+        if args.local:
+            from installer import search_local
+            search_local(args.query, top=args.top)
+        else:
+            from installer import search_packages
+            search_packages(args.query, limit=args.limit, timeout=args.timeout, top=args.top, stream=args.stream)
 
     elif args.command == 'fetch':
         fetch_system_info()
 
     elif args.command == "update":
-        choose_update_source(args.package, args.src)
+        from installer import choose_update_source
+        log_action("update", package=args.package, source=args.source)
+        choose_update_source(args.package, args.source)
     
+    elif args.command == "upgrade":
+        if not args.all:
+            print("Use 'meow upgrade --all' to upgrade every outdated package, or 'meow update <package>' for one.")
+            return
+        from upgrade import upgrade_all
+        log_action("upgrade", source=",".join(args.source) if args.source else None)
+        upgrade_all(assume_yes=args.yes, dry_run=args.dry_run, sources=args.source)
+
     elif args.command == "check":
-        check_package(args)
+        return check_package(args)
+
+    elif args.command == "refresh":
+        import catalog
+        catalog.refresh(full=args.full)
+
+    elif args.command == "info":
+        import catalog
+        catalog.print_info(args.package)
+
+    elif args.command == "list":
+        import catalog
+        catalog.print_list(limit=args.limit, verified_only=args.verified)
+
+    elif args.command == "history":
+        show_history(args)
     
     else:
         parser.print_help()
+
+
+cli_entrypoint = main
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,14 +1,28 @@
-import subprocess
-import requests 
 import json
+import os
 import importlib.util
-from builder import MeowBuilder
+import gitcache
 # --- API STUFF (BORING) --- #
 
-MeowAPIClient = "/usr/local/lib/meow/MeowAPI/client.py"
-spec = importlib.util.spec_from_file_location("MeowAPIclient", MeowAPIClient)
-mod = importlib.util.module_from_spec(spec)
-spec.loader.exec_module(mod)
+MeowAPIClientPath = "/usr/local/lib/meow/MeowAPI/client.py"
+_client_module = None
+
+def load_client_module():
+    """Load the installed Meow API client the first time it is needed"""
+    global _client_module
+    if _client_module is None:
+        path = MeowAPIClientPath
+        if not os.path.exists(path):
+            # Running from a checkout: use the client shipped next to us
+            path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "MeowAPI", "client.py")
+        spec = importlib.util.spec_from_file_location("MeowAPIclient", path)
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _client_module = mod
+    return _client_module
+
+def MeowAPIClient(*args, **kwargs):
+    return load_client_module().MeowAPIClient(*args, **kwargs)
 
 def handle_publish_command(name, version, giturl,owner, description=None):
     client = MeowAPIClient()
@@ -22,38 +36,51 @@ def handle_publish_command(name, version, giturl,owner, description=None):
     client._make_request("POST", "/api/packages", json=data)
 
 
-def getpackageurl(pkgname: str):
-    client = MeowAPIClient()
-    # Send request to get all packages or a specific one by query param
-    response = client._make_request("GET", f"/api/packages?name={pkgname}")
-    if pkgname.startswith("https://") or  pkgname.startswith("http://"):
-        return pkgname
-
-
-    if not response or "packages" not in response:
-        return None
+def getpackageurls(pkgnames):
+    """Git URL of every package, from one bulk registry lookup. None for unknown names."""
+    urls = {name: name for name in pkgnames if name.startswith(("https://", "http://"))}
+    names = [name for name in pkgnames if name not in urls]
+    if names:
+        try:
+            found = MeowAPIClient(os.environ.get("MEOW_API_URL", "http://localhost:8000")).lookup_packages(names)
+        except Exception as e:
+            print(f"[WARN] Could not look up {', '.join(names)} in the Meow registry: {e}")
+            found = {}
+        for name in names:
+            pkg = found.get(name)
+            urls[name] = (pkg.get("giturl") or pkg.get("source") or pkg.get("url")) if pkg else None
+    return {name: urls[name] for name in pkgnames}
 
-    # Assuming response["packages"] is a list of package info dicts
-    for pkg in response["packages"]:
-        if pkg["name"] == pkgname:
-            return pkg.get("source") or pkg.get("url")
 
-    return "Error while trying to get package url: could not find package. please try again with the git url"
+def getpackageurl(pkgname: str):
+    return getpackageurls([pkgname])[pkgname]
 
 
-def installMeowpkg(pkgname:str,env=None, cwd=None):
-    pkgurl = getpackageurl(pkgname)
-    areyousureuwannainstallthisrn = input(f"Are you sure you want to install {pkgname} from {pkgurl}?         y/n:")             
+def installMeowpkg(pkgname:str,env=None, cwd=None, pkgurl=None, assume_yes=False):
+    """
+    Clone a Meow package and offer to build it. assume_yes skips both
+    questions, for batch installs that were already confirmed as a whole.
+    """
+    if pkgurl is None:
+        pkgurl = getpackageurl(pkgname)
+    if not pkgurl:
+        print(f"Could not find {pkgname} in the Meow registry. Please try again with the git url.")
+        return
+    if assume_yes:
+        areyousureuwannainstallthisrn = "y"
+    else:
+        areyousureuwannainstallthisrn = input(f"Are you sure you want to install {pkgname} from {pkgurl}?         y/n:")             
     if areyousureuwannainstallthisrn.lower() in ["y","yes"]:    
-        command= ["git","clone",pkgurl]
-        result = subprocess.run(command, capture_output=False, text=True, env=env, cwd=cwd)
-        if result.returncode == "0":
+        result = gitcache.clone(pkgurl, capture=False, env=env, cwd=cwd)
+        if result.returncode == 0:
             print("Command executed successfully")
-            print("Output:")
-            print(result.stdout)
-            areyousureuwannabuildthisrn = input(f"Are you sure you want to install {pkgname} from {pkgurl}?         y/n:")
+            if assume_yes:
+                areyousureuwannabuildthisrn = "y"
+            else:
+                areyousureuwannabuildthisrn = input(f"Are you sure you want to build {pkgname}?         y/n:")
             if areyousureuwannabuildthisrn.lower() in ["y","yes"]:
-                MeowBuilder.start_build_process()                                                                        
+                from builder import MeowBuilder
+                MeowBuilder().start_build_process()                                                                        
     elif areyousureuwannainstallthisrn.lower() in ["n","no"]:
         return "userDeniedInstallation"
     else:
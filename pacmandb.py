@@ -0,0 +1,251 @@
+"""
+Native reader for the pacman sync databases.
+
+Instead of forking `pacman -Ss` for every lookup, Meow reads the
+/var/lib/pacman/sync/*.db archives itself and keeps an on-disk SQLite index
+of package names, versions, descriptions and provides. A repo is only
+re-read when its .db file's mtime changes.
+"""
+
+import os
+import sqlite3
+import tarfile
+import threading
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+SYNC_DIR = os.environ.get("MEOW_PACMAN_SYNC_DIR", "/var/lib/pacman/sync")
+PACMAN_CONF = "/etc/pacman.conf"
+INDEX_PATH = Path("~/.cache/meow/pacman-index.sqlite3").expanduser()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS repos (
+    repo     TEXT PRIMARY KEY,
+    path     TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    position INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS packages (
+    repo    TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    version TEXT NOT NULL,
+    desc    TEXT NOT NULL DEFAULT '',
+    PRIMARY KEY (repo, name)
+);
+CREATE INDEX IF NOT EXISTS packages_name ON packages (name);
+CREATE TABLE IF NOT EXISTS provides (
+    repo    TEXT NOT NULL,
+    name    TEXT NOT NULL,
+    provide TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS provides_provide ON provides (provide);
+"""
+
+
+def parse_desc(text: str) -> Dict[str, List[str]]:
+    """Parse a sync db `desc` file into {FIELD: [values...]}"""
+    fields = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith("%") and line.endswith("%") and len(line) > 2:
+            current = line[1:-1]
+            fields[current] = []
+        elif line and current:
+            fields[current].append(line)
+    return fields
+
+
+def strip_constraint(dep: str) -> str:
+    """'libfoo.so=1-64' -> 'libfoo.so', 'python>=3' -> 'python'"""
+    for op in (">=", "<=", "=", ">", "<"):
+        if op in dep:
+            return dep.split(op, 1)[0]
+    return dep
+
+
+def read_sync_db(path) -> Iterator[Dict[str, object]]:
+    """Yield one record per package in a sync db archive"""
+    with tarfile.open(path, "r:*") as tar:
+        for member in tar:
+            if not member.isfile() or not member.name.endswith("/desc"):
+                continue
+            fields = parse_desc(tar.extractfile(member).read().decode("utf-8", "replace"))
+            if not fields.get("NAME") or not fields.get("VERSION"):
+                continue
+            yield {
+                "name": fields["NAME"][0],
+                "version": fields["VERSION"][0],
+                "desc": " ".join(fields.get("DESC", [])),
+                "provides": [strip_constraint(p) for p in fields.get("PROVIDES", [])],
+            }
+
+
+def repo_order(conf_path: str = PACMAN_CONF) -> List[str]:
+    """Repo names in the order pacman.conf lists them"""
+    order = []
+    try:
+        with open(conf_path, "r") as f:
+            for line in f:
+                line = line.strip()
+                if line.startswith("[") and line.endswith("]") and line[1:-1] != "options":
+                    order.append(line[1:-1])
+    except OSError:
+        pass
+    return order
+
+
+class PacmanIndex:
+    """Persistent index over the pacman sync databases"""
+
+    def __init__(self, sync_dir: str = SYNC_DIR, index_path=INDEX_PATH, conf_path: str = PACMAN_CONF):
+        self.sync_dir = Path(sync_dir)
+        self.index_path = Path(index_path)
+        self.conf_path = conf_path
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def sync_dbs(self) -> Dict[str, Path]:
+        if not self.sync_dir.is_dir():
+            return {}
+        return {p.name[:-3]: p for p in sorted(self.sync_dir.glob("*.db"))}
+
+    def available(self) -> bool:
+        return bool(self.sync_dbs())
+
+    def refresh(self) -> List[str]:
+        """Re-read every sync db whose mtime changed. Returns the rebuilt repos."""
+        dbs = self.sync_dbs()
+        order = repo_order(self.conf_path)
+        position = {repo: order.index(repo) if repo in order else len(order) for repo in dbs}
+        rebuilt = []
+
+        with self._lock:
+            known = {row["repo"]: row for row in self.conn.execute("SELECT * FROM repos")}
+            stale = [repo for repo in known if repo not in dbs]
+            changed = [
+                repo for repo, path in dbs.items()
+                if repo not in known
+                or known[repo]["mtime_ns"] != path.stat().st_mtime_ns
+                or known[repo]["path"] != str(path)
+            ]
+            if not stale and not changed:
+                return rebuilt
+
+            with self.conn:
+                for repo in stale:
+                    self._drop_repo(repo)
+                for repo in changed:
+                    path = dbs[repo]
+                    mtime_ns = path.stat().st_mtime_ns
+                    try:
+                        records = list(read_sync_db(path))
+                    except (tarfile.TarError, OSError) as e:
+                        print(f"[WARN] Could not read sync db {path}: {e}")
+                        continue
+                    self._drop_repo(repo)
+                    self.conn.executemany(
+                        "INSERT OR REPLACE INTO packages (repo, name, version, desc) VALUES (?, ?, ?, ?)",
+                        [(repo, r["name"], r["version"], r["desc"]) for r in records]
+                    )
+                    self.conn.executemany(
+                        "INSERT INTO provides (repo, name, provide) VALUES (?, ?, ?)",
+                        [(repo, r["name"], p) for r in records for p in r["provides"]]
+                    )
+                    self.conn.execute(
+                        "INSERT OR REPLACE INTO repos (repo, path, mtime_ns, position) VALUES (?, ?, ?, ?)",
+                        (repo, str(path), mtime_ns, position[repo])
+                    )
+                    rebuilt.append(repo)
+                for repo, pos in position.items():
+                    self.conn.execute("UPDATE repos SET position = ? WHERE repo = ?", (pos, repo))
+        return rebuilt
+
+    def _drop_repo(self, repo: str):
+        self.conn.execute("DELETE FROM packages WHERE repo = ?", (repo,))
+        self.conn.execute("DELETE FROM provides WHERE repo = ?", (repo,))
+        self.conn.execute("DELETE FROM repos WHERE repo = ?", (repo,))
+
+    def _query(self, sql: str, params=()) -> List[Dict[str, str]]:
+        with self._lock:
+            return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def lookup(self, name: str) -> Optional[Dict[str, str]]:
+        """Exact package name, first repo in pacman.conf order wins"""
+        rows = self._query(
+            "SELECT p.repo, p.name, p.version, p.desc FROM packages p JOIN repos r USING (repo) "
+            "WHERE p.name = ? ORDER BY r.position LIMIT 1",
+            (name,)
+        )
+        return rows[0] if rows else None
+
+    def providers(self, name: str) -> List[Dict[str, str]]:
+        """Packages that list `name` in their provides"""
+        return self._query(
+            "SELECT p.repo, p.name, p.version, p.desc FROM provides v "
+            "JOIN packages p ON p.repo = v.repo AND p.name = v.name JOIN repos r ON r.repo = p.repo "
+            "WHERE v.provide = ? ORDER BY r.position, p.name",
+            (name,)
+        )
+
+    def exists(self, name: str) -> bool:
+        return self.lookup(name) is not None or bool(self.providers(name))
+
+    def prefix(self, prefix: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Packages whose name starts with `prefix` (answered from the name index)"""
+        sql = (
+            "SELECT p.repo, p.name, p.version, p.desc FROM packages p JOIN repos r USING (repo) "
+            "WHERE p.name >= ? AND p.name < ? ORDER BY p.name, r.position"
+        )
+        params = (prefix, prefix + "\U0010ffff")
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return self._query(sql, params)
+
+    def search(self, term: str, limit: Optional[int] = None) -> List[Dict[str, str]]:
+        """Case-insensitive substring match on name and description, like `pacman -Ss`"""
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        sql = (
+            "SELECT p.repo, p.name, p.version, p.desc FROM packages p JOIN repos r USING (repo) "
+            "WHERE p.name LIKE ? ESCAPE '\\' OR p.desc LIKE ? ESCAPE '\\' ORDER BY r.position, p.name"
+        )
+        params = (pattern, pattern)
+        if limit:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return self._query(sql, params)
+
+    def signature(self) -> str:
+        """Changes whenever any indexed sync db changes"""
+        rows = self._query("SELECT repo, mtime_ns FROM repos ORDER BY repo")
+        return ",".join(f"{row['repo']}:{row['mtime_ns']}" for row in rows)
+
+    def all_packages(self) -> List[Dict[str, str]]:
+        return self._query("SELECT repo, name, version, desc FROM packages ORDER BY repo, name")
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> Optional[PacmanIndex]:
+    """
+    Shared, refreshed index for this process, or None when there are no sync
+    dbs to read (not an Arch system) so callers can fall back to pacman.
+    """
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = False
+            if not Path(SYNC_DIR).is_dir() or not any(Path(SYNC_DIR).glob("*.db")):
+                return None
+            try:
+                _index = PacmanIndex()
+                _index.refresh()
+            except sqlite3.Error as e:
+                print(f"[WARN] Could not open pacman index: {e}")
+                _index = False
+        return _index or None
@@ -9,7 +9,8 @@ def create_parser():
     install_parser.add_argument(
         'package',
         type=str,
-        help='The package to install'
+        nargs='+',
+        help='The package(s) to install'
     )
 
     install_parser.add_argument(
@@ -21,6 +22,12 @@ def create_parser():
         help='Source to install the package from'
     )
 
+    install_parser.add_argument(
+        '--yes', '-y',
+        action='store_true',
+        help='Do not ask for confirmation'
+    )
+
     
     search_parser = subparsers.add_parser('search', help='Search for packages')  
     search_parser.add_argument(
@@ -28,6 +35,34 @@ def create_parser():
         type=str,
         help='The search query'
     )
+    search_parser.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=None,
+        help='Stop after this many results per source'
+    )
+    search_parser.add_argument(
+        '--timeout',
+        type=float,
+        default=30,
+        help='Give up on sources that have not answered after this many seconds'
+    )
+    search_parser.add_argument(
+        '--top', '-k',
+        type=int,
+        default=20,
+        help='How many ranked results to show (0 for all)'
+    )
+    search_parser.add_argument(
+        '--stream',
+        action='store_true',
+        help='Print each source as it answers instead of one ranked list'
+    )
+    search_parser.add_argument(
+        '--local', '-l',
+        action='store_true',
+        help='Fuzzy search the local index only (offline, no subprocesses)'
+    )
     
     update_parser = subparsers.add_parser('update', help='update a package')  
     update_parser.add_argument(
@@ -44,6 +79,31 @@ def create_parser():
         help='Source to update the package from (pac/pacman, flathub/fb/fk/flatpak, aur)'
     )
     
+    upgrade_parser = subparsers.add_parser('upgrade', help='Upgrade outdated packages')
+    upgrade_parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Upgrade every outdated package from pacman, the AUR, Flatpak and Meow'
+    )
+    upgrade_parser.add_argument(
+        '--source', '-src',
+        type=str,
+        action='append',
+        default=None,
+        choices=['pac', 'aur', 'flathub', 'meow'],
+        help='Only upgrade from this source (repeatable)'
+    )
+    upgrade_parser.add_argument(
+        '--dry-run',
+        action='store_true',
+        help='Only show what would be upgraded'
+    )
+    upgrade_parser.add_argument(
+        '--yes', '-y',
+        action='store_true',
+        help='Do not ask for confirmation'
+    )
+
     selfupdate_parser = subparsers.add_parser('selfupdate', help='Install a package')  
     
     check_parser = subparsers.add_parser('check', help='Check if a package exists')
@@ -52,7 +112,85 @@ def create_parser():
         type=str,
         help='The package name to check'
     )
+    check_parser.add_argument(
+        '--timeout',
+        type=float,
+        default=None,
+        help='Deadline in seconds applied to every source'
+    )
+    check_parser.add_argument(
+        '--deadline',
+        type=str,
+        action='append',
+        metavar='SOURCE=SECONDS',
+        help='Deadline for a single source, e.g. --deadline flathub=3 (repeatable)'
+    )
     
     subparsers.add_parser('fetch', help='Fetch info about your computer')  
+
+    refresh_parser = subparsers.add_parser('refresh', help='Update the local copy of the Meow catalog')
+    refresh_parser.add_argument(
+        '--full',
+        action='store_true',
+        help='Download the whole catalog again instead of only the changes'
+    )
+
+    info_parser = subparsers.add_parser('info', help='Show a Meow package from the local catalog')
+    info_parser.add_argument(
+        'package',
+        type=str,
+        help='The package to show'
+    )
+
+    list_parser = subparsers.add_parser('list', help='List Meow packages from the local catalog')
+    list_parser.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=None,
+        help='Show at most this many packages'
+    )
+    list_parser.add_argument(
+        '--verified',
+        action='store_true',
+        help='Only show verified packages'
+    )
+
+    history_parser = subparsers.add_parser('history', help='Show past meow actions')
+    history_parser.add_argument(
+        '--package', '-p',
+        type=str,
+        default=None,
+        help='Only show entries for this package'
+    )
+    history_parser.add_argument(
+        '--source', '-src',
+        type=str,
+        default=None,
+        help='Only show entries for this source'
+    )
+    history_parser.add_argument(
+        '--action', '-a',
+        type=str,
+        default=None,
+        help='Only show entries for this action (install, update, check, ...)'
+    )
+    history_parser.add_argument(
+        '--since',
+        type=str,
+        default=None,
+        help='Start of the time range (ISO date/time or relative, e.g. 12h, 7d)'
+    )
+    history_parser.add_argument(
+        '--until',
+        type=str,
+        default=None,
+        help='End of the time range (ISO date/time or relative, e.g. 1h)'
+    )
+    history_parser.add_argument(
+        '--limit', '-n',
+        type=int,
+        default=50,
+        help='Show at most the last N matching entries (0 for all)'
+    )
     
     return parser
\ No newline at end of file
@@ -0,0 +1,169 @@
+"""
+Installed-package database.
+
+Keeps one record per package Meow installed, in
+~/.local/share/meow/packages.sqlite3, indexed by package name and by
+Flathub ID. Writes are transactional, so a crash or a concurrent meow
+never loses records. Records from the old single-record info.json are
+imported the first time it is seen.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+DB_PATH = Path(os.environ.get("MEOW_PKGDB", "~/.local/share/meow/packages.sqlite3")).expanduser()
+LEGACY_INFO_JSON = "info.json"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS packages (
+    name       TEXT PRIMARY KEY COLLATE NOCASE,
+    version    TEXT,
+    source     TEXT,
+    flathub_id TEXT UNIQUE COLLATE NOCASE,
+    deleted    INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+FIELDS = ("version", "source", "flathub_id", "deleted")
+
+
+class PackageDB:
+    """Indexed store of installed packages"""
+
+    def __init__(self, path=DB_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    @staticmethod
+    def _record(row) -> Optional[Dict[str, Any]]:
+        if row is None:
+            return None
+        record = dict(row)
+        record["deleted"] = bool(record["deleted"])
+        return record
+
+    def record(self, name: str, version: Optional[str], source: Optional[str],
+               flathub_id: Optional[str] = None, deleted: bool = False):
+        """Insert or replace the record for name"""
+        with self._lock, self.conn:
+            # A Flathub ID belongs to one package; drop whoever held it before
+            if flathub_id:
+                self.conn.execute(
+                    "DELETE FROM packages WHERE flathub_id = ? AND name != ?", (flathub_id, name)
+                )
+            self.conn.execute(
+                "INSERT INTO packages (name, version, source, flathub_id, deleted, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(name) DO UPDATE SET version = excluded.version, source = excluded.source, "
+                "flathub_id = COALESCE(excluded.flathub_id, packages.flathub_id), "
+                "deleted = excluded.deleted, updated_at = excluded.updated_at",
+                (name, version, source, flathub_id, int(bool(deleted)), time.time())
+            )
+
+    def update(self, name: str, **fields) -> bool:
+        """Update some fields of an existing record. Returns False if it does not exist."""
+        updates = {k: v for k, v in fields.items() if k in FIELDS and v is not None}
+        if "deleted" in updates:
+            updates["deleted"] = int(bool(updates["deleted"]))
+        if not updates:
+            return self.get(name) is not None
+        assignments = ", ".join(f"{k} = ?" for k in updates)
+        with self._lock, self.conn:
+            cur = self.conn.execute(
+                f"UPDATE packages SET {assignments}, updated_at = ? WHERE name = ?",
+                (*updates.values(), time.time(), name)
+            )
+            return cur.rowcount > 0
+
+    def get(self, name_or_id: str) -> Optional[Dict[str, Any]]:
+        """Look a package up by name, then by Flathub ID"""
+        with self._lock:
+            row = self.conn.execute("SELECT * FROM packages WHERE name = ?", (name_or_id,)).fetchone()
+            if row is None:
+                row = self.conn.execute("SELECT * FROM packages WHERE flathub_id = ?", (name_or_id,)).fetchone()
+        return self._record(row)
+
+    def get_source(self, name_or_id: str) -> Optional[str]:
+        record = self.get(name_or_id)
+        return record["source"] if record else None
+
+    def remove(self, name_or_id: str) -> bool:
+        """Drop the record get() would return. Returns False if there was none."""
+        with self._lock, self.conn:
+            cur = self.conn.execute("DELETE FROM packages WHERE name = ?", (name_or_id,))
+            if cur.rowcount == 0:
+                cur = self.conn.execute("DELETE FROM packages WHERE flathub_id = ?", (name_or_id,))
+            return cur.rowcount > 0
+
+    def all(self, include_deleted: bool = False) -> List[Dict[str, Any]]:
+        sql = "SELECT * FROM packages"
+        if not include_deleted:
+            sql += " WHERE deleted = 0"
+        with self._lock:
+            return [self._record(row) for row in self.conn.execute(sql + " ORDER BY name")]
+
+    def import_info_json(self, path=LEGACY_INFO_JSON) -> int:
+        """
+        Import records from a legacy info.json (a single dict or a list of
+        dicts). Each file is only imported once. Returns the number imported.
+        """
+        path = Path(path).resolve()
+        key = f"imported:{path}"
+        if not path.is_file():
+            return 0
+        with self._lock:
+            if self.conn.execute("SELECT 1 FROM meta WHERE key = ?", (key,)).fetchone():
+                return 0
+
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            data = None
+        records = data if isinstance(data, list) else [data] if isinstance(data, dict) else []
+
+        count = 0
+        for item in records:
+            if not isinstance(item, dict) or not item.get("pkgname"):
+                continue
+            # Never let the legacy file overwrite what the database already knows
+            if self.get(item["pkgname"]) is not None:
+                continue
+            self.record(
+                item["pkgname"], item.get("version"), item.get("source"),
+                flathub_id=item.get("ID"), deleted=bool(item.get("deleted", False))
+            )
+            count += 1
+
+        with self._lock, self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(time.time())))
+        return count
+
+
+_db = None
+_db_lock = threading.Lock()
+
+
+def get_db() -> PackageDB:
+    """Shared database for this process, with any legacy info.json imported"""
+    global _db
+    with _db_lock:
+        if _db is None:
+            _db = PackageDB(DB_PATH)
+            _db.import_info_json()
+        return _db
@@ -0,0 +1,193 @@
+"""
+Automatic install source resolution.
+
+resolve() probes every source in the priority order at the same time and
+picks the first source with an exact name hit, or failing that the first
+with a partial hit (a pacman provider, a Flathub app whose ID or name only
+contains the name). A source that could not be checked is never skipped
+over: when it might have beaten the best answer, the name is left
+unresolved rather than guessed. Each (source, name) answer is cached: hits
+for a day, misses ("not found in X") for an hour, so resolving the same
+names again, say across a fleet run, does not probe anything.
+
+The order comes from MEOW_SOURCE_ORDER (e.g. "flathub,pac,aur") and
+defaults to pacman, then the AUR, then Flathub.
+"""
+
+import os
+import re
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import executor
+from httpcache import get_cache
+
+DEFAULT_ORDER = ["pac", "aur", "flathub"]
+ALIASES = {"pacman": "pac", "yay": "aur", "flatpak": "flathub", "fb": "flathub", "fk": "flathub"}
+HIT_TTL = 24 * 60 * 60
+MISS_TTL = 60 * 60
+PROBE_TIMEOUT = 15
+
+EXACT, PARTIAL = "exact", "partial"
+# _probe's answer for a source that could not be checked (never cached)
+ERROR = "error"
+
+
+class Resolution(NamedTuple):
+    source: Optional[str]
+    # EXACT or PARTIAL, None when no source has the package
+    match: Optional[str]
+    # True when no source had to be probed
+    cached: bool
+    # Sources that could not be checked; source is None when one of them
+    # might have beaten the best answer
+    unchecked: Tuple[str, ...] = ()
+
+
+def source_order(order: Optional[Iterable[str]] = None) -> List[str]:
+    if order is None:
+        env = os.environ.get("MEOW_SOURCE_ORDER", "")
+        order = [s.strip() for s in env.split(",") if s.strip()] or DEFAULT_ORDER
+    known = []
+    for source in order:
+        source = ALIASES.get(source.lower(), source.lower())
+        if source not in PROBES:
+            print(f"[WARN] Ignoring unknown source '{source}' in the source order")
+        elif source not in known:
+            known.append(source)
+    return known
+
+
+def probe_pacman(name: str) -> Optional[str]:
+    import pacmandb
+    import search
+    index = pacmandb.get_index()
+    if index is not None:
+        if index.lookup(name):
+            return EXACT
+        return PARTIAL if index.providers(name) else None
+    return EXACT if search.ss_has_exact(["pacman", "-Ss", f"^{re.escape(name)}$"], name, PROBE_TIMEOUT) else None
+
+
+def probe_aur(name: str) -> Optional[str]:
+    import aur
+    return EXACT if aur.exists(name, timeout=PROBE_TIMEOUT) else None
+
+
+def probe_flathub(name: str) -> Optional[str]:
+    import flathub
+    apps = flathub.find_apps(name, limit=5, timeout=PROBE_TIMEOUT)
+    if apps is None:
+        # An error answer is not a miss, keep it out of the cache
+        raise RuntimeError("Flathub answered with an error")
+    if not apps:
+        return None
+    wanted = name.lower()
+    for app in apps:
+        app_id = (app.get("app_id") or "").lower()
+        if wanted in (app_id, app_id.rsplit(".", 1)[-1], (app.get("name") or "").lower()):
+            return EXACT
+    return PARTIAL
+
+
+def prefetch_aur(names: List[str]):
+    """One batched info request, so probe_aur answers from the cache"""
+    import aur
+    aur.info(names, timeout=PROBE_TIMEOUT)
+
+
+PROBES = {
+    "pac": probe_pacman,
+    "aur": probe_aur,
+    "flathub": probe_flathub,
+}
+
+# Sources that can answer many names in one round trip
+PREFETCH = {
+    "aur": prefetch_aur,
+}
+
+
+def _key(source: str, name: str) -> str:
+    return f"resolve:{source}:{name}"
+
+
+def cached_answer(source: str, name: str):
+    """(True, match) when the cache still knows the answer, else (False, None)"""
+    entry = get_cache().get_entry(_key(source, name), ttl=HIT_TTL)
+    if entry is None:
+        return False, None
+    match = entry["value"]
+    if not match and entry["fetched_at"] + MISS_TTL < time.time():
+        return False, None
+    return True, match
+
+
+def _probe(source: str, name: str) -> Optional[str]:
+    """Probe one source and cache the answer. Errors are not cached, they answer ERROR."""
+    try:
+        match = PROBES[source](name)
+    except Exception as e:
+        print(f"[WARN] Could not check {source} for {name}: {e}")
+        return ERROR
+    get_cache().put_entry(_key(source, name), match)
+    return match
+
+
+def _decide(answers: Dict[str, Optional[str]], order: List[str]) -> Optional[str]:
+    for wanted in (EXACT, PARTIAL):
+        for source in order:
+            if answers.get(source) == ERROR:
+                # It might have an exact hit, which beats anything after it
+                # in the order and any partial hit
+                return None
+            if answers.get(source) == wanted:
+                return source
+    return None
+
+
+def resolve_many(names: Iterable[str], order: Optional[Iterable[str]] = None) -> Dict[str, Resolution]:
+    """
+    Best source for every name. Only the (source, name) pairs the cache
+    cannot answer are probed, all of them at once on the executor pool.
+    """
+    order = source_order(order)
+    answers: Dict[str, Dict[str, Optional[str]]] = {}
+    todo = []
+    for name in dict.fromkeys(names):
+        answers[name] = {}
+        unknown = []
+        for source in order:
+            known, match = cached_answer(source, name)
+            if not known:
+                unknown.append(source)
+                continue
+            answers[name][source] = match
+            if match == EXACT:
+                # Nothing later in the order can beat a known exact hit
+                break
+        todo += [(source, name) for source in unknown]
+
+    for source, prefetch in PREFETCH.items():
+        batch = [name for s, name in todo if s == source]
+        if len(batch) > 1:
+            try:
+                prefetch(batch)
+            except Exception as e:
+                print(f"[WARN] Could not check {source} for {len(batch)} packages: {e}")
+
+    futures = {(source, name): executor.pool().submit(_probe, source, name) for source, name in todo}
+    for (source, name), future in futures.items():
+        answers[name][source] = future.result()
+
+    probed = {name for _, name in todo}
+    resolutions = {}
+    for name, found in answers.items():
+        source = _decide(found, order)
+        unchecked = tuple(s for s in order if found.get(s) == ERROR)
+        resolutions[name] = Resolution(source, found.get(source), name not in probed, unchecked)
+    return resolutions
+
+
+def resolve(name: str, order: Optional[Iterable[str]] = None) -> Resolution:
+    return resolve_many([name], order)[name]
@@ -0,0 +1,254 @@
+"""
+Search results shared by every source, plus the `pacman -Ss` / `yay -Ss`
+output parser and cross-source ranking.
+
+parse_ss() reads the output line by line and yields one SearchResult per
+package, so even huge AUR result sets are handled in constant memory.
+stream_ss() runs the command and feeds its pipe straight into the parser.
+rank() scores results from all sources against the query and merges the
+same package found on several of them.
+
+    python search.py bench [recorded-output.txt [repeat]]   # parser throughput
+
+tests/fixtures/ss/ has pacman -Ss and yay -Ss outputs in the real format
+(yay's also with --color=always); repeated a few thousand times, one makes
+a large realistic input.
+"""
+
+import re
+import sys
+from typing import Iterable, Iterator, List, Optional
+
+import executor
+
+_ANSI = re.compile(r"\x1b\[[0-9;]*m")
+_INSTALLED = re.compile(r"[\[(]installed(?::\s*([^\])]+))?[\])]", re.IGNORECASE)
+_OUT_OF_DATE = re.compile(r"\(out-of-date(?::\s*([^)]+))?\)", re.IGNORECASE)
+
+
+class SearchResult:
+    """One package from any source (pacman, aur, flathub, meow)"""
+
+    __slots__ = ("repo", "name", "version", "description", "installed", "out_of_date",
+                 "source", "app_id", "score", "also")
+
+    def __init__(self, repo: str, name: str, version: str, description: str = "",
+                 installed=False, out_of_date=False, source: Optional[str] = None,
+                 app_id: Optional[str] = None):
+        self.repo = repo
+        self.name = name
+        self.version = version
+        self.description = description
+        # True, or the installed version when it differs from `version`
+        self.installed = installed
+        # True, or the date the package was flagged
+        self.out_of_date = out_of_date
+        self.source = source or ("aur" if repo == "aur" else "pacman")
+        # Flathub application ID
+        self.app_id = app_id
+        self.score = 0
+        # The same package found on other sources, filled in by rank()
+        self.also: List["SearchResult"] = []
+
+    @property
+    def pkg(self) -> str:
+        return f"{self.repo}/{self.name}" if self.repo else self.name
+
+    @property
+    def where(self) -> str:
+        """'extra', 'aur' or 'flathub: org.mozilla.firefox'"""
+        if self.app_id:
+            return f"{self.source}: {self.app_id}"
+        return self.repo or self.source
+
+    def __repr__(self):
+        return f"SearchResult({self.pkg!r}, {self.version!r})"
+
+
+def parse_header(line: str) -> Optional[SearchResult]:
+    """Parse `repo/name version [flags...]`"""
+    parts = line.split(None, 2)
+    if len(parts) < 2:
+        return None
+    repo, _, name = parts[0].rpartition("/")
+    result = SearchResult(repo, name, parts[1])
+
+    if len(parts) > 2:
+        flags = parts[2]
+        # Cheap substring checks first: most results carry neither flag
+        if "nstalled" in flags:
+            installed = _INSTALLED.search(flags)
+            if installed:
+                result.installed = installed.group(1).strip() if installed.group(1) else True
+        if "ut-of-date" in flags:
+            out_of_date = _OUT_OF_DATE.search(flags)
+            if out_of_date:
+                result.out_of_date = out_of_date.group(1).strip() if out_of_date.group(1) else True
+    return result
+
+
+def parse_ss(lines: Iterable[str]) -> Iterator[SearchResult]:
+    """Yield SearchResults from -Ss output, one package at a time"""
+    current = None
+    description = []
+    for line in lines:
+        if "\x1b" in line:
+            line = _ANSI.sub("", line)
+        if line[0:1] in (" ", "\t"):
+            if current is not None:
+                description.append(line.strip())
+            continue
+
+        if not line.strip():
+            continue
+        result = parse_header(line)
+        if result is None:
+            continue
+        if current is not None:
+            current.description = " ".join(description)
+            yield current
+        current = result
+        description = []
+
+    if current is not None:
+        current.description = " ".join(description)
+        yield current
+
+
+def stream_ss(command: List[str], timeout: Optional[float] = None) -> Iterator[SearchResult]:
+    """
+    Run a -Ss command and parse its output as it arrives. Closing the
+    generator early kills the command. Raises subprocess.TimeoutExpired if
+    the command is still running after timeout seconds.
+    """
+    lines = executor.iter_lines(command, timeout)
+    try:
+        yield from parse_ss(lines)
+    finally:
+        lines.close()
+
+
+def collect_ss(command: List[str], limit: Optional[int] = None, timeout: Optional[float] = None) -> List[SearchResult]:
+    """The first `limit` results of a -Ss command (stops the command early)"""
+    results = []
+    if limit is not None and limit <= 0:
+        return results
+    stream = stream_ss(command, timeout)
+    try:
+        for result in stream:
+            results.append(result)
+            if limit and len(results) >= limit:
+                break
+    finally:
+        stream.close()
+    return results
+
+
+def ss_has_exact(command: List[str], name: str, timeout: Optional[float] = None) -> bool:
+    """True as soon as a result named exactly `name` shows up"""
+    stream = stream_ss(command, timeout)
+    try:
+        return any(result.name == name for result in stream)
+    finally:
+        stream.close()
+
+
+# === Ranking ===
+
+EXACT, PREFIX, SUBSTRING, DESCRIPTION = 100, 75, 50, 25
+
+# When two sources score the same, prefer native packages
+SOURCE_PRIORITY = {"pacman": 0, "aur": 1, "flathub": 2, "meow": 3}
+
+
+def dedupe_key(result: SearchResult) -> str:
+    """'Firefox' on Flathub and 'firefox' in extra share the key 'firefox'"""
+    name = result.name.lower()
+    if result.app_id and name in ("", "unknown", result.app_id.lower()):
+        # Flathub apps with no display name: org.mozilla.firefox -> firefox
+        name = result.app_id.lower().rsplit(".", 1)[-1]
+    return "-".join(name.split())
+
+
+def _names(result: SearchResult) -> List[str]:
+    names = [result.name.lower(), dedupe_key(result)]
+    if result.app_id:
+        # org.mozilla.firefox -> firefox
+        names.append(result.app_id.lower().rsplit(".", 1)[-1])
+    return names
+
+
+def score(result: SearchResult, query: str) -> int:
+    """EXACT, PREFIX or SUBSTRING name match, DESCRIPTION match, or 0"""
+    query = query.lower().strip()
+    names = _names(result)
+    if query in names:
+        return EXACT
+    if any(name.startswith(query) for name in names):
+        return PREFIX
+    if any(query in name for name in names):
+        return SUBSTRING
+    if query in result.description.lower():
+        return DESCRIPTION
+    return 0
+
+
+def rank(results: Iterable[SearchResult], query: str, top: Optional[int] = None) -> List[SearchResult]:
+    """
+    Score every result against query, fold the same package found on
+    several sources into one entry (the best-ranked one, with the others in
+    .also) and return the best `top` entries.
+    """
+    def order(result):
+        return (-result.score, SOURCE_PRIORITY.get(result.source, 9), len(result.name), result.name)
+
+    merged = {}
+    for result in results:
+        result.score = score(result, query)
+        key = dedupe_key(result)
+        best = merged.get(key)
+        if best is None:
+            merged[key] = result
+        elif order(result) < order(best):
+            result.also = best.also + [best]
+            best.also = []
+            merged[key] = result
+        else:
+            best.also.append(result)
+
+    ranked = sorted(merged.values(), key=order)
+    return ranked[:top] if top else ranked
+
+
+def _bench(path: Optional[str] = None, repeat: int = 1, records: int = 200000):
+    import time
+    import tracemalloc
+
+    if path:
+        with open(path, "r", errors="replace") as f:
+            lines = f.readlines() * repeat
+    else:
+        lines = []
+        for i in range(records):
+            lines.append(f"aur/package-{i} {i % 97}.{i % 13}-1 (+{i % 500} {i % 7}.25) (Out-of-date: 2024-01-02)\n")
+            lines.append(f"    Synthetic description number {i} for benchmarking the parser\n")
+
+    start = time.perf_counter()
+    count = sum(1 for _ in parse_ss(iter(lines)))
+    elapsed = time.perf_counter() - start
+
+    # Separate pass: tracemalloc slows the parser down too much to time it
+    tracemalloc.start()
+    for _ in parse_ss(iter(lines)):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{count} results from {len(lines)} lines in {elapsed:.3f}s "
+          f"({count / elapsed:,.0f} results/s), parser peak memory {peak / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) >= 2 and sys.argv[1] == "bench":
+        _bench(sys.argv[2] if len(sys.argv) > 2 else None, int(sys.argv[3]) if len(sys.argv) > 3 else 1)
+    else:
+        print("usage: search.py bench [recorded-output.txt [repeat]]")
@@ -0,0 +1,297 @@
+"""
+Local trigram search index over every package Meow knows about.
+
+Each source (pacman sync dbs, flatpak appstream catalogs, the Meow catalog
+snapshot, ...) is a provider with a cheap signature; a source is only
+re-indexed when its signature changes.
+Queries are answered offline from ~/.cache/meow/search-index.sqlite3 by
+trigram overlap, so typos like "fierfox" still find firefox.
+"""
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+from search import SearchResult, score as match_score
+
+INDEX_PATH = Path("~/.cache/meow/search-index.sqlite3").expanduser()
+
+# Minimum share of the query's trigrams a document has to contain
+MIN_SIMILARITY = 0.3
+
+# Index sources whose results belong to another package source
+RESULT_SOURCES = {"appstream": "flathub"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sources (
+    source    TEXT PRIMARY KEY,
+    signature TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS docs (
+    id          INTEGER PRIMARY KEY,
+    source      TEXT NOT NULL,
+    repo        TEXT NOT NULL DEFAULT '',
+    name        TEXT NOT NULL,
+    version     TEXT NOT NULL DEFAULT '',
+    description TEXT NOT NULL DEFAULT '',
+    app_id      TEXT
+);
+CREATE INDEX IF NOT EXISTS docs_source ON docs (source);
+CREATE INDEX IF NOT EXISTS docs_name ON docs (lower(name));
+CREATE TABLE IF NOT EXISTS grams (
+    gram TEXT NOT NULL,
+    doc  INTEGER NOT NULL,
+    PRIMARY KEY (gram, doc)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS grams_doc ON grams (doc);
+"""
+
+
+class Doc(NamedTuple):
+    repo: str
+    name: str
+    version: str = ""
+    description: str = ""
+    tags: str = ""
+    app_id: Optional[str] = None
+
+
+class Provider(NamedTuple):
+    # Cheap fingerprint of the source's current data; None if it has none
+    signature: Callable[[], Optional[str]]
+    documents: Callable[[], Iterable[Doc]]
+
+
+PROVIDERS: Dict[str, Provider] = {}
+
+
+def register_provider(source: str, signature: Callable[[], Optional[str]], documents: Callable[[], Iterable[Doc]]):
+    PROVIDERS[source] = Provider(signature, documents)
+
+
+def trigrams(text: str) -> set:
+    """Trigrams of every word, padded so that word starts and ends count"""
+    grams = set()
+    for word in text.lower().split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def doc_grams(doc: Doc) -> Iterator[str]:
+    # Name grams are kept apart from description/tag grams so they weigh more
+    for gram in trigrams(doc.name.replace("-", " ").replace("_", " ") + " " + doc.name):
+        yield "n" + gram
+    if doc.app_id:
+        for gram in trigrams(doc.app_id.replace(".", " ")):
+            yield "n" + gram
+    for gram in trigrams(f"{doc.description} {doc.tags}"):
+        yield "d" + gram
+
+
+class SearchIndex:
+    def __init__(self, path=INDEX_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def signature(self, source: str) -> Optional[str]:
+        row = self.conn.execute("SELECT signature FROM sources WHERE source = ?", (source,)).fetchone()
+        return row["signature"] if row else None
+
+    def index_source(self, source: str, signature: str, documents: Iterable[Doc]):
+        """Replace everything indexed for source in one transaction"""
+        with self._lock, self.conn:
+            self._drop_source(source)
+            for doc in documents:
+                cur = self.conn.execute(
+                    "INSERT INTO docs (source, repo, name, version, description, app_id) VALUES (?, ?, ?, ?, ?, ?)",
+                    (source, doc.repo, doc.name, doc.version, doc.description, doc.app_id)
+                )
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO grams (gram, doc) VALUES (?, ?)",
+                    ((gram, cur.lastrowid) for gram in set(doc_grams(doc)))
+                )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sources (source, signature) VALUES (?, ?)", (source, signature)
+            )
+
+    def _drop_source(self, source: str):
+        self.conn.execute("DELETE FROM grams WHERE doc IN (SELECT id FROM docs WHERE source = ?)", (source,))
+        self.conn.execute("DELETE FROM docs WHERE source = ?", (source,))
+        self.conn.execute("DELETE FROM sources WHERE source = ?", (source,))
+
+    def refresh(self, sources: Optional[List[str]] = None) -> List[str]:
+        """Re-index the sources whose signature changed. Returns them."""
+        refreshed = []
+        for source in sources or list(PROVIDERS):
+            provider = PROVIDERS.get(source)
+            if provider is None:
+                continue
+            try:
+                signature = provider.signature()
+            except Exception as e:
+                print(f"[WARN] Could not check {source} for the search index: {e}")
+                continue
+            if signature is None:
+                if self.signature(source) is not None:
+                    with self._lock, self.conn:
+                        self._drop_source(source)
+                continue
+            if signature == self.signature(source):
+                continue
+            try:
+                self.index_source(source, signature, provider.documents())
+            except Exception as e:
+                print(f"[WARN] Could not index {source}: {e}")
+                continue
+            refreshed.append(source)
+        return refreshed
+
+    def query(self, text: str, limit: int = 20, sources: Optional[List[str]] = None) -> List[SearchResult]:
+        """Fuzzy search: documents sharing the most query trigrams first"""
+        grams = trigrams(text)
+        if not grams:
+            return []
+        wanted = ["n" + g for g in grams] + ["d" + g for g in grams]
+        marks = ",".join("?" * len(wanted))
+        sql = (
+            f"SELECT d.*, SUM(CASE WHEN substr(g.gram, 1, 1) = 'n' THEN 2 ELSE 1 END) AS hits, "
+            f"SUM(substr(g.gram, 1, 1) = 'n') AS name_hits, SUM(substr(g.gram, 1, 1) = 'd') AS desc_hits "
+            f"FROM grams g JOIN docs d ON d.id = g.doc WHERE g.gram IN ({marks})"
+        )
+        params = list(wanted)
+        if sources:
+            sql += f" AND d.source IN ({','.join('?' * len(sources))})"
+            params += sources
+        sql += " GROUP BY g.doc HAVING MAX(name_hits, desc_hits) >= ? ORDER BY hits DESC LIMIT ?"
+        params += [max(1, int(len(grams) * MIN_SIMILARITY + 0.999)), limit * 5]
+
+        # Exact and prefix name matches are looked up on their own: among
+        # many similar names (git-*) the trigram LIMIT could cut them
+        name = " ".join(text.lower().split())
+        name_sql = "SELECT d.*, 0 AS hits FROM docs d WHERE lower(d.name) >= ? AND lower(d.name) < ?"
+        name_params = [name, name + "\U0010ffff"]
+        if sources:
+            name_sql += f" AND d.source IN ({','.join('?' * len(sources))})"
+            name_params += sources
+        name_sql += " ORDER BY length(d.name), d.name LIMIT ?"
+        name_params.append(limit)
+
+        with self._lock:
+            rows = {row["id"]: row for row in self.conn.execute(name_sql, name_params)}
+            rows.update((row["id"], row) for row in self.conn.execute(sql, params))
+
+        results = []
+        for row in rows.values():
+            result = SearchResult(
+                row["repo"], row["name"], row["version"], row["description"],
+                source=RESULT_SOURCES.get(row["source"], row["source"]), app_id=row["app_id"]
+            )
+            # Real matches first, then by how many trigrams were shared
+            result.score = match_score(result, text) * 1000 + row["hits"]
+            results.append(result)
+        results.sort(key=lambda r: (-r.score, len(r.name), r.name))
+        return results[:limit]
+
+
+# === Built-in providers ===
+
+def _pacman_signature() -> Optional[str]:
+    import pacmandb
+    index = pacmandb.get_index()
+    if index is None:
+        return None
+    index.refresh()
+    return index.signature() or None
+
+
+def _pacman_documents() -> Iterator[Doc]:
+    import pacmandb
+    for pkg in pacmandb.get_index().all_packages():
+        yield Doc(pkg["repo"], pkg["name"], pkg["version"], pkg["desc"])
+
+
+FLATHUB_CACHE_PREFIX = "flathub:"
+
+
+def _flathub_cache_signature() -> Optional[str]:
+    import flathub
+    import httpcache
+    if flathub.local_index() is not None:
+        # The full appstream catalog already covers everything cached
+        return None
+    return httpcache.get_cache().signature(FLATHUB_CACHE_PREFIX)
+
+
+def _flathub_cache_documents() -> Iterator[Doc]:
+    """Every app seen in cached Flathub search answers"""
+    import httpcache
+    cache = httpcache.get_cache()
+    seen = set()
+    for key in cache.keys(FLATHUB_CACHE_PREFIX):
+        entry = cache.get_entry(key)
+        value = entry["value"] if entry else None
+        apps = value.get("hits", []) if isinstance(value, dict) else value or []
+        for app in apps:
+            if not isinstance(app, dict):
+                continue
+            app_id = app.get("app_id") or app.get("flatpakAppId")
+            if not app_id or app_id in seen:
+                continue
+            seen.add(app_id)
+            yield Doc("flathub", app.get("name") or app_id, "", app.get("summary", ""), app_id=app_id)
+
+
+def _appstream_signature() -> Optional[str]:
+    import appstream
+    index = appstream.get_index()
+    if index is None:
+        return None
+    return index.signature() or None
+
+
+def _appstream_documents() -> Iterator[Doc]:
+    import appstream
+    for app in appstream.get_index().all_apps():
+        yield Doc(app["remote"], app["name"], app["version"], app["summary"], app["keywords"], app["app_id"])
+
+
+def _meow_signature() -> Optional[str]:
+    import catalog
+    snapshot = catalog.get_catalog()
+    changed_at = snapshot.meta("changed_at")
+    return f"{snapshot.base_url}:{changed_at}" if changed_at and snapshot.count() else None
+
+
+def _meow_documents() -> Iterator[Doc]:
+    import catalog
+    for pkg in catalog.get_catalog().all():
+        tags = pkg.get("tags") or ""
+        if isinstance(tags, list):
+            tags = " ".join(tags)
+        yield Doc("meow", pkg["name"], pkg.get("version") or "", pkg.get("description") or "", tags)
+
+
+register_provider("pacman", _pacman_signature, _pacman_documents)
+register_provider("appstream", _appstream_signature, _appstream_documents)
+register_provider("flathub", _flathub_cache_signature, _flathub_cache_documents)
+register_provider("meow", _meow_signature, _meow_documents)
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_index() -> SearchIndex:
+    """Shared index for this process, refreshed once"""
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = SearchIndex()
+            _index.refresh()
+        return _index
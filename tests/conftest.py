@@ -0,0 +1,111 @@
+import gzip
+import json
+import os
+import platform
+import shutil
+import sys
+import tarfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+import pytest
+
+# meow is a set of flat top-level modules
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def build_sync_db(repo_dir, db_path):
+    """Pack a directory of <pkg>-<ver>/desc entries the way repo-add does"""
+    with tarfile.open(db_path, "w:gz") as tar:
+        for entry in sorted(os.listdir(repo_dir)):
+            tar.add(os.path.join(repo_dir, entry), arcname=entry)
+
+
+@pytest.fixture
+def sync_dir(tmp_path):
+    """A pacman sync directory with the fixture core.db and extra.db"""
+    target = tmp_path / "sync"
+    target.mkdir()
+    for repo in ("core", "extra"):
+        build_sync_db(os.path.join(FIXTURES, "sync", repo), target / f"{repo}.db")
+    return target
+
+
+@pytest.fixture
+def appstream_dir(tmp_path):
+    """A flatpak appstream directory with the fixture catalog as the flathub remote"""
+    target = tmp_path / "appstream"
+    active = target / "flathub" / platform.machine() / "active"
+    active.mkdir(parents=True)
+    with open(os.path.join(FIXTURES, "appstream.xml"), "rb") as src, \
+            gzip.GzipFile(active / "appstream.xml.gz", "wb", mtime=0) as dst:
+        shutil.copyfileobj(src, dst)
+    return target
+
+
+class StandIn:
+    """
+    Local stand-in for a JSON HTTP API. `routes` maps (method, path) to a
+    callable taking (query, body) and returning (status, json) or
+    (status, json, headers); json None sends no body. Every request is
+    recorded in `requests` as (method, path, query, headers).
+    """
+
+    def __init__(self):
+        self.routes = {}
+        self.requests = []
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _answer(self):
+                url = urlsplit(self.path)
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length)) if length else None
+                stand_in.requests.append((self.command, url.path, url.query, dict(self.headers)))
+                route = stand_in.routes.get((self.command, url.path))
+                status, payload, *headers = route(url.query, body) if route else (404, {"detail": "Not Found"})
+                data = json.dumps(payload).encode() if payload is not None else b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                for name, value in (headers[0] if headers else {}).items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_port}"
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+
+    def route(self, method, path, handler):
+        self.routes[(method, path)] = handler
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def stand_in():
+    server = StandIn()
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def http_cache(tmp_path, monkeypatch):
+    """Point the shared HTTP cache at an empty database"""
+    import httpcache
+    cache = httpcache.HTTPCache(tmp_path / "http-cache.sqlite3")
+    monkeypatch.setattr(httpcache, "_cache", cache)
+    return cache
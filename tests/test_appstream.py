@@ -0,0 +1,69 @@
+import os
+import platform
+
+import appstream
+from conftest import FIXTURES
+
+
+def make_index(appstream_dir, tmp_path):
+    index = appstream.AppstreamIndex([str(appstream_dir)], tmp_path / "appstream-index.sqlite3")
+    index.refresh()
+    return index
+
+
+def test_read_appstream_skips_runtimes_and_translations():
+    records = {r["app_id"]: r for r in appstream.read_appstream(os.path.join(FIXTURES, "appstream.xml"))}
+    assert set(records) == {"org.mozilla.firefox", "org.gimp.GIMP", "com.github.tchx84.Flatseal", "io.neovim.nvim"}
+    firefox = records["org.mozilla.firefox"]
+    assert firefox["name"] == "Firefox"
+    assert firefox["summary"] == "Fast, Private & Safe Web Browser"
+    assert firefox["version"] == "125.0.1"
+    assert firefox["keywords"] == "web browser Network"
+
+
+def test_find_feeds_only_this_arch(appstream_dir):
+    other = appstream_dir / "flathub" / ("aarch64" if platform.machine() != "aarch64" else "x86_64") / "active"
+    other.mkdir(parents=True)
+    (other / "appstream.xml.gz").write_bytes(b"")
+    feeds = appstream.find_feeds([str(appstream_dir)])
+    assert list(feeds.values()) == ["flathub"]
+    assert platform.machine() in next(iter(feeds))
+
+
+def test_search_ranks_exact_then_prefix(appstream_dir, tmp_path):
+    index = make_index(appstream_dir, tmp_path)
+    assert [a["app_id"] for a in index.search("firefox")] == ["org.mozilla.firefox"]
+    assert index.search("browser")[0]["app_id"] == "org.mozilla.firefox"
+    assert index.first_app_id("gimp") == "org.gimp.GIMP"
+    assert index.search("nothing-like-this") == []
+
+
+def test_lookup_and_exists(appstream_dir, tmp_path):
+    index = make_index(appstream_dir, tmp_path)
+    assert index.lookup("io.neovim.nvim")["version"] == ""
+    assert index.lookup("org.freedesktop.Platform") is None
+    assert index.exists("flatseal")
+    assert not index.exists("freedesktop")
+    assert index.has_remote("flathub")
+    assert not index.has_remote("fedora")
+
+
+def test_refresh_rereads_only_changed_catalogs(appstream_dir, tmp_path):
+    index = make_index(appstream_dir, tmp_path)
+    signature = index.signature()
+    assert index.refresh() == []
+
+    catalog = next(appstream_dir.glob("*/*/active/appstream.xml.gz"))
+    stat = catalog.stat()
+    os.utime(catalog, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert index.refresh() == [str(catalog)]
+    assert index.signature() != signature
+    assert len(index.all_apps()) == 4
+
+
+def test_removed_catalog_is_dropped(appstream_dir, tmp_path):
+    index = make_index(appstream_dir, tmp_path)
+    next(appstream_dir.glob("*/*/active/appstream.xml.gz")).unlink()
+    index.refresh()
+    assert index.all_apps() == []
+    assert not index.has_remote("flathub")
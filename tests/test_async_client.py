@@ -0,0 +1,109 @@
+import asyncio
+from urllib.parse import parse_qs
+
+import pytest
+
+from MeowAPI.async_client import REQUEST_ERRORS, AsyncMeowAPIClient
+
+PACKAGES = [{"name": f"pkg{i:03d}", "version": "1.0", "owner": "meow", "description": "", "tags": "",
+             "updated_at": f"2024-05-01T00:{i // 60:02d}:{i % 60:02d}"} for i in range(450)]
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def page_route(fail_at=None):
+    def route(query, body):
+        args = parse_qs(query)
+        skip, limit = int(args["skip"][0]), int(args["limit"][0])
+        if skip == fail_at:
+            return 500, {"detail": "Internal Server Error"}
+        return 200, PACKAGES[skip:skip + limit]
+    return route
+
+
+def lookup_route(query, body):
+    known = {p["name"]: p for p in PACKAGES}
+    return 200, {"packages": {name: known.get(name) for name in body["names"]}}
+
+
+def collect(client, **kwargs):
+    async def walk():
+        return [p["name"] async for p in client.iter_packages(**kwargs)]
+    return run(walk())
+
+
+@pytest.fixture
+def client(stand_in):
+    return AsyncMeowAPIClient(stand_in.url, retries=0, concurrency=4)
+
+
+def test_iter_packages_walks_every_page(stand_in, client):
+    stand_in.route("GET", "/api/packages", page_route())
+    assert collect(client, page_size=200) == [p["name"] for p in PACKAGES]
+
+
+def test_iter_packages_raises_on_a_failed_page(stand_in, client):
+    stand_in.route("GET", "/api/packages", page_route(fail_at=200))
+    with pytest.raises(REQUEST_ERRORS):
+        collect(client, page_size=200)
+
+
+def test_search_packages_reports_a_failed_page(stand_in, client, capsys):
+    stand_in.route("GET", "/api/packages", page_route(fail_at=200))
+    assert run(client.search_packages("pkg4", limit=5)) == []
+    assert "Error:" in capsys.readouterr().out
+
+
+def test_find_packages_uses_the_bulk_endpoint(stand_in, client):
+    stand_in.route("POST", "/api/packages/lookup", lookup_route)
+    found = run(client.find_packages(["pkg001", "nope", "pkg001", "pkg449"]))
+    assert list(found) == ["pkg001", "nope", "pkg449"]
+    assert found["pkg449"]["name"] == "pkg449"
+    assert found["nope"] is None
+    assert [r[:2] for r in stand_in.requests] == [("POST", "/api/packages/lookup")]
+    assert run(client.lookup_packages(["pkg002"]))["pkg002"]["name"] == "pkg002"
+
+
+def test_find_packages_falls_back_to_single_lookups(stand_in, client):
+    for name in ("pkg001", "pkg002"):
+        stand_in.route("GET", f"/api/packages/{name}", lambda q, b, name=name: (200, {"name": name}))
+    found = run(client.find_packages(["pkg001", "pkg002", "nope"]))
+    assert found == {"pkg001": {"name": "pkg001"}, "pkg002": {"name": "pkg002"}, "nope": None}
+    # The missing endpoint is remembered
+    run(client.find_packages(["pkg001"]))
+    assert [r[:2] for r in stand_in.requests].count(("POST", "/api/packages/lookup")) == 1
+
+
+def test_find_packages_raises_on_server_errors(stand_in, client):
+    stand_in.route("POST", "/api/packages/lookup", lambda q, b: (500, {"detail": "boom"}))
+    with pytest.raises(REQUEST_ERRORS):
+        run(client.find_packages(["pkg001"]))
+
+
+def test_get_changed_packages_etag(stand_in, client):
+    def route(query, body):
+        if stand_in.requests[-1][3].get("If-None-Match") == '"v1"':
+            return 304, None
+        assert parse_qs(query)["updated_since"] == ["2024-05-01T00:00:00"]
+        return 200, PACKAGES[1:3], {"ETag": '"v1"'}
+
+    stand_in.route("GET", "/api/packages", route)
+    page, etag = run(client.get_changed_packages("2024-05-01T00:00:00", limit=2))
+    assert ([p["name"] for p in page], etag) == (["pkg001", "pkg002"], '"v1"')
+    assert run(client.get_changed_packages("2024-05-01T00:00:00", etag=etag)) == (None, '"v1"')
+
+
+def test_list_packages(stand_in, client, capsys):
+    stand_in.route("GET", "/api/packages", page_route())
+    run(client.list_packages(limit=3))
+    out = capsys.readouterr().out
+    assert "pkg002" in out and "pkg003" not in out
+    assert "Total: 3 packages" in out
+
+
+def test_install_packages_skips_unknown_names(stand_in, client, tmp_path, capsys):
+    stand_in.route("POST", "/api/packages/lookup", lookup_route)
+    assert run(client.install_packages(["nope"], str(tmp_path))) == {"nope": False}
+    assert "Package 'nope' not found in Meow registry." in capsys.readouterr().out
@@ -0,0 +1,79 @@
+from urllib.parse import parse_qs
+
+import pytest
+
+import aur
+
+PACKAGES = {
+    "yay": {"Name": "yay", "Version": "12.3.5-1", "Description": "Yet another yogurt", "Popularity": 12.5},
+    "yay-bin": {"Name": "yay-bin", "Version": "12.3.5-1", "Description": "Yet another yogurt (binary)", "Popularity": 8.1},
+    "Signal-Desktop": {"Name": "Signal-Desktop", "Version": "7.8.0-1", "Description": "Signal", "Popularity": 0.4},
+}
+
+
+def rpc(query, body):
+    args = parse_qs(query)
+    if args["type"] == ["info"]:
+        wanted = {name.lower() for name in args.get("arg[]", [])}
+        results = [pkg for name, pkg in PACKAGES.items() if name.lower() in wanted]
+    elif len(args["arg"][0]) < 2:
+        return 200, {"version": 5, "type": "error", "resultcount": 0, "results": [], "error": "Query arg too small."}
+    elif args["arg"][0] == "lib":
+        return 200, {"version": 5, "type": "error", "resultcount": 0, "results": [],
+                     "error": "Too many package results."}
+    else:
+        results = [pkg for pkg in PACKAGES.values() if args["arg"][0] in pkg["Name"].lower()]
+    return 200, {"version": 5, "type": args["type"][0], "resultcount": len(results), "results": results}
+
+
+@pytest.fixture
+def aur_server(stand_in, http_cache, monkeypatch):
+    stand_in.route("GET", "/rpc/", rpc)
+    monkeypatch.setattr(aur, "AUR_URL", stand_in.url)
+    return stand_in
+
+
+def test_info_batches_and_caches_misses(aur_server):
+    assert set(aur.info(["yay", "yay-bin", "no-such-package"])) == {"yay", "yay-bin"}
+    assert len(aur_server.requests) == 1
+    assert set(aur.info(["yay", "no-such-package"])) == {"yay"}
+    assert len(aur_server.requests) == 1
+
+
+def test_info_ttl_zero_asks_again(aur_server):
+    aur.info(["yay"])
+    aur.info(["yay"], ttl=0)
+    assert len(aur_server.requests) == 2
+
+
+def test_info_matches_names_case_insensitively(aur_server):
+    found = aur.info(["signal-desktop", "YAY"])
+    assert found["signal-desktop"]["Name"] == "Signal-Desktop"
+    assert found["YAY"]["Name"] == "yay"
+    assert aur.exists("Signal-Desktop")
+    assert len(aur_server.requests) == 1
+
+
+def test_info_splits_long_requests(aur_server, monkeypatch):
+    monkeypatch.setattr(aur, "MAX_URL_LENGTH", 200)
+    names = [f"package-{i}" for i in range(40)] + ["yay"]
+    assert set(aur.info(names)) == {"yay"}
+    assert len(aur_server.requests) > 1
+
+
+def test_search_most_popular_first(aur_server):
+    assert [pkg["Name"] for pkg in aur.search("yay")] == ["yay", "yay-bin"]
+    aur.search("  YAY ")
+    assert len(aur_server.requests) == 1
+
+
+def test_search_too_many_results(aur_server):
+    with pytest.raises(aur.AURError) as e:
+        aur.search("lib")
+    assert e.value.error == aur.TOO_MANY_RESULTS
+    assert str(e.value) == "Too many AUR packages match 'lib', try a longer or more specific term"
+
+
+def test_other_rpc_errors_are_raised(aur_server):
+    with pytest.raises(aur.AURError, match="AUR: Query arg too small."):
+        aur.search("y")
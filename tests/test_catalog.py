@@ -0,0 +1,110 @@
+from urllib.parse import parse_qs
+
+import pytest
+import requests
+
+import catalog
+from meowinstaller import MeowAPIClient
+
+
+def package(name, version="1.0", updated_at="2024-05-01T00:00:00", **extra):
+    return {"name": name, "version": version, "owner": "meow", "giturl": f"https://example.com/{name}.git",
+            "description": f"{name} package", "updated_at": updated_at, **extra}
+
+
+class Registry:
+    """GET /api/packages with skip/limit/updated_since, optionally failing from a page on"""
+
+    def __init__(self, packages):
+        self.packages = packages
+        self.fail_from_skip = None
+
+    def __call__(self, query, body):
+        args = parse_qs(query)
+        skip, limit = int(args["skip"][0]), int(args["limit"][0])
+        if self.fail_from_skip is not None and skip >= self.fail_from_skip:
+            return 500, {"detail": "Internal Server Error"}
+        since = args.get("updated_since", [""])[0]
+        changed = [p for p in self.packages if p["updated_at"] > since]
+        return 200, changed[skip:skip + limit]
+
+
+@pytest.fixture
+def registry(stand_in, monkeypatch):
+    monkeypatch.setattr(catalog, "PAGE_SIZE", 2)
+    registry = Registry([package("cat"), package("kitten"), package("purr"), package("whisker")])
+    stand_in.route("GET", "/api/packages", registry)
+    return registry
+
+
+def make_catalog(tmp_path, url):
+    return catalog.Catalog(tmp_path / "meow-catalog.sqlite3", url)
+
+
+def names(snapshot):
+    return [p["name"] for p in snapshot.all()]
+
+
+def test_first_sync_downloads_everything(registry, stand_in, tmp_path):
+    snapshot = make_catalog(tmp_path, stand_in.url)
+    assert snapshot.sync(MeowAPIClient(stand_in.url, retries=0)) == (4, 0)
+    assert names(snapshot) == ["cat", "kitten", "purr", "whisker"]
+    assert snapshot.meta("cursor") == "2024-05-01T00:00:00"
+
+
+def test_incremental_sync_applies_changes_and_removals(registry, stand_in, tmp_path):
+    snapshot = make_catalog(tmp_path, stand_in.url)
+    client = MeowAPIClient(stand_in.url, retries=0)
+    snapshot.sync(client)
+    registry.packages[0] = package("cat", "2.0", "2024-06-01T00:00:00")
+    registry.packages[1] = package("kitten", updated_at="2024-06-02T00:00:00", is_active=False)
+    assert snapshot.sync(client) == (1, 1)
+    assert names(snapshot) == ["cat", "purr", "whisker"]
+    assert snapshot.get("cat")["version"] == "2.0"
+    assert snapshot.meta("cursor") == "2024-06-02T00:00:00"
+
+
+def test_full_sync_drops_what_the_server_no_longer_has(registry, stand_in, tmp_path):
+    snapshot = make_catalog(tmp_path, stand_in.url)
+    client = MeowAPIClient(stand_in.url, retries=0)
+    snapshot.sync(client)
+    del registry.packages[2]
+    assert snapshot.sync(client, full=True) == (3, 1)
+    assert names(snapshot) == ["cat", "kitten", "whisker"]
+
+
+def test_failed_full_sync_keeps_the_snapshot(registry, stand_in, tmp_path):
+    snapshot = make_catalog(tmp_path, stand_in.url)
+    client = MeowAPIClient(stand_in.url, retries=0)
+    snapshot.sync(client)
+    synced_at, cursor = snapshot.meta("synced_at"), snapshot.meta("cursor")
+
+    # The first page arrives, the second one fails
+    registry.fail_from_skip = 2
+    with pytest.raises(requests.RequestException):
+        snapshot.sync(client, full=True)
+    assert names(snapshot) == ["cat", "kitten", "purr", "whisker"]
+    assert (snapshot.meta("synced_at"), snapshot.meta("cursor")) == (synced_at, cursor)
+
+
+def test_failed_sync_against_another_server_keeps_the_snapshot(registry, stand_in, tmp_path):
+    make_catalog(tmp_path, stand_in.url).sync(MeowAPIClient(stand_in.url, retries=0))
+
+    moved = make_catalog(tmp_path, "http://127.0.0.1:9")
+    with pytest.raises(requests.RequestException):
+        moved.sync(MeowAPIClient(moved.base_url, retries=0, connect_timeout=1))
+    assert names(moved) == ["cat", "kitten", "purr", "whisker"]
+    assert moved.meta("base_url") == stand_in.url
+
+
+def test_sync_against_another_server_starts_over(registry, stand_in, tmp_path):
+    snapshot = make_catalog(tmp_path, "http://old.example.com")
+    snapshot.apply([package("stale")])
+    with snapshot.conn:
+        snapshot._set_meta(base_url="http://old.example.com", cursor="2030-01-01T00:00:00", etag='"old"')
+
+    moved = make_catalog(tmp_path, stand_in.url)
+    assert moved.sync(MeowAPIClient(stand_in.url, retries=0)) == (4, 1)
+    assert names(moved) == ["cat", "kitten", "purr", "whisker"]
+    assert moved.meta("etag") is None
+    assert moved.meta("cursor") == "2024-05-01T00:00:00"
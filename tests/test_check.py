@@ -0,0 +1,55 @@
+import sys
+import time
+
+import pytest
+
+import main
+
+
+def probe(answer):
+    def run(pkg, timeout=None):
+        if isinstance(answer, Exception):
+            raise answer
+        if answer == "hang":
+            time.sleep(timeout + 1)
+        return answer
+    return run
+
+
+@pytest.fixture
+def check(monkeypatch, capsys):
+    """Run `meow check pkg` with stand-in probes; returns (exit code, output)"""
+    monkeypatch.setattr(main, "log_action", lambda *args, **kwargs: None)
+
+    def run(pacman, yay, flathub, *argv):
+        monkeypatch.setattr(main, "PROBES", {"Pacman": probe(pacman), "Yay": probe(yay), "Flathub": probe(flathub)})
+        monkeypatch.setattr(sys, "argv", ["meow", "check", "neovim", *argv])
+        code = main.main()
+        return code, capsys.readouterr().out
+    return run
+
+
+def test_found(check):
+    code, out = check(True, ConnectionError("offline"), False)
+    assert code == 0
+    assert "Package 'neovim' is available on Pacman." in out
+
+
+def test_not_found(check):
+    code, out = check(False, False, False)
+    assert code == 0
+    assert "Package 'neovim' is not available on Yay, Flathub, or Pacman." in out
+
+
+def test_every_source_failed(check):
+    code, out = check(OSError("no sync dbs"), ConnectionError("offline"), RuntimeError("Flathub answered with an error"))
+    assert code == 1
+    assert "Package 'neovim' could not be checked on Pacman, Yay, Flathub." in out
+    assert "not available" not in out
+
+
+def test_some_sources_failed(check):
+    code, out = check(False, "hang", ConnectionError("offline"), "--deadline", "yay=0.2")
+    assert code == 1
+    assert "[!] Yay: timed out" in out
+    assert "Package 'neovim' could not be checked on Yay, Flathub and is not available on Pacman." in out
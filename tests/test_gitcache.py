@@ -0,0 +1,199 @@
+import subprocess
+
+import pytest
+
+import gitcache
+
+
+def git(*argv, cwd=None):
+    return subprocess.run(["git", *argv], cwd=cwd, check=True, capture_output=True, text=True).stdout.strip()
+
+
+def commit(repo, name, content):
+    (repo / name).write_text(content)
+    git("add", name, cwd=repo)
+    git("commit", "--quiet", "-m", f"update {name}", cwd=repo)
+    return git("rev-parse", "HEAD", cwd=repo)
+
+
+@pytest.fixture(autouse=True)
+def git_env(tmp_path, monkeypatch):
+    """Isolated git identity and config, and the cache under tmp_path"""
+    monkeypatch.setenv("GIT_CONFIG_GLOBAL", str(tmp_path / "gitconfig"))
+    monkeypatch.setenv("GIT_CONFIG_NOSYSTEM", "1")
+    for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+        monkeypatch.setenv(var, "meow")
+    for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+        monkeypatch.setenv(var, "meow@example.com")
+    monkeypatch.setattr(gitcache, "CACHE_DIR", tmp_path / "cache")
+    monkeypatch.setattr(gitcache, "ENABLED", True)
+
+
+@pytest.fixture
+def upstream(tmp_path):
+    """A package repository reachable as file://, with one commit on main"""
+    repo = tmp_path / "upstream" / "meowpkg"
+    repo.mkdir(parents=True)
+    git("init", "--quiet", "--initial-branch=main", cwd=repo)
+    commit(repo, "PKGBUILD", "pkgver=1.0\n")
+    return repo
+
+
+def url(repo):
+    return f"file://{repo}"
+
+
+def alternates(checkout):
+    path = checkout / ".git" / "objects" / "info" / "alternates"
+    return path.read_text().split() if path.exists() else []
+
+
+def test_mirror_path_is_per_url():
+    a = gitcache.mirror_path("https://example.com/a/meowpkg.git")
+    b = gitcache.mirror_path("https://example.com/b/meowpkg")
+    assert a.name.startswith("meowpkg-") and a.name.endswith(".git")
+    assert a != b
+    assert a.parent == gitcache.CACHE_DIR
+
+
+def test_clone_creates_mirror_and_borrows_its_objects(upstream, tmp_path):
+    dest = tmp_path / "packages" / "meowpkg"
+    result = gitcache.clone(url(upstream), str(dest))
+    assert result.returncode == 0, result.stderr
+    mirror = gitcache.mirror_path(url(upstream))
+    assert mirror.is_dir()
+    assert git("config", "gc.pruneExpire", cwd=mirror) == "never"
+    assert alternates(dest) == [str(mirror / "objects")]
+    assert (dest / "PKGBUILD").read_text() == "pkgver=1.0\n"
+    assert not list(gitcache.CACHE_DIR.glob("*.partial"))
+
+
+def test_second_clone_reuses_the_refreshed_mirror(upstream, tmp_path):
+    gitcache.clone(url(upstream), str(tmp_path / "first"))
+    head = commit(upstream, "PKGBUILD", "pkgver=2.0\n")
+    result = gitcache.clone(url(upstream), str(tmp_path / "second"))
+    assert result.returncode == 0, result.stderr
+    mirror = gitcache.mirror_path(url(upstream))
+    # The mirror was fetched, not cloned again, and already has the new commit
+    assert git("rev-parse", "refs/heads/main", cwd=mirror) == head
+    assert git("rev-parse", "HEAD", cwd=tmp_path / "second") == head
+    assert alternates(tmp_path / "second") == [str(mirror / "objects")]
+
+
+def test_disabled_cache_makes_partial_clones(upstream, tmp_path, monkeypatch):
+    monkeypatch.setattr(gitcache, "ENABLED", False)
+    argv = gitcache.clone_argv(url(upstream), str(tmp_path / "dest"), branch="main", depth=1)
+    assert argv == ["git", "clone", "--filter=blob:none", "--depth", "1", "--branch", "main",
+                    url(upstream), str(tmp_path / "dest")]
+    assert gitcache.clone(url(upstream), str(tmp_path / "dest")).returncode == 0
+    assert not gitcache.CACHE_DIR.exists()
+    assert alternates(tmp_path / "dest") == []
+
+
+def test_unreachable_url_falls_back_to_a_plain_clone(tmp_path):
+    missing = url(tmp_path / "nowhere")
+    assert gitcache.update_mirror(missing) is None
+    assert "--filter=blob:none" in gitcache.clone_argv(missing)
+    assert not gitcache.mirror_path(missing).exists()
+
+
+
+def test_check_update(upstream, tmp_path):
+    checkout = tmp_path / "packages" / "meowpkg"
+    gitcache.clone(url(upstream), str(checkout))
+    check = gitcache.check_update(str(checkout))
+    assert (check.outdated, check.error) == (False, None)
+    assert check.local == check.remote
+
+    head = commit(upstream, "PKGBUILD", "pkgver=2.0\n")
+    check = gitcache.check_update(str(checkout))
+    assert check.outdated is True
+    assert check.remote == head
+
+    assert gitcache.pull(str(checkout)).returncode == 0
+    assert gitcache.check_update(str(checkout)).outdated is False
+
+
+def test_local_commits_are_not_an_update(upstream, tmp_path):
+    checkout = tmp_path / "meowpkg"
+    gitcache.clone(url(upstream), str(checkout))
+    commit(checkout, "local.patch", "tweak\n")
+    check = gitcache.check_update(str(checkout))
+    assert check.outdated is False
+    assert check.local != check.remote
+
+
+def test_check_update_only_matches_the_exact_ref(upstream, tmp_path):
+    checkout = tmp_path / "meowpkg"
+    gitcache.clone(url(upstream), str(checkout))
+    # ls-remote main would also list refs/heads/feature/main
+    git("branch", "feature/main", cwd=upstream)
+    git("checkout", "--quiet", "feature/main", cwd=upstream)
+    commit(upstream, "PKGBUILD", "pkgver=3.0-beta\n")
+    assert gitcache.check_update(str(checkout)).outdated is False
+
+
+def test_check_update_errors(upstream, tmp_path):
+    checkout = tmp_path / "meowpkg"
+    gitcache.clone(url(upstream), str(checkout))
+    git("checkout", "--quiet", "--detach", cwd=checkout)
+    assert gitcache.check_update(str(checkout)).error == "not on a branch"
+
+    git("checkout", "--quiet", "-b", "local-only", cwd=checkout)
+    check = gitcache.check_update(str(checkout))
+    assert (check.outdated, check.error) == (None, "no upstream branch")
+
+    git("checkout", "--quiet", "main", cwd=checkout)
+    git("checkout", "--quiet", "--detach", cwd=upstream)
+    git("branch", "--quiet", "-D", "main", cwd=upstream)
+    check = gitcache.check_update(str(checkout))
+    assert (check.outdated, check.error) == (None, "refs/heads/main is gone from origin")
+
+
+def test_check_updates_and_checkouts(upstream, tmp_path):
+    packages = tmp_path / "packages"
+    for name in ("a", "b"):
+        gitcache.clone(url(upstream), str(packages / name))
+    (packages / "not-a-checkout").mkdir()
+    paths = gitcache.checkouts(str(packages))
+    assert paths == [str(packages / "a"), str(packages / "b")]
+    commit(upstream, "PKGBUILD", "pkgver=2.0\n")
+    results = gitcache.check_updates(paths, workers=2)
+    assert [results[p].outdated for p in paths] == [True, True]
+    assert all(r.returncode == 0 for r in gitcache.update_checkouts(paths, workers=2).values())
+    assert not any(c.outdated for c in gitcache.check_updates(paths).values())
+
+
+def test_update_all_packages_pulls_only_outdated(upstream, tmp_path):
+    from meowinstaller import MeowAPIClient
+    packages = tmp_path / "packages"
+    other = tmp_path / "upstream" / "otherpkg"
+    other.mkdir()
+    git("init", "--quiet", "--initial-branch=main", cwd=other)
+    commit(other, "PKGBUILD", "pkgver=1.0\n")
+    gitcache.clone(url(upstream), str(packages / "meowpkg"))
+    gitcache.clone(url(other), str(packages / "otherpkg"))
+
+    head = commit(upstream, "PKGBUILD", "pkgver=2.0\n")
+    before = git("rev-parse", "HEAD", cwd=packages / "otherpkg")
+    results = MeowAPIClient("http://127.0.0.1:9").update_all_packages(str(packages), workers=2)
+    assert results == {"meowpkg": True, "otherpkg": True}
+    assert git("rev-parse", "HEAD", cwd=packages / "meowpkg") == head
+    # Up to date: no pull, not even a reflog entry
+    assert git("rev-parse", "HEAD", cwd=packages / "otherpkg") == before
+    assert len(git("reflog", cwd=packages / "otherpkg").splitlines()) == 1
+
+
+def test_outdated_meow(upstream, tmp_path, monkeypatch, capsys):
+    import upgrade
+    packages = tmp_path / "packages"
+    gitcache.clone(url(upstream), str(packages / "meowpkg"))
+    gitcache.clone(url(upstream), str(packages / "orphan"))
+    git("checkout", "--quiet", "--detach", cwd=packages / "orphan")
+    monkeypatch.setattr(upgrade, "MEOW_PACKAGES_DIR", str(packages))
+    assert upgrade.outdated_meow() == []
+
+    head = commit(upstream, "PKGBUILD", "pkgver=2.0\n")
+    [up] = upgrade.outdated_meow()
+    assert (up.name, up.available) == ("meowpkg", head[:8])
+    assert "Could not check orphan for updates: not on a branch" in capsys.readouterr().out
@@ -0,0 +1,138 @@
+import json
+import multiprocessing
+from datetime import datetime, timedelta
+
+import pytest
+
+import journal
+from parser import create_parser
+
+WRITERS = 6
+RECORDS = 150
+
+
+def journal_files(log_dir):
+    return sorted(f for f in log_dir.glob("journal.jsonl*") if f.suffix != ".lock")
+
+
+def write_many(log_dir, writer):
+    for i in range(RECORDS):
+        # Padded so the journal rotates every few dozen records
+        journal.log_action("install", package=f"pkg-{writer}-{i}", source="aur",
+                           log_dir=log_dir, max_bytes=4096, backups=1000, pad="x" * 64)
+
+
+def test_concurrent_writers_with_rotation(tmp_path):
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=write_many, args=(tmp_path, w)) for w in range(WRITERS)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join(30)
+        assert p.exitcode == 0
+
+    files = journal_files(tmp_path)
+    assert len(files) > 10, "the journal should have rotated"
+    seen = []
+    for file in files:
+        for line in file.read_text(encoding="utf-8").splitlines(keepends=True):
+            # No torn lines: each one is a whole record
+            assert line.endswith("\n")
+            seen.append(json.loads(line)["package"])
+    expected = {f"pkg-{w}-{i}" for w in range(WRITERS) for i in range(RECORDS)}
+    assert len(seen) == len(expected) and set(seen) == expected
+
+    # Each writer's records come back in the order it wrote them
+    ordered = [r["package"] for r in journal.read_journal(tmp_path, backups=1000)]
+    for w in range(WRITERS):
+        mine = [p for p in ordered if p.startswith(f"pkg-{w}-")]
+        assert mine == [f"pkg-{w}-{i}" for i in range(RECORDS)]
+
+
+def test_rotation_drops_the_oldest_backup(tmp_path):
+    for i in range(40):
+        journal.log_action("check", package=f"p{i}", log_dir=tmp_path, max_bytes=300, backups=2)
+    assert [f.name for f in journal_files(tmp_path)] == [
+        "journal.jsonl", "journal.jsonl.1", "journal.jsonl.2"]
+    packages = [r["package"] for r in journal.read_journal(tmp_path, backups=2)]
+    assert packages == [f"p{i}" for i in range(40 - len(packages), 40)]
+
+
+def test_legacy_log_is_read_first(tmp_path):
+    (tmp_path / "meow.log").write_text(
+        "[2024-05-01 10:00:00] check firefox\n"
+        "garbage\n"
+        "[2024-05-02 11:30:00] upgrade"  # the old logger wrote no final newline
+    )
+    journal.log_action("install", package="firefox", source="pacman", log_dir=tmp_path)
+
+    records = list(journal.read_journal(tmp_path))
+    assert [(r["action"], r.get("package")) for r in records] == [
+        ("check", "firefox"), ("upgrade", None), ("install", "firefox")]
+    assert records[0]["legacy"] is True
+    assert datetime.fromisoformat(records[0]["ts"]) == datetime(2024, 5, 1, 10).astimezone()
+    # The old file is only read, never rewritten
+    assert "garbage" in (tmp_path / "meow.log").read_text()
+
+
+# === meow history ===
+
+def write_records(log_dir, records):
+    with open(journal.journal_path(log_dir), "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record) + "\n")
+
+
+@pytest.fixture
+def history(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(journal, "LOG_DIR", tmp_path)
+    now = datetime.now().astimezone().replace(microsecond=0)
+    (tmp_path / "meow.log").write_text(
+        (now - timedelta(days=30)).strftime("[%Y-%m-%d %H:%M:%S] check firefox\n"))
+    write_records(tmp_path, [
+        {"ts": (now - timedelta(days=3)).isoformat(), "action": "install", "package": "firefox", "source": "pacman"},
+        {"ts": (now - timedelta(days=2)).isoformat(), "action": "install", "package": "yay", "source": "aur"},
+        {"ts": (now - timedelta(hours=5)).isoformat(), "action": "update", "package": "Firefox", "source": "pacman"},
+        {"ts": (now - timedelta(hours=1)).isoformat(), "action": "search", "query": "fire"},
+        {"ts": (now - timedelta(minutes=5)).isoformat(), "action": "check", "package": "yay"},
+    ])
+
+    def run(*argv):
+        journal.show_history(create_parser().parse_args(["history", *argv]))
+        return capsys.readouterr().out.splitlines()
+    return run
+
+
+def actions(lines):
+    return [line.split("] ", 1)[1] for line in lines]
+
+
+def test_history_all(history):
+    assert actions(history("--limit", "0")) == [
+        "check firefox", "install firefox (pacman)", "install yay (aur)",
+        "update Firefox (pacman)", "search", "check yay"]
+
+
+def test_history_package(history):
+    # Case-insensitive, and including the legacy log
+    assert actions(history("--package", "firefox")) == [
+        "check firefox", "install firefox (pacman)", "update Firefox (pacman)"]
+
+
+def test_history_since_until(history):
+    assert actions(history("--since", "1d")) == ["update Firefox (pacman)", "search", "check yay"]
+    assert actions(history("--until", "2h")) == [
+        "check firefox", "install firefox (pacman)", "install yay (aur)", "update Firefox (pacman)"]
+    assert actions(history("--since", "4d", "--until", "1d", "--source", "pacman")) == ["install firefox (pacman)"]
+    since = (datetime.now() - timedelta(days=2, hours=12)).strftime("%Y-%m-%dT%H:%M")
+    assert actions(history("--since", since, "-a", "install")) == ["install yay (aur)"]
+
+
+def test_history_limit_keeps_the_latest(history):
+    assert actions(history("-n", "2")) == ["search", "check yay"]
+    assert actions(history("-p", "firefox", "-n", "1")) == ["update Firefox (pacman)"]
+
+
+def test_history_messages(history):
+    assert history("--package", "nothing") == ["No matching history entries."]
+    assert history("--since", "yesterday")[0].startswith("Invalid time:")
@@ -0,0 +1,84 @@
+import os
+import shutil
+
+import pacmandb
+from conftest import FIXTURES, build_sync_db
+
+PACMAN_CONF = os.path.join(FIXTURES, "pacman.conf")
+
+
+def make_index(sync_dir, tmp_path):
+    index = pacmandb.PacmanIndex(str(sync_dir), tmp_path / "index.sqlite3", PACMAN_CONF)
+    index.refresh()
+    return index
+
+
+def test_parse_desc():
+    fields = pacmandb.parse_desc("%NAME%\nfoo\n\n%DEPENDS%\nbar\nbaz>=2\n\n")
+    assert fields == {"NAME": ["foo"], "DEPENDS": ["bar", "baz>=2"]}
+
+
+def test_strip_constraint():
+    assert pacmandb.strip_constraint("libalpm.so=14-64") == "libalpm.so"
+    assert pacmandb.strip_constraint("python>=3") == "python"
+    assert pacmandb.strip_constraint("glibc") == "glibc"
+
+
+def test_read_sync_db(sync_dir):
+    records = {r["name"]: r for r in pacmandb.read_sync_db(sync_dir / "core.db")}
+    assert set(records) == {"glibc", "linux", "openssh", "pacman"}
+    assert records["pacman"]["version"] == "6.1.0-3"
+    assert records["pacman"]["provides"] == ["libalpm.so"]
+    assert records["glibc"]["desc"] == "GNU C Library"
+
+
+def test_repo_order():
+    assert pacmandb.repo_order(PACMAN_CONF) == ["core", "extra"]
+
+
+def test_lookup_prefers_pacman_conf_order(sync_dir, tmp_path):
+    index = make_index(sync_dir, tmp_path)
+    assert index.lookup("openssh")["repo"] == "core"
+    assert index.lookup("openssh")["version"] == "9.7p1-1"
+    assert index.lookup("firefox")["repo"] == "extra"
+    assert index.lookup("nope") is None
+
+
+def test_providers_and_exists(sync_dir, tmp_path):
+    index = make_index(sync_dir, tmp_path)
+    assert [p["name"] for p in index.providers("libalpm.so")] == ["pacman"]
+    assert index.exists("vim-plugin-runtime")
+    assert not index.exists("emacs")
+
+
+def test_prefix_and_search(sync_dir, tmp_path):
+    index = make_index(sync_dir, tmp_path)
+    assert [p["name"] for p in index.prefix("git")] == ["git", "git-lfs"]
+    # Case-insensitive, name or description, like pacman -Ss
+    assert {p["name"] for p in index.search("BROWSER")} == {"firefox"}
+    assert {p["name"] for p in index.search("git")} == {"git", "git-lfs"}
+
+
+def test_refresh_only_rereads_changed_repos(sync_dir, tmp_path):
+    index = make_index(sync_dir, tmp_path)
+    assert index.refresh() == []
+
+    signature = index.signature()
+    extra = tmp_path / "extra-src"
+    shutil.copytree(os.path.join(FIXTURES, "sync", "extra"), extra)
+    shutil.rmtree(extra / "firefox-125.0-1")
+    build_sync_db(extra, sync_dir / "extra.db")
+    os.utime(sync_dir / "extra.db", ns=(1, 1))
+
+    assert index.refresh() == ["extra"]
+    assert index.lookup("firefox") is None
+    assert index.lookup("pacman") is not None
+    assert index.signature() != signature
+
+
+def test_removed_repo_is_dropped(sync_dir, tmp_path):
+    index = make_index(sync_dir, tmp_path)
+    os.remove(sync_dir / "extra.db")
+    index.refresh()
+    assert index.lookup("git") is None
+    assert index.lookup("glibc") is not None
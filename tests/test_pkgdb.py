@@ -0,0 +1,156 @@
+import json
+import threading
+
+import pytest
+
+import installer
+import pkgdb
+
+
+@pytest.fixture
+def db(tmp_path):
+    return pkgdb.PackageDB(tmp_path / "packages.sqlite3")
+
+
+LEGACY = [
+    {"pkgname": "yay", "version": "12.3.5-1", "packagemanager": "aur", "source": "aur"},
+    {"pkgname": "firefox", "version": "125.0.1", "source": "flathub", "ID": "org.mozilla.firefox"},
+    {"pkgname": "htop", "version": "3.3.0-1", "source": "pac", "deleted": True},
+    {"version": "no name"},
+    "garbage",
+]
+
+
+# === Legacy info.json ===
+
+def test_import_info_json_list(db, tmp_path):
+    (tmp_path / "info.json").write_text(json.dumps(LEGACY))
+    assert db.import_info_json(tmp_path / "info.json") == 3
+    assert [(r["name"], r["version"], r["source"], r["flathub_id"], r["deleted"]) for r in db.all(include_deleted=True)] == [
+        ("firefox", "125.0.1", "flathub", "org.mozilla.firefox", False),
+        ("htop", "3.3.0-1", "pac", None, True),
+        ("yay", "12.3.5-1", "aur", None, False),
+    ]
+    assert [r["name"] for r in db.all()] == ["firefox", "yay"]
+
+
+def test_import_info_json_runs_once(db, tmp_path):
+    info = tmp_path / "info.json"
+    info.write_text(json.dumps(LEGACY))
+    assert db.import_info_json(info) == 3
+    db.record("yay", "12.4.1-1", "aur")
+    db.remove("htop")
+
+    # Neither a second run nor a later edit of the file brings old records back
+    assert db.import_info_json(info) == 0
+    info.write_text(json.dumps(LEGACY + [{"pkgname": "vim", "source": "pac"}]))
+    assert db.import_info_json(info) == 0
+    assert db.get("yay")["version"] == "12.4.1-1"
+    assert db.get("htop") is None and db.get("vim") is None
+
+    # The import state lives in the database itself
+    again = pkgdb.PackageDB(db.path)
+    assert again.import_info_json(info) == 0
+
+
+def test_import_info_json_single_record_and_bad_files(db, tmp_path):
+    (tmp_path / "info.json").write_text(json.dumps({"pkgname": "neovim", "version": "0.9.5-1", "source": "pac"}))
+    assert db.import_info_json(tmp_path / "info.json") == 1
+    assert db.get_source("neovim") == "pac"
+
+    # The baseline shipped an empty info.json
+    (tmp_path / "empty.json").write_text("")
+    assert db.import_info_json(tmp_path / "empty.json") == 0
+    assert db.import_info_json(tmp_path / "missing.json") == 0
+
+
+def test_import_never_overwrites_the_database(db, tmp_path):
+    db.record("firefox", "126.0", "pac")
+    (tmp_path / "info.json").write_text(json.dumps(LEGACY))
+    assert db.import_info_json(tmp_path / "info.json") == 2
+    assert db.get("firefox")["source"] == "pac"
+    # The skipped legacy record does not take its Flathub ID with it either
+    assert db.get("org.mozilla.firefox") is None
+
+
+def test_get_db_imports_info_json_from_the_working_directory(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(pkgdb, "DB_PATH", tmp_path / "db" / "packages.sqlite3")
+    monkeypatch.setattr(pkgdb, "_db", None)
+    (tmp_path / "info.json").write_text(json.dumps(LEGACY))
+    db = pkgdb.get_db()
+    assert db.path == tmp_path / "db" / "packages.sqlite3"
+    assert pkgdb.get_db() is db
+    assert [r["name"] for r in db.all()] == ["firefox", "yay"]
+
+
+# === Lookups ===
+
+def test_flathub_id_is_unique(db):
+    db.record("firefox", "125.0.1", "flathub", flathub_id="org.mozilla.firefox")
+    db.record("firefox-flatpak", "125.0.1", "flathub", flathub_id="org.mozilla.Firefox")
+    assert db.get("firefox") is None
+    assert db.get("org.mozilla.firefox")["name"] == "firefox-flatpak"
+
+    # Re-recording without an ID keeps the one already known
+    db.record("firefox-flatpak", "126.0", "flathub")
+    assert db.get("org.mozilla.firefox")["version"] == "126.0"
+
+
+def test_get_source(db):
+    db.record("Firefox", "125.0.1", "flathub", flathub_id="org.mozilla.firefox")
+    db.record("yay", "12.3.5-1", "aur")
+    assert db.get_source("firefox") == "flathub"
+    assert db.get_source("YAY") == "aur"
+    assert db.get_source("org.mozilla.Firefox") == "flathub"
+    # Only whole names and IDs match: the old info.json scan also matched
+    # any part of a Flathub ID
+    assert db.get_source("mozilla") is None
+    assert db.get_source("org.mozilla") is None
+    assert db.get_source("vim") is None
+
+
+def test_installer_get_source(db, monkeypatch, capsys):
+    monkeypatch.setattr(pkgdb, "_db", db)
+    db.record("yay", "12.3.5-1", "aur")
+    assert installer.get_source(["yay", "ignored"]) == "aur"
+    assert installer.get_source([]) is None
+    assert installer.get_source("vim") is None
+    assert "not found in the package database" in capsys.readouterr().out
+
+
+def test_remove(db):
+    db.record("firefox", "125.0.1", "flathub", flathub_id="org.mozilla.firefox")
+    db.record("yay", "12.3.5-1", "aur")
+    assert db.remove("org.mozilla.firefox")
+    assert db.get("firefox") is None
+    assert db.remove("YAY")
+    assert not db.remove("yay")
+    assert db.all(include_deleted=True) == []
+
+    # The ID is free again
+    db.record("librewolf", "125.0", "flathub", flathub_id="org.mozilla.firefox")
+    assert db.get_source("org.mozilla.firefox") == "flathub"
+
+
+def test_remove_prefers_the_name(db):
+    db.record("code", "1.88", "pac")
+    db.record("vscode", "1.88", "flathub", flathub_id="code")
+    assert db.remove("code")
+    assert db.get("code")["name"] == "vscode"
+
+
+def test_concurrent_writers_lose_nothing(db):
+    # Separate connections, like separate meow processes
+    other = pkgdb.PackageDB(db.path)
+
+    def write(store, prefix):
+        for i in range(100):
+            store.record(f"{prefix}{i}", "1.0", "aur")
+
+    threads = [threading.Thread(target=write, args=(store, prefix)) for store, prefix in ((db, "a"), (other, "b"))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(db.all()) == 200
@@ -0,0 +1,91 @@
+import pytest
+
+import flathub
+import resolver
+
+
+@pytest.fixture
+def flathub_server(stand_in, http_cache, monkeypatch):
+    monkeypatch.setattr(flathub, "SEARCH_V2_URL", stand_in.url + "/api/v2/search")
+    monkeypatch.setattr(flathub, "local_index", lambda: None)
+    return stand_in
+
+
+def answer(status, hits=()):
+    return lambda query, body: (status, {"hits": list(hits)} if status == 200 else {"detail": "Internal Server Error"})
+
+
+def test_flathub_error_is_not_cached_as_a_miss(flathub_server):
+    flathub_server.route("POST", "/api/v2/search", answer(500))
+    assert resolver.resolve("gimp", ["flathub"]).source is None
+    assert resolver.cached_answer("flathub", "gimp") == (False, None)
+
+    flathub_server.route("POST", "/api/v2/search", answer(200, [{"app_id": "org.gimp.GIMP", "name": "GIMP"}]))
+    assert resolver.resolve("gimp", ["flathub"]) == resolver.Resolution("flathub", resolver.EXACT, False)
+    assert resolver.cached_answer("flathub", "gimp") == (True, resolver.EXACT)
+
+
+def test_flathub_unreachable_is_not_cached(flathub_server, monkeypatch):
+    monkeypatch.setattr(flathub, "SEARCH_V2_URL", "http://127.0.0.1:9/api/v2/search")
+    assert resolver.resolve("gimp", ["flathub"]).source is None
+    assert resolver.cached_answer("flathub", "gimp") == (False, None)
+
+
+def test_flathub_empty_answer_is_a_cached_miss(flathub_server):
+    flathub_server.route("POST", "/api/v2/search", answer(200))
+    assert resolver.resolve("nothing", ["flathub"]).source is None
+    assert resolver.cached_answer("flathub", "nothing") == (True, None)
+    assert resolver.resolve("nothing", ["flathub"]).cached
+    assert len(flathub_server.requests) == 1
+
+
+def test_partial_flathub_match(flathub_server):
+    flathub_server.route("POST", "/api/v2/search", answer(200, [{"app_id": "org.gnome.Boxes", "name": "Boxes"}]))
+    assert resolver.resolve("gnome", ["flathub"]).match == resolver.PARTIAL
+
+
+def fake_probes(monkeypatch, **answers):
+    """PROBES answering from `answers`; an Exception value is raised"""
+    def probe(source):
+        def answer(name):
+            if isinstance(answers[source], Exception):
+                raise answers[source]
+            return answers[source]
+        return answer
+    monkeypatch.setattr(resolver, "PROBES", {source: probe(source) for source in answers})
+
+
+def test_unreachable_higher_source_blocks_a_lower_pick(http_cache, monkeypatch):
+    fake_probes(monkeypatch, pac=OSError("no sync dbs"), aur=None, flathub=resolver.PARTIAL)
+    resolution = resolver.resolve("steam", ["pac", "aur", "flathub"])
+    assert resolution.source is None
+    assert resolution.unchecked == ("pac",)
+    assert resolver.cached_answer("pac", "steam") == (False, None)
+
+
+def test_unreachable_lower_source_blocks_a_partial_pick(http_cache, monkeypatch):
+    # The AUR might have had an exact hit, which beats pacman's provider
+    fake_probes(monkeypatch, pac=resolver.PARTIAL, aur=OSError("timed out"), flathub=None)
+    resolution = resolver.resolve("steam", ["pac", "aur", "flathub"])
+    assert (resolution.source, resolution.unchecked) == (None, ("aur",))
+
+
+def test_exact_hit_above_an_unreachable_source_wins(http_cache, monkeypatch):
+    fake_probes(monkeypatch, pac=resolver.EXACT, aur=OSError("timed out"), flathub=None)
+    resolution = resolver.resolve("steam", ["pac", "aur", "flathub"])
+    assert (resolution.source, resolution.match) == ("pac", resolver.EXACT)
+
+
+def test_not_found_anywhere(http_cache, monkeypatch):
+    fake_probes(monkeypatch, pac=None, aur=None, flathub=None)
+    assert resolver.resolve("nothing") == resolver.Resolution(None, None, False, ())
+
+
+def test_install_reports_unchecked_sources(http_cache, monkeypatch, capsys):
+    import installer
+    fake_probes(monkeypatch, pac=OSError("no sync dbs"), aur=None, flathub=resolver.PARTIAL)
+    monkeypatch.setenv("MEOW_SOURCE_ORDER", "pac,aur,flathub")
+    installer.install_packages(["steam"], assume_yes=True)
+    out = capsys.readouterr().out
+    assert "Could not decide where to install 'steam': Pacman could not be checked. Skipping it." in out
+    assert "Nothing to install." in out
@@ -0,0 +1,219 @@
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from itertools import chain, repeat
+
+import pytest
+
+import search
+from conftest import FIXTURES
+
+SS = os.path.join(FIXTURES, "ss")
+
+
+def recorded(name):
+    with open(os.path.join(SS, name)) as f:
+        return f.readlines()
+
+
+def parsed(name):
+    return {r.name: r for r in search.parse_ss(recorded(name))}
+
+
+# === Parser ===
+
+def test_parse_header_flags():
+    result = search.parse_header("extra/plasma-browser-integration 6.0.4-1 (plasma) [installed]")
+    assert (result.repo, result.name, result.version) == ("extra", "plasma-browser-integration", "6.0.4-1")
+    assert result.installed is True and result.out_of_date is False
+    assert search.parse_header("firefox") is None
+
+
+def test_pacman_installed_markers():
+    results = parsed("pacman-Ss-firefox.txt")
+    assert len(results) == 18
+    assert results["firefox"].installed is True
+    assert results["firefox-i18n-de"].installed == "124.0.2-1"
+    assert results["firefox-developer-edition"].installed is False
+    assert results["geckodriver"].version == "1:0.34.0-1"
+    assert results["firefox-umatrix"].description == (
+        "Point and click matrix to filter net requests according to source, destination and type")
+
+
+def test_yay_installed_and_out_of_date_flags():
+    results = parsed("yay-Ss-firefox.txt")
+    assert len(results) == 11
+    assert results["firefox-nightly"].out_of_date == "2024-04-01"
+    assert results["firefox-nightly"].installed is False
+    assert results["librewolf-bin"].installed == "124.0.2_1-1"
+    assert results["mercury-browser-bin"].installed is True
+    assert results["firefox"].installed is True and results["firefox"].source == "pacman"
+    assert results["firefox-i18n-de"].installed == "124.0.2-1"
+    # Orphaned and flagged: both parenthesized flags after the votes
+    assert results["firefox-extension-bitwarden"].out_of_date == "2023-11-20"
+    assert results["firefox-esr-bin"].out_of_date is False
+    assert results["firefox-esr-bin"].source == "aur"
+
+
+def test_ansi_colors_are_stripped():
+    plain = search.parse_ss(recorded("yay-Ss-firefox.txt"))
+    colored = search.parse_ss(recorded("yay-Ss-firefox-color.txt"))
+    fields = ("repo", "name", "version", "description", "installed", "out_of_date")
+    assert [[getattr(r, f) for f in fields] for r in colored] == [[getattr(r, f) for f in fields] for r in plain]
+
+
+def test_multi_line_descriptions():
+    lines = [
+        "aur/long-description 1.0-1 (+1 0.00)\n",
+        "    A description that a wrapping terminal\n",
+        "\tsplit over several lines\n",
+        "\n",
+        "    with a blank one in between\n",
+        "aur/next 2.0-1 (+0 0.00)\n",
+        "    Short\n",
+    ]
+    first, second = search.parse_ss(lines)
+    assert first.description == "A description that a wrapping terminal split over several lines with a blank one in between"
+    assert (second.name, second.description) == ("next", "Short")
+
+
+def test_description_before_any_header_is_skipped():
+    lines = ["    description before any header\n", "\n", "extra/git 2.44.0-1\n", "    the fast distributed version control system\n"]
+    [result] = search.parse_ss(lines)
+    assert result.pkg == "extra/git"
+
+
+def test_large_output_in_constant_memory():
+    # ~200k lines built from the recorded outputs, fed as a stream
+    lines = recorded("yay-Ss-firefox-color.txt") + recorded("pacman-Ss-firefox.txt")
+    copies = 200_000 // len(lines)
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = sum(1 for _ in search.parse_ss(chain.from_iterable(repeat(lines, copies))))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert count == 29 * copies
+    assert peak < 256 * 1024
+    # Generous: tracemalloc slows the parser down several times
+    assert elapsed < 30
+
+
+# === Streaming ===
+
+def printer(tmp_path, name, then="time.sleep(30)"):
+    """A command printing a recorded output, then running `then`; writes its pid to pid.txt"""
+    script = (f"import os, sys, time\nopen({str(tmp_path / 'pid.txt')!r}, 'w').write(str(os.getpid()))\n"
+              f"sys.stdout.write(open({os.path.join(SS, name)!r}).read())\nsys.stdout.flush()\n{then}\n")
+    return [sys.executable, "-c", script]
+
+
+def gone(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return True
+    return False
+
+
+def test_collect_ss_stops_the_command_early(tmp_path):
+    start = time.monotonic()
+    results = search.collect_ss(printer(tmp_path, "pacman-Ss-firefox.txt"), limit=3, timeout=20)
+    assert [r.name for r in results] == ["firefox", "firefox-adblock-plus", "firefox-dark-reader"]
+    assert time.monotonic() - start < 10
+    assert gone(int((tmp_path / "pid.txt").read_text()))
+
+
+def test_ss_has_exact_stops_at_the_first_hit(tmp_path):
+    assert search.ss_has_exact(printer(tmp_path, "yay-Ss-firefox.txt"), "librewolf-bin", timeout=20)
+    assert gone(int((tmp_path / "pid.txt").read_text()))
+
+
+def test_stream_ss_reads_to_the_end(tmp_path):
+    results = list(search.stream_ss(printer(tmp_path, "yay-Ss-firefox-color.txt", then="pass"), timeout=20))
+    assert len(results) == 11
+    assert results[-1].description == "Vim, but in your browser"
+
+
+def test_stream_ss_timeout(tmp_path):
+    with pytest.raises(subprocess.TimeoutExpired):
+        list(search.stream_ss(printer(tmp_path, "yay-Ss-firefox.txt"), timeout=0.5))
+
+
+# === Ranking ===
+
+def flathub(name, app_id, summary=""):
+    return search.SearchResult("flathub", name, "125.0.1", summary, source="flathub", app_id=app_id)
+
+
+def test_flathub_app_merges_with_the_repo_package():
+    for name in ("Firefox", "org.mozilla.firefox", "Unknown"):
+        extra = search.SearchResult("extra", "firefox", "125.0.1-1", "Fast, Private & Safe Web Browser")
+        app = flathub(name, "org.mozilla.firefox")
+        [entry] = search.rank([app, extra], "firefox")
+        assert entry is extra
+        assert entry.also == [app]
+        assert entry.score == app.score == search.EXACT
+
+
+def test_dedupe_key():
+    assert search.dedupe_key(flathub("Visual Studio Code", "com.visualstudio.code")) == "visual-studio-code"
+    assert search.dedupe_key(flathub("com.visualstudio.code", "com.visualstudio.code")) == "code"
+    assert search.dedupe_key(search.SearchResult("aur", "Firefox-Nightly", "1")) == "firefox-nightly"
+
+
+def test_score_tiers():
+    assert search.score(search.SearchResult("extra", "firefox", "1"), "Firefox") == search.EXACT
+    assert search.score(flathub("Firefox", "org.mozilla.firefox"), "firefox") == search.EXACT
+    assert search.score(search.SearchResult("extra", "firefox-i18n-de", "1"), "firefox") == search.PREFIX
+    assert search.score(search.SearchResult("aur", "librewolf-firefox-shim", "1"), "firefox") == search.SUBSTRING
+    assert search.score(search.SearchResult("extra", "geckodriver", "1", "Proxy for Firefox"), "firefox") == search.DESCRIPTION
+    assert search.score(search.SearchResult("extra", "chromium", "1", "A web browser"), "firefox") == 0
+
+
+def test_rank_orders_by_match_tier_then_source():
+    results = [
+        search.SearchResult("extra", "geckodriver", "1", "Proxy for using W3C WebDriver-compatible clients with Firefox"),
+        search.SearchResult("aur", "librewolf-firefox-shim", "1"),
+        search.SearchResult("aur", "firefox-nightly", "1"),
+        search.SearchResult("extra", "firefox-i18n-de", "1"),
+        search.SearchResult("meow", "firefox", "1", source="meow"),
+        search.SearchResult("extra", "chromium", "1", "A web browser"),
+    ]
+    ranked = search.rank(results, "firefox")
+    assert [(r.score, r.pkg) for r in ranked] == [
+        (search.EXACT, "meow/firefox"),
+        # Same tier: pacman before aur
+        (search.PREFIX, "extra/firefox-i18n-de"),
+        (search.PREFIX, "aur/firefox-nightly"),
+        (search.SUBSTRING, "aur/librewolf-firefox-shim"),
+        (search.DESCRIPTION, "extra/geckodriver"),
+        (0, "extra/chromium"),
+    ]
+
+
+def test_top_k_cut_is_stable():
+    import random
+    pool = list(search.parse_ss(recorded("yay-Ss-firefox.txt")))
+    pool += search.parse_ss(recorded("pacman-Ss-firefox.txt"))
+    pool.append(flathub("Firefox", "org.mozilla.firefox"))
+
+    def top(k=None):
+        for result in pool:
+            result.also = []
+        return search.rank(pool, "firefox", top=k)
+
+    full = top()
+    # extra/firefox shows up in both outputs and on Flathub
+    assert full[0].pkg == "extra/firefox"
+    assert sorted(r.where for r in full[0].also) == ["extra", "flathub: org.mozilla.firefox"]
+    names = [r.pkg for r in full]
+
+    rng = random.Random(4)
+    for _ in range(20):
+        rng.shuffle(pool)
+        assert [r.pkg for r in top()] == names
+        for k in (1, 3, 10):
+            assert [r.pkg for r in top(k)] == names[:k]
@@ -0,0 +1,58 @@
+import searchindex
+from searchindex import Doc, SearchIndex
+
+
+def make_index(tmp_path, docs, source="pacman"):
+    index = SearchIndex(tmp_path / "search-index.sqlite3")
+    index.index_source(source, "sig-1", docs)
+    return index
+
+
+def test_exact_name_survives_many_similar_names(tmp_path):
+    docs = [Doc("extra", f"git-tool{i}", "1.0", "a git helper") for i in range(300)]
+    docs.append(Doc("extra", "git", "2.44.0-1", "the fast distributed version control system"))
+    index = make_index(tmp_path, docs)
+    results = index.query("git", limit=10)
+    assert results[0].name == "git"
+    assert len(results) == 10
+
+
+def test_prefix_matches_rank_before_trigram_neighbours(tmp_path):
+    docs = [Doc("extra", f"libfoo{i}", "1.0", "") for i in range(200)]
+    docs += [Doc("extra", "firefox", "125.0-1", "Fast, Private & Safe Web Browser"),
+             Doc("extra", "firefox-developer-edition", "126.0b1-1", "Developer Edition of Firefox")]
+    index = make_index(tmp_path, docs)
+    assert [r.name for r in index.query("firefox", limit=2)] == ["firefox", "firefox-developer-edition"]
+
+
+def test_typo_still_finds_package(tmp_path):
+    index = make_index(tmp_path, [Doc("extra", "firefox", "125.0-1", "Web Browser"),
+                                  Doc("extra", "thunderbird", "115.9-1", "Mail client")])
+    assert index.query("fierfox", limit=5)[0].name == "firefox"
+
+
+def test_sources_filter_and_result_source(tmp_path):
+    index = make_index(tmp_path, [Doc("extra", "gimp", "2.10-1", "GNU Image Manipulation Program")])
+    index.index_source("appstream", "sig-1", [Doc("flathub", "gimp", "2.10", "Image editor",
+                                                  app_id="org.gimp.GIMP")])
+    assert [r.source for r in index.query("gimp", sources=["appstream"])] == ["flathub"]
+    assert {r.source for r in index.query("gimp")} == {"pacman", "flathub"}
+
+
+def test_refresh_reindexes_only_changed_signatures(tmp_path, monkeypatch):
+    monkeypatch.setattr(searchindex, "PROVIDERS", {})
+    signature = {"value": "v1"}
+    calls = []
+
+    def documents():
+        calls.append(signature["value"])
+        return [Doc("extra", "neovim", signature["value"], "")]
+
+    searchindex.register_provider("pacman", lambda: signature["value"], documents)
+    index = SearchIndex(tmp_path / "search-index.sqlite3")
+    assert index.refresh() == ["pacman"]
+    assert index.refresh() == []
+    signature["value"] = "v2"
+    assert index.refresh() == ["pacman"]
+    assert calls == ["v1", "v2"]
+    assert index.query("neovim")[0].version == "v2"
@@ -0,0 +1,64 @@
+"""
+Startup budget for the Meow CLI.
+
+Local-only subcommands run under `python -X importtime`; their cumulative
+import time has to stay under the budget, and they must not import the
+modules only network/install commands need.
+"""
+
+import os
+import re
+import subprocess
+import sys
+
+import pytest
+
+from conftest import ROOT
+
+BUDGET_MS = float(os.environ.get("MEOW_STARTUP_BUDGET_MS", 120))
+# Runs per command; the best one is kept
+RUNS = 5
+
+# Subcommands that never touch the network or the Meow API
+LOCAL_COMMANDS = [
+    ["fetch"],
+    ["history", "--limit", "1"],
+    ["--help"],
+]
+
+# Modules that must stay lazy for local commands
+FORBIDDEN_MODULES = ["requests", "urllib3", "installer", "meowinstaller", "builder", "MeowAPIclient"]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(argv, home):
+    """(total import time in µs, set of imported module names)"""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py")] + argv,
+        capture_output=True, text=True, cwd=ROOT, env=dict(os.environ, HOME=str(home))
+    )
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    total = 0
+    modules = set()
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_LINE.match(line)
+        if not m:
+            continue
+        modules.add(m.group(4))
+        # Only top-level entries: their cumulative time already includes children
+        if len(m.group(3)) == 1:
+            total += int(m.group(2))
+    return total, modules
+
+
+@pytest.mark.parametrize("argv", LOCAL_COMMANDS, ids=" ".join)
+def test_local_command_startup(argv, tmp_path):
+    results = [measure(argv, tmp_path) for _ in range(RUNS)]
+    best_ms = min(total for total, _ in results) / 1000
+    modules = set().union(*(mods for _, mods in results))
+
+    # parser is always imported: proves the import log was read
+    assert "parser" in modules
+    assert [m for m in FORBIDDEN_MODULES if m in modules] == []
+    assert best_ms <= BUDGET_MS, f"meow {' '.join(argv)} imports take {best_ms:.1f} ms"
@@ -0,0 +1,65 @@
+import os
+import stat
+
+import pytest
+
+import upgrade
+
+
+@pytest.fixture
+def fake_bin(tmp_path, monkeypatch):
+    """Put stand-in commands first on PATH: fake_bin(name, stdout, exit code)"""
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    monkeypatch.setenv("PATH", f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+
+    def make(name, stdout="", code=0):
+        script = bin_dir / name
+        (tmp_path / f"{name}.out").write_text(stdout)
+        script.write_text(f'#!/bin/sh\necho "$@" >> "{tmp_path}/{name}.argv"\n'
+                          f'cat "{tmp_path}/{name}.out"\necho "{name} failed" >&2\nexit {code}\n')
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return tmp_path / f"{name}.argv"
+    return make
+
+
+def test_pacman_nothing_to_upgrade(fake_bin):
+    fake_bin("pacman", code=1)
+    assert upgrade.outdated_pacman() == []
+
+
+def test_pacman_upgrades(fake_bin):
+    fake_bin("pacman", "linux 6.8.1.arch1-1 -> 6.8.2.arch1-1\nglibc 2.39-1 -> 2.39-2 [ignored]\n")
+    assert upgrade.outdated_pacman() == [upgrade.Upgrade("linux", "6.8.1.arch1-1", "6.8.2.arch1-1")]
+
+
+def test_pacman_errors_are_raised(fake_bin):
+    fake_bin("pacman", code=2)
+    with pytest.raises(RuntimeError, match="pacman failed"):
+        upgrade.outdated_pacman()
+
+
+def test_flatpak_updates_use_the_user_installation(fake_bin):
+    argv = fake_bin("flatpak", "Application ID\tVersion\norg.gimp.GIMP\t2.10.38\norg.freedesktop.Platform\t\n")
+    assert upgrade.outdated_flatpak() == [upgrade.Upgrade("org.gimp.GIMP", None, "2.10.38"),
+                                          upgrade.Upgrade("org.freedesktop.Platform", None, None)]
+    assert argv.read_text().split()[:2] == ["remote-ls", "--user"]
+    assert upgrade.upgrade_command("flathub", upgrade.outdated_flatpak())[:3] == ["flatpak", "update", "--user"]
+
+
+def test_flatpak_exit_1_is_an_error(fake_bin, capsys):
+    fake_bin("flatpak", code=1)
+    with pytest.raises(RuntimeError, match="flatpak failed"):
+        upgrade.outdated_flatpak()
+    upgrade.upgrade_all(sources=["flathub"])
+    out = capsys.readouterr().out
+    assert "[WARN] Skipping Flatpak: flatpak failed" in out
+    assert "Nothing to upgrade, but Flatpak could not be checked." in out
+    assert "Everything is up to date." not in out
+
+
+def test_everything_up_to_date(fake_bin, capsys):
+    fake_bin("pacman", code=1)
+    fake_bin("flatpak")
+    upgrade.upgrade_all(sources=["pac", "flathub"])
+    assert capsys.readouterr().out.splitlines()[-1] == "Everything is up to date."
@@ -0,0 +1,35 @@
+import os
+
+import pytest
+
+import vercmp
+from conftest import FIXTURES
+
+
+def load_pairs():
+    pairs = []
+    with open(os.path.join(FIXTURES, "vercmp_pairs.txt")) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                a, b, expected = line.split()
+                pairs.append((a, b, int(expected)))
+    return pairs
+
+
+PAIRS = load_pairs()
+
+
+@pytest.mark.parametrize("a,b,expected", PAIRS)
+def test_matches_alpm(a, b, expected):
+    assert vercmp.vercmp(a, b) == expected
+    assert vercmp.vercmp(b, a) == -expected
+
+
+def test_vercmp_many_matches_vercmp():
+    assert vercmp.vercmp_many((a, b) for a, b, _ in PAIRS) == [expected for _, _, expected in PAIRS]
+
+
+def test_outdated_keeps_newer_available():
+    triples = [("a", "1.0-1", "1.0-2"), ("b", "1:1.0-1", "2.0-1"), ("c", "1.0", "1.0-1")]
+    assert vercmp.outdated(triples) == [("a", "1.0-1", "1.0-2")]
@@ -0,0 +1,222 @@
+"""
+System-wide upgrades: `meow upgrade --all`.
+
+The outdated set is computed in one pass per source (pacman -Qu, one
+batched AUR RPC info query for the foreign packages from pacman -Qm, and
+flatpak remote-ls --updates), with the sources queried in parallel. The
+consolidated plan is then applied as one transaction per source.
+
+Flatpak apps are checked and upgraded in the per-user installation, where
+meow installs them.
+
+Meow packages are the git checkouts under MEOW_PACKAGES_DIR (default
+./packages). Each one costs a `git ls-remote` to check, and only the ones
+behind their remote are pulled.
+"""
+
+import os
+import subprocess
+from typing import Dict, List, NamedTuple, Optional
+
+import executor
+import versions
+
+QUERY_TIMEOUT = 2 * executor.QUERY_TIMEOUT
+MEOW_PACKAGES_DIR = os.environ.get("MEOW_PACKAGES_DIR", "./packages")
+
+
+class Upgrade(NamedTuple):
+    name: str
+    installed: Optional[str]
+    available: Optional[str]
+
+
+def parse_arrow_lines(output: str) -> List[Upgrade]:
+    """Parse `name old -> new` lines as printed by pacman -Qu"""
+    upgrades = []
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) >= 4 and parts[2] == "->":
+            if "[ignored]" in parts:
+                continue
+            upgrades.append(Upgrade(parts[0], parts[1], parts[3]))
+        elif len(parts) == 2:
+            upgrades.append(Upgrade(parts[0], None, parts[1]))
+    return upgrades
+
+
+# meow installs Flatpak apps with --user
+FLATPAK_SCOPE = "--user"
+
+
+def _query(command: List[str], ok_codes=(0,)) -> str:
+    result = executor.run(command, timeout=QUERY_TIMEOUT)
+    if result.returncode not in ok_codes:
+        raise RuntimeError(result.stderr.strip() or f"{command[0]} exited with {result.returncode}")
+    return result.stdout
+
+
+def outdated_pacman() -> List[Upgrade]:
+    # pacman -Qu exits with 1 when there is nothing to upgrade
+    return parse_arrow_lines(_query(["pacman", "-Qu"], ok_codes=(0, 1)))
+
+
+def outdated_aur() -> List[Upgrade]:
+    import aur
+    import vercmp
+    # ... and -Qm when there are no foreign packages
+    foreign = versions.parse_pacman_q(_query(["pacman", "-Qm"], ok_codes=(0, 1)))
+    # ttl=0: a release from the last hour must not hide behind the info cache
+    remote = aur.info(foreign, ttl=0)
+    return [
+        Upgrade(name, installed, available)
+        for name, installed, available in vercmp.outdated(
+            (name, foreign[name], pkg["Version"]) for name, pkg in remote.items()
+        )
+    ]
+
+
+def outdated_flatpak() -> List[Upgrade]:
+    output = _query(["flatpak", "remote-ls", FLATPAK_SCOPE, "--updates", "--columns=application,version"])
+    upgrades = []
+    for line in output.splitlines():
+        fields = line.split("\t")
+        if not fields[0].strip() or fields[0] == "Application ID":
+            continue
+        version = fields[1].strip() if len(fields) > 1 and fields[1].strip() else None
+        upgrades.append(Upgrade(fields[0].strip(), None, version))
+    return upgrades
+
+
+def outdated_meow() -> List[Upgrade]:
+    import gitcache
+    upgrades = []
+    for path, check in gitcache.check_updates(gitcache.checkouts(MEOW_PACKAGES_DIR)).items():
+        if check.error:
+            print(f"[WARN] Could not check {os.path.basename(path)} for updates: {check.error}")
+        elif check.outdated:
+            upgrades.append(Upgrade(os.path.basename(path), check.local[:8], check.remote[:8]))
+    return upgrades
+
+
+OUTDATED_QUERIES = {
+    "pac": outdated_pacman,
+    "aur": outdated_aur,
+    "flathub": outdated_flatpak,
+    "meow": outdated_meow,
+}
+
+SOURCE_LABELS = {"pac": "Pacman", "aur": "AUR (yay)", "flathub": "Flatpak", "meow": "Meow"}
+
+
+def _wanted(sources=None) -> List[str]:
+    return [s for s in (sources or OUTDATED_QUERIES) if s in OUTDATED_QUERIES]
+
+
+def compute_plan(sources=None) -> Dict[str, List[Upgrade]]:
+    """Query every source in parallel. Sources that fail are reported and left out."""
+    sources = _wanted(sources)
+    plan = {}
+    futures = {source: executor.pool().submit(OUTDATED_QUERIES[source]) for source in sources}
+    for source, future in futures.items():
+        try:
+            plan[source] = future.result()
+        except FileNotFoundError as e:
+            print(f"[WARN] Skipping {SOURCE_LABELS[source]}: {e.filename} not found")
+        except subprocess.TimeoutExpired:
+            print(f"[WARN] Skipping {SOURCE_LABELS[source]}: timed out")
+        except Exception as e:
+            print(f"[WARN] Skipping {SOURCE_LABELS[source]}: {e}")
+    return plan
+
+
+def print_plan(plan: Dict[str, List[Upgrade]]):
+    for source, upgrades in plan.items():
+        if not upgrades:
+            continue
+        print(f"\n{SOURCE_LABELS[source]} ({len(upgrades)}):")
+        for up in upgrades:
+            print(f"  {up.name:<40} {up.installed or '?':>20} -> {up.available or '?'}")
+    print()
+
+
+def upgrade_command(source: str, upgrades: List[Upgrade]) -> List[str]:
+    names = [up.name for up in upgrades]
+    if source == "pac":
+        # pacman only supports full-system upgrades against the synced db
+        return ["sudo", "pacman", "-Su", "--noconfirm"]
+    if source == "aur":
+        return ["yay", "-S", "--aur", "--noconfirm", "--nocleanmenu", "--nodiffmenu", *names]
+    return ["flatpak", "update", FLATPAK_SCOPE, "--noninteractive", "--assumeyes", *names]
+
+
+def pull_meow(upgrades: List[Upgrade]) -> bool:
+    """Meow packages have no shared transaction: pull the checkouts in parallel"""
+    import gitcache
+    paths = [os.path.join(MEOW_PACKAGES_DIR, up.name) for up in upgrades]
+    ok = True
+    for path, result in gitcache.update_checkouts(paths).items():
+        if result.returncode != 0:
+            print(f"Could not update {os.path.basename(path)}: {(result.stderr or '').strip()}")
+            ok = False
+    return ok
+
+
+def apply_plan(plan: Dict[str, List[Upgrade]], env=None) -> Dict[str, bool]:
+    """Run one transaction per source and record new versions of packages Meow tracks"""
+    import pkgdb
+    results = {}
+    for source, upgrades in plan.items():
+        if not upgrades:
+            continue
+        print(f"Upgrading {len(upgrades)} package(s) from {SOURCE_LABELS[source]}...")
+        try:
+            if source == "meow":
+                ok = pull_meow(upgrades)
+            else:
+                result = executor.run(upgrade_command(source, upgrades), capture=False, env=env)
+                ok = result.returncode == 0
+        except FileNotFoundError as e:
+            print(f"Command not found: {e.filename}")
+            ok = False
+        results[source] = ok
+        versions.invalidate()
+        if not ok:
+            print(f"{SOURCE_LABELS[source]} upgrade failed.")
+            continue
+        db = pkgdb.get_db()
+        for up in upgrades:
+            record = db.get(up.name)
+            if record and up.available:
+                db.update(record["name"], version=up.available)
+    return results
+
+
+def upgrade_all(assume_yes: bool = False, dry_run: bool = False, sources=None):
+    print("Checking for updates...")
+    plan = compute_plan(sources)
+    total = sum(len(upgrades) for upgrades in plan.values())
+    if total == 0:
+        skipped = [SOURCE_LABELS[s] for s in _wanted(sources) if s not in plan]
+        if skipped:
+            print(f"Nothing to upgrade, but {', '.join(skipped)} could not be checked.")
+            return
+        print("Everything is up to date.")
+        return
+
+    print_plan(plan)
+    if dry_run:
+        print(f"{total} package(s) can be upgraded.")
+        return
+
+    if not assume_yes:
+        answer = input(f"Upgrade {total} package(s)? y/n: ")
+        if answer.lower() in ["n", "no", "nah"]:
+            return "userDeniedInstallation"
+        if answer.lower() not in ["y", "yes"]:
+            print("You mispelled. \nTry again.")
+            return
+
+    results = apply_plan(plan)
+    if all(results.values()):
+        print("System upgraded successfully!")
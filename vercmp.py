@@ -0,0 +1,138 @@
+"""
+Pure-Python port of pacman's version comparison (alpm_pkg_vercmp).
+
+Versions are [epoch:]pkgver[-pkgrel]. Each version string is parsed once
+into its epoch/pkgver/pkgrel segments and cached, so comparing thousands of
+(installed, available) pairs only pays for the segment walk.
+
+    python vercmp.py 1.0-1 1.0-2     # prints -1, like pacman's vercmp
+"""
+
+import re
+import sys
+from functools import cmp_to_key, lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+# pacman uses the C locale: only ASCII letters and digits form segments
+_SEGMENT = re.compile(r"([^0-9A-Za-z]*)([0-9]+|[A-Za-z]+)")
+_EPOCH = re.compile(r"[0-9]*")
+
+# (separator length, is numeric, text) per segment, plus trailing separator length
+Segments = Tuple[Tuple[Tuple[int, bool, str], ...], int]
+
+
+@lru_cache(maxsize=65536)
+def _segments(part: str) -> Segments:
+    segs = []
+    end = 0
+    for m in _SEGMENT.finditer(part):
+        if m.start() != end:
+            break
+        sep, text = m.group(1), m.group(2)
+        segs.append((len(sep.encode("utf-8")), text[0].isdigit(), text))
+        end = m.end()
+    return tuple(segs), len(part[end:].encode("utf-8"))
+
+
+@lru_cache(maxsize=65536)
+def parse_evr(version: str) -> Tuple[Segments, Segments, Optional[Segments]]:
+    """Split and pre-parse a version into (epoch, pkgver, pkgrel) segments"""
+    digits = _EPOCH.match(version).end()
+    dash = version.rfind("-", digits)
+    if digits < len(version) and version[digits] == ":":
+        epoch = version[:digits] or "0"
+        rest_start = digits + 1
+    else:
+        epoch = "0"
+        rest_start = 0
+    if dash != -1:
+        pkgver, pkgrel = version[rest_start:dash], version[dash + 1:]
+    else:
+        pkgver, pkgrel = version[rest_start:], None
+    return _segments(epoch), _segments(pkgver), _segments(pkgrel) if pkgrel is not None else None
+
+
+def _head(segs, trailing: int, i: int, skipped: bool) -> str:
+    """Class of the character rpmvercmp's cursor sits on: end, sep, alpha or digit"""
+    if i < len(segs):
+        if segs[i][0] and not skipped:
+            return "sep"
+        return "digit" if segs[i][1] else "alpha"
+    return "sep" if trailing and not skipped else "end"
+
+
+def _rpmvercmp(a: Segments, b: Segments) -> int:
+    segs1, trail1 = a
+    segs2, trail2 = b
+    if a == b:
+        return 0
+
+    i = 0
+    skipped = False
+    while (i < len(segs1) or trail1) and (i < len(segs2) or trail2):
+        # The cursors skip the separators in front of segment i
+        skipped = True
+        if i >= len(segs1) or i >= len(segs2):
+            break
+        sep1, num1, text1 = segs1[i]
+        sep2, num2, text2 = segs2[i]
+        if sep1 != sep2:
+            return -1 if sep1 < sep2 else 1
+        if num1 != num2:
+            return 1 if num1 else -1
+        if num1:
+            n1, n2 = int(text1), int(text2)
+            if n1 != n2:
+                return -1 if n1 < n2 else 1
+        elif text1 != text2:
+            return -1 if text1 < text2 else 1
+        i += 1
+        skipped = False
+        if i >= len(segs1) and not trail1 or i >= len(segs2) and not trail2:
+            break
+
+    head1 = _head(segs1, trail1, i, skipped)
+    head2 = _head(segs2, trail2, i, skipped)
+    if head1 == "end" and head2 == "end":
+        return 0
+    # A remaining alpha string never beats an empty one
+    if (head1 == "end" and head2 != "alpha") or head1 == "alpha":
+        return -1
+    return 1
+
+
+def vercmp(a: Optional[str], b: Optional[str]) -> int:
+    """-1 if a is older than b, 0 if they are equal, 1 if a is newer"""
+    if a is None or b is None:
+        return (a is not None) - (b is not None)
+    if a == b:
+        return 0
+    epoch1, ver1, rel1 = parse_evr(a)
+    epoch2, ver2, rel2 = parse_evr(b)
+    ret = _rpmvercmp(epoch1, epoch2)
+    if ret == 0:
+        ret = _rpmvercmp(ver1, ver2)
+        if ret == 0 and rel1 is not None and rel2 is not None:
+            ret = _rpmvercmp(rel1, rel2)
+    return ret
+
+
+def vercmp_many(pairs: Iterable[Tuple[str, str]]) -> List[int]:
+    """vercmp for every (installed, available) pair"""
+    return [vercmp(a, b) for a, b in pairs]
+
+
+def outdated(pairs: Iterable[Tuple[str, str, str]]) -> List[Tuple[str, str, str]]:
+    """Keep the (name, installed, available) triples where available is newer"""
+    return [(name, a, b) for name, a, b in pairs if vercmp(a, b) < 0]
+
+
+# Sort key: sorted(versions, key=version_key)
+version_key = cmp_to_key(vercmp)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("usage: vercmp.py <version1> <version2>")
+        sys.exit(1)
+    print(vercmp(sys.argv[1], sys.argv[2]))
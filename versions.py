@@ -0,0 +1,95 @@
+"""
+Batched installed-version lookups.
+
+Rather than forking `pacman -Qi` / `flatpak info` once per package, the
+service runs `pacman -Q` and `flatpak list` once, keeps the results in a
+dict and answers any number of lookups from it. Call invalidate() after a
+transaction changes what is installed.
+"""
+
+import subprocess
+import threading
+from typing import Dict, Optional
+
+import executor
+
+QUERY_TIMEOUT = executor.QUERY_TIMEOUT
+
+
+def parse_pacman_q(output: str) -> Dict[str, str]:
+    """`pacman -Q` lines are `name version`"""
+    versions = {}
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) >= 2:
+            versions[parts[0]] = parts[1]
+    return versions
+
+
+def parse_flatpak_list(output: str) -> Dict[str, str]:
+    """`flatpak list --columns=application,version` lines are tab separated"""
+    versions = {}
+    for line in output.splitlines():
+        fields = line.split("\t")
+        app_id = fields[0].strip()
+        if not app_id or app_id == "Application ID":
+            continue
+        versions[app_id] = fields[1].strip() if len(fields) > 1 else ""
+    return versions
+
+
+class VersionService:
+    """Installed versions for pacman/AUR packages and Flatpak apps"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pacman: Optional[Dict[str, str]] = None
+        self._flatpak: Optional[Dict[str, str]] = None
+
+    @staticmethod
+    def _run(command) -> str:
+        try:
+            result = executor.run(command, timeout=QUERY_TIMEOUT)
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            return ""
+        return result.stdout if result.returncode == 0 else ""
+
+    def pacman_versions(self) -> Dict[str, str]:
+        """Every installed package, repo and foreign (AUR) alike"""
+        with self._lock:
+            if self._pacman is None:
+                self._pacman = parse_pacman_q(self._run(["pacman", "-Q"]))
+            return self._pacman
+
+    def flatpak_versions(self) -> Dict[str, str]:
+        with self._lock:
+            if self._flatpak is None:
+                self._flatpak = parse_flatpak_list(
+                    self._run(["flatpak", "list", "--app", "--columns=application,version"])
+                )
+            return self._flatpak
+
+    def version(self, name: str, source: str) -> Optional[str]:
+        """Installed version of name (a Flatpak app ID for flathub), or None"""
+        if source in ("pac", "pacman", "aur"):
+            return self.pacman_versions().get(name)
+        if source in ("flathub", "flatpak"):
+            return self.flatpak_versions().get(name) or None
+        return None
+
+    def invalidate(self):
+        with self._lock:
+            self._pacman = None
+            self._flatpak = None
+
+
+_service = VersionService()
+
+
+def get_service() -> VersionService:
+    return _service
+
+
+def invalidate():
+    """Forget cached versions; call after any install/update/removal"""
+    _service.invalidate()